@@ -0,0 +1,6 @@
+# python -m benchmarks 运行基准测试套件（见 suite.py）
+import sys
+
+from .suite import main
+
+sys.exit(main())
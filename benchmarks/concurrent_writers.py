@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+多进程并发写入压力测试
+
+模拟多台教室电脑共用同一个 history.db：每个进程作为一个独立实例，
+以批量事务写入抽题记录，结束后校验没有丢失或重复的记录，并统计吞吐量。
+
+用法:
+    python -m benchmarks.concurrent_writers --writers 8 --batches 200 --batch-size 5
+"""
+
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from src.storage.database import Database
+
+
+def _writer(index: int, db_path: str, journal_dir: str, batches: int,
+            batch_size: int, start_event) -> None:
+    """单个写入进程"""
+    db = Database(db_path,
+                  journal_path=os.path.join(journal_dir, f"writer-{index}.jsonl"))
+    start_event.wait()
+
+    seq = 0
+    for _ in range(batches):
+        rows = []
+        for _ in range(batch_size):
+            rows.append((f"w{index}-{seq}", f"题目 {seq}", "压力测试",
+                         f"bank-{index % 3}", f"人员{seq % 50}", None))
+            seq += 1
+        db.add_history_batch(rows)
+
+    # 补写本地写日志中暂存的记录
+    while db.get_journal_count():
+        db.flush_journal()
+        time.sleep(0.05)
+
+
+def run(writers: int, batches: int, batch_size: int, work_dir: str) -> dict:
+    """运行一次压力测试
+
+    Returns:
+        统计结果字典
+    """
+    db_path = os.path.join(work_dir, "history.db")
+    Database(db_path)
+
+    ctx = multiprocessing.get_context("spawn")
+    start_event = ctx.Event()
+    processes = [
+        ctx.Process(target=_writer,
+                    args=(i, db_path, work_dir, batches, batch_size, start_event))
+        for i in range(writers)
+    ]
+    for p in processes:
+        p.start()
+
+    # 等待所有进程完成初始化后同时开始写入
+    time.sleep(1.0)
+    started = time.perf_counter()
+    start_event.set()
+    for p in processes:
+        p.join()
+    elapsed = time.perf_counter() - started
+
+    failed = [p.exitcode for p in processes if p.exitcode != 0]
+
+    expected = {f"w{i}-{seq}" for i in range(writers)
+                for seq in range(batches * batch_size)}
+    with sqlite3.connect(db_path) as conn:
+        written = [row[0] for row in conn.execute(
+            "SELECT question_id FROM draw_history")]
+    written_set = set(written)
+
+    total = writers * batches * batch_size
+    return {
+        "writers": writers,
+        "rows": total,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(total / elapsed, 1),
+        "transactions_per_s": round(writers * batches / elapsed, 1),
+        "lost": len(expected - written_set),
+        "duplicated": len(written) - len(written_set),
+        "failed_writers": len(failed),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="多进程并发写入压力测试")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = run(args.writers, args.batches, args.batch_size, work_dir)
+
+    for key, value in result.items():
+        print(f"{key:>20}: {value}")
+
+    ok = not (result["lost"] or result["duplicated"] or result["failed_writers"])
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+并发抽题竞争测试
+
+多个线程共用一个 QuestionBank 同时去重抽题，统计吞吐量随线程数的变化，
+并校验没有任何一道题被抽到两次。三种场景:
+- shared: 所有线程从同一个题库抽取（竞争同一把题库锁）
+- per_bank: 每个线程从各自的题库抽取（题库锁互不影响）
+- all_banks: 所有线程从全部 4 个题库抽取（每次持有全部题库锁）
+
+CPython 有 GIL，纯 Python 的抽题不会随线程数线性加速；
+本测试关注加锁后吞吐量不明显下降、结果始终正确。
+
+用法:
+    python -m benchmarks.draw_contention --threads 1 2 4 8 --draws 400
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from src.core.bank import QuestionBank
+from src.core.drawer import DrawEngine
+from src.core.question import Question
+
+SCENARIOS = ["shared", "per_bank", "all_banks"]
+
+# all_banks 场景的题库数，题目平均分配
+ALL_BANKS = 4
+
+
+def _make_bank(banks: int, questions: int) -> QuestionBank:
+    bank = QuestionBank()
+    for b in range(banks):
+        name = f"bank{b}"
+        bank.add_bank(f"{name}.md", [Question(f"题目 {b}-{i}", "", name, f"{b}-{i}")
+                                     for i in range(questions)])
+    return bank
+
+
+def run(scenario: str, threads: int, draws: int, count: int, questions: int,
+        seed: int) -> dict:
+    """运行一个场景
+
+    Returns:
+        统计结果字典
+    """
+    if scenario == "per_bank":
+        bank = _make_bank(threads, questions)
+    elif scenario == "all_banks":
+        bank = _make_bank(ALL_BANKS, questions // ALL_BANKS)
+    else:
+        bank = _make_bank(1, questions)
+    drawn: List[List[str]] = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index: int):
+        engine = DrawEngine(bank, random.Random(seed + index))
+        bank_name: Optional[str] = None
+        if scenario == "shared":
+            bank_name = "bank0"
+        elif scenario == "per_bank":
+            bank_name = f"bank{index}"
+        ids = drawn[index]
+        barrier.wait()
+        for _ in range(draws):
+            ids.extend(q.id for q in engine.draw(count, bank_name, True))
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    all_ids = [qid for ids in drawn for qid in ids]
+    return {
+        "scenario": scenario,
+        "threads": threads,
+        "draws": threads * draws,
+        "elapsed_s": round(elapsed, 3),
+        "draws_per_s": round(threads * draws / elapsed, 1),
+        "questions_drawn": len(all_ids),
+        "duplicates": len(all_ids) - len(set(all_ids)),
+        "marked": bank.get_question_count() - bank.get_available_count(),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="并发抽题竞争测试")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--draws", type=int, default=400, help="每个线程的抽取次数")
+    parser.add_argument("--count", type=int, default=1, help="每次抽取题数")
+    parser.add_argument("--questions", type=int, default=5000, help="每个题库的题目数")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--seed", type=int, default=20240501)
+    parser.add_argument("--output", help="结果 JSON 文件")
+    args = parser.parse_args(argv)
+
+    if max(args.threads) * args.draws * args.count > args.questions:
+        parser.error("题目不足：threads × draws × count 不能超过 questions")
+
+    results = []
+    ok = True
+    print(f"{'scenario':<10}{'threads':>8}{'draws/s':>12}{'speedup':>9}{'dups':>6}")
+    for scenario in args.scenarios:
+        baseline = None
+        for threads in args.threads:
+            result = run(scenario, threads, args.draws, args.count, args.questions,
+                         args.seed)
+            baseline = baseline or result["draws_per_s"]
+            result["speedup"] = round(result["draws_per_s"] / baseline, 2)
+            results.append(result)
+            # 去重抽取：既不重复，也没有漏标记
+            if result["duplicates"] or result["marked"] != result["questions_drawn"]:
+                ok = False
+            print(f"{scenario:<10}{threads:>8}{result['draws_per_s']:>12.1f}"
+                  f"{result['speedup']:>9.2f}{result['duplicates']:>6}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"params": vars(args), "results": results}, f,
+                      ensure_ascii=False, indent=2)
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
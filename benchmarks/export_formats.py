@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+历史导出格式吞吐量基准
+
+生成指定数量的合成抽题历史，分别以各导出格式从数据库流式导出，
+统计每秒导出行数和输出文件大小。
+
+用法:
+    python -m benchmarks.export_formats --rows 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.storage.backend import Storage, now_ms
+from src.storage.database import Database
+from src.storage.exporter import Exporter
+
+
+def populate(db: Storage, rows: int, seed: int = 42, batch: int = 50000):
+    """写入合成历史记录"""
+    rng = random.Random(seed)
+    base_ts = now_ms() - rows * 1000
+    for start in range(0, rows, batch):
+        db.add_history_batch(
+            (f"q-{i}", f"题目 {rng.randrange(5000)} Question",
+             "请说明实现思路\nExplain the approach", f"bank-{i % 7}",
+             f"学生{rng.randrange(300)}" if i % 3 else "", base_ts + i * 1000)
+            for i in range(start, min(start + batch, rows)))
+
+
+def formats():
+    """[(名称, 文件名, 导出函数)]"""
+    result = [
+        ("csv", "history.csv", Exporter.export_history_to_csv),
+        ("csv.gz", "history.csv.gz", Exporter.export_history_to_csv),
+        ("jsonl", "history.jsonl", Exporter.export_history_to_jsonl),
+        ("jsonl.gz", "history.jsonl.gz", Exporter.export_history_to_jsonl),
+        ("xlsx", "history.xlsx", Exporter.export_history_to_excel),
+    ]
+    if Exporter.arrow_available():
+        result.append(("arrow", "history.arrow", Exporter.export_history_to_arrow))
+    return result
+
+
+def run(rows: int, work_dir: str, skip=()) -> list:
+    db = Database(os.path.join(work_dir, "history.db"))
+    populate(db, rows)
+
+    results = []
+    for name, file_name, export in formats():
+        if name in skip:
+            continue
+        path = os.path.join(work_dir, file_name)
+        started = time.perf_counter()
+        ok = export(db, path)
+        elapsed = time.perf_counter() - started
+        results.append({
+            "format": name,
+            "ok": ok,
+            "rows": rows,
+            "elapsed_s": round(elapsed, 3),
+            "rows_per_s": round(rows / elapsed, 1) if elapsed else 0.0,
+            "size_bytes": os.path.getsize(path) if ok else 0,
+        })
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="历史导出格式吞吐量基准")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--skip", nargs="*", default=[],
+                        help="跳过的格式，如 xlsx")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = run(args.rows, work_dir, set(args.skip))
+
+    print(f"{'format':<10}{'rows/s':>12}{'seconds':>10}{'size':>14}")
+    for r in results:
+        status = "" if r["ok"] else "  FAILED"
+        print(f"{r['format']:<10}{r['rows_per_s']:>12}{r['elapsed_s']:>10}"
+              f"{r['size_bytes']:>14}{status}")
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+按人员导出讲义基准
+
+为指定人数的学生生成抽题结果（每两名学生同名，按人员标识区分），
+分别以单进程和进程池导出每种格式，统计耗时，校验每人一份讲义，
+并校验两次导出的文件逐字节一致（输出确定性）。
+最后通过 ExportJob 覆盖导出到已存在的文件夹，校验重复导出可以成功。
+
+用法:
+    python -m benchmarks.handouts --students 2000 --questions 3
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.core.result import DrawResult
+from src.storage.export_job import ExportJob
+from src.storage.handouts import HANDOUT_FORMATS, HandoutExporter
+
+
+def make_results(students: int, questions: int, seed: int = 42) -> list:
+    """生成合成抽题结果（学生 2k 与 2k+1 同名）"""
+    rng = random.Random(seed)
+    results = []
+    for s in range(students):
+        name = f"学生{s // 2:05d}"
+        for _ in range(questions):
+            q = rng.randrange(10000)
+            results.append(DrawResult(
+                f"题目 {q}: 列表推导式", "请写出一个列表推导式\n要求使用一行代码完成",
+                f"q{q}", f"bank-{q % 5}", name, f"p{s}"))
+    return results
+
+
+def digest(output_dir: str) -> dict:
+    """输出目录中各文件的 SHA-256"""
+    result = {}
+    for name in sorted(os.listdir(output_dir)):
+        with open(os.path.join(output_dir, name), "rb") as f:
+            result[name] = hashlib.sha256(f.read()).hexdigest()
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="按人员导出讲义基准")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--formats", nargs="*", default=list(HANDOUT_FORMATS))
+    args = parser.parse_args(argv)
+
+    results = make_results(args.students, args.questions)
+    generated_at = "2024-01-01 00:00:00"
+    ok = True
+
+    print(f"{'format':<8}{'workers':>8}{'seconds':>10}{'files/s':>12}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for fmt in args.formats:
+            manifests, digests = [], []
+            for workers in sorted({1, args.workers}):
+                out = os.path.join(work_dir, f"{fmt}-{workers}")
+                started = time.perf_counter()
+                manifest = HandoutExporter.export(results, out, fmt, workers,
+                                                  generated_at=generated_at)
+                elapsed = time.perf_counter() - started
+                manifests.append(manifest)
+                digests.append(digest(out))
+                print(f"{fmt:<8}{workers:>8}{elapsed:>10.3f}"
+                      f"{manifest['person_count'] / elapsed:>12.1f}")
+            if any(m["person_count"] != args.students for m in manifests):
+                print(f"{fmt}: 讲义数与人数不一致（同名人员被合并）")
+                ok = False
+            if any(m != manifests[0] for m in manifests):
+                print(f"{fmt}: 清单不一致")
+                ok = False
+            if any(d != digests[0] for d in digests):
+                print(f"{fmt}: 文件内容不一致")
+                ok = False
+            # 覆盖导出到已存在的文件夹
+            result = ExportJob(HandoutExporter.export, results, out, fmt=fmt,
+                               workers=args.workers,
+                               generated_at=generated_at).run()
+            if not result.success:
+                print(f"{fmt}: 覆盖导出失败: {result.message}")
+                ok = False
+            elif os.path.exists(os.path.join(work_dir, f".~old~{fmt}-{args.workers}")):
+                print(f"{fmt}: 覆盖导出后残留旧文件夹")
+                ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
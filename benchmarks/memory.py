@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+题库加载与抽题内存测试
+
+用 QuestionBank.load_bank 加载若干个合成题库（见 synthetic.py），再按轮抽题，
+抽题结果按界面的做法存入 ResultStore。tracemalloc 统计每个阶段新增的内存，
+并遍历实际的数据结构（sys.getsizeof）把内存分到以下各项，单位为每题字节数:
+
+- question_objects: Question 对象（含属性槽，不含属性值）
+- text_strings:     标题、要求和题库名称字符串（按对象去重）
+- id_strings:       题目 ID 字符串
+- bank_lists:       题库的题目列表
+- drawn_id_set:     已抽取题目 ID 集合
+- history:          抽题结果（内存中的 DrawResult 和溢出文件偏移量）
+- other:            tracemalloc 总量中未归入以上各项的部分
+
+每项超过上限（--limit，或与 --compare 基线相比超过 --threshold 倍）时返回失败。
+
+用法:
+    python -m benchmarks.memory --questions 100000 --banks 3
+    python -m benchmarks.memory --output base.json
+    python -m benchmarks.memory --compare base.json --limit total=1000
+"""
+
+import argparse
+import dataclasses
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Iterable, List, Set
+
+from src.core.bank import QuestionBank
+from src.core.drawer import DrawEngine
+from src.core.question import Question
+from src.core.result import DrawResult
+from src.storage.result_store import ResultStore
+from .synthetic import DEFAULT_SEED, write_bank
+
+CATEGORIES = ["question_objects", "text_strings", "id_strings", "bank_lists",
+              "drawn_id_set", "history", "other", "total"]
+
+# 每题字节数上限（默认参数下实测值约留 30% 余量）
+LIMITS: Dict[str, float] = {
+    "question_objects": 140,
+    "text_strings": 600,
+    "id_strings": 110,
+    "bank_lists": 11,
+    "drawn_id_set": 40,
+    "history": 20,
+    "other": 40,
+    "total": 900,
+}
+
+
+def _object_size(factory, sample: int = 1000) -> float:
+    """单个对象的平均大小（不含属性值）
+
+    Python 3.11 起实例属性内联存放，访问 __dict__ 会额外创建字典，
+    因此用 tracemalloc 实测构造 sample 个对象（属性值共用已有字符串）的内存。
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(sample)]
+    size = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(objects)
+    tracemalloc.stop()
+    return size / sample
+
+
+def _strings_size(values: Iterable[str], seen: Set[int]) -> int:
+    """未计入过的字符串大小之和（按对象 id 去重，共享的字符串只算一次）"""
+    total = 0
+    for value in values:
+        if id(value) not in seen:
+            seen.add(id(value))
+            total += sys.getsizeof(value)
+    return total
+
+
+def _bank_breakdown(bank: QuestionBank, seen: Set[int]) -> Dict[str, int]:
+    """题库中各数据结构的内存（字节）"""
+    sizes = dict.fromkeys(["question_objects", "text_strings", "id_strings", "bank_lists"], 0)
+    sample = bank.get_questions()[0]
+    question_size = _object_size(lambda: Question(sample.title, sample.content,
+                                                  sample.bank_name, sample.id))
+    for name in bank.get_bank_names():
+        questions = bank.get_questions(name)
+        sizes["bank_lists"] += sys.getsizeof(questions)
+        sizes["question_objects"] += round(question_size * len(questions))
+        for q in questions:
+            sizes["text_strings"] += _strings_size((q.title, q.content, q.bank_name), seen)
+            sizes["id_strings"] += _strings_size((q.id,), seen)
+    return sizes
+
+
+def _history_size(store: ResultStore, seen: Set[int]) -> int:
+    """抽题结果存储的内存（字节），与题目共享的字符串不重复计入"""
+    size = sys.getsizeof(store._memory) + sys.getsizeof(store._offsets)
+    size += sys.getsizeof(store._cache)
+    results = list(store._memory) + list(store._cache.values())
+    if results:
+        sample = results[0]
+        size += round(_object_size(lambda: dataclasses.replace(sample)) * len(results))
+    names = [f.name for f in dataclasses.fields(DrawResult)]
+    for result in results:
+        size += _strings_size((getattr(result, name) for name in names), seen)
+    return size
+
+
+def _traced(func):
+    """执行 func，返回 (结果, 新增内存字节数, 峰值字节数)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current - before, peak - before
+
+
+def _draw_rounds(bank: QuestionBank, store: ResultStore, rounds: int,
+                 fraction: float, seed: int) -> int:
+    """每个题库按轮去重抽题，共抽取 fraction 比例的题目，返回抽取总数"""
+    engine = DrawEngine(bank, random.Random(seed))
+    drawn = 0
+    for name in bank.get_bank_names():
+        per_round = max(1, math.ceil(bank.get_question_count(name) * fraction / rounds))
+        for _ in range(rounds):
+            questions = engine.draw(per_round, name, True)
+            store.append([DrawResult(q.title, q.content, q.id, q.bank_name)
+                          for q in questions])
+            drawn += len(questions)
+    return drawn
+
+
+def run(questions: int, banks: int, rounds: int, fraction: float, memory_cap: int,
+        seed: int, work_dir: str) -> dict:
+    paths = []
+    for i in range(banks):
+        path = os.path.join(work_dir, f"bank{i}.md")
+        write_bank(path, questions, seed + i)
+        paths.append(path)
+
+    bank = QuestionBank()
+    started = time.perf_counter()
+    _, load_bytes, load_peak = _traced(lambda: [bank.load_bank(p) for p in paths])
+    load_s = time.perf_counter() - started
+    loaded = bank.get_question_count()
+
+    store = ResultStore(DrawResult, memory_cap, spill_dir=work_dir)
+    started = time.perf_counter()
+    drawn, draw_bytes, _ = _traced(
+        lambda: _draw_rounds(bank, store, rounds, fraction, seed))
+    draw_s = time.perf_counter() - started
+
+    seen: Set[int] = set()
+    sizes = _bank_breakdown(bank, seen)
+    sizes["drawn_id_set"] = sys.getsizeof(bank.get_drawn_ids())
+    sizes["history"] = _history_size(store, seen)
+    sizes["total"] = load_bytes + draw_bytes
+    sizes["other"] = sizes["total"] - sum(sizes[c] for c in CATEGORIES[:-2])
+    store.clear()
+
+    return {
+        "questions": loaded,
+        "banks": banks,
+        "drawn": drawn,
+        "history_in_memory": min(drawn, memory_cap),
+        "load_s": round(load_s, 3),
+        "draw_s": round(draw_s, 3),
+        "load_mb": round(load_bytes / 1e6, 2),
+        "load_peak_mb": round(load_peak / 1e6, 2),
+        "draw_mb": round(draw_bytes / 1e6, 2),
+        "bytes_per_question": {c: round(sizes[c] / loaded, 1) for c in CATEGORIES},
+    }
+
+
+def check(result: dict, limits: Dict[str, float],
+          baseline_path: str = "", threshold: float = 1.10) -> List[str]:
+    """检查每题字节数，返回超限或回退的项"""
+    per_question = result["bytes_per_question"]
+    failures = []
+    for name, value in per_question.items():
+        limit = limits.get(name)
+        if limit is not None and value > limit:
+            failures.append(f"{name} {value} > {limit}")
+
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["result"]
+        # 结果存储等固定开销按题数摊薄，规模不同时每题字节数不可比
+        for key in ("questions", "banks", "drawn"):
+            if baseline[key] != result[key]:
+                print(f"注意: 基线 {key}={baseline[key]}，本次 {result[key]}，对比结果仅供参考")
+        # other 可能很小甚至为负，按总量的 1% 作为比较下限
+        floor = per_question["total"] * 0.01
+        for name, value in per_question.items():
+            base = baseline["bytes_per_question"].get(name)
+            if base is not None and value > max(base, floor) * threshold:
+                failures.append(f"{name} {value} > {base} x {threshold}")
+    return failures
+
+
+def _parse_limit(text: str):
+    name, _, value = text.partition("=")
+    if name not in CATEGORIES or not value:
+        raise argparse.ArgumentTypeError(f"格式应为 名称=字节数，名称为 {', '.join(CATEGORIES)}")
+    return name, float(value)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="题库加载与抽题内存测试")
+    parser.add_argument("--questions", type=int, default=100000, help="每个题库的题目数")
+    parser.add_argument("--banks", type=int, default=3, help="题库个数")
+    parser.add_argument("--rounds", type=int, default=100, help="每个题库的抽题轮数")
+    parser.add_argument("--fraction", type=float, default=0.5, help="每个题库抽取的比例")
+    parser.add_argument("--memory-cap", type=int, default=2000,
+                        help="内存中保留的抽题结果条数（同界面默认值）")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--limit", type=_parse_limit, action="append", default=[],
+                        help="覆盖每题字节数上限，如 total=1500，可多次指定")
+    parser.add_argument("--compare", help="基线结果 JSON 文件")
+    parser.add_argument("--threshold", type=float, default=1.10,
+                        help="与基线对比时视为回退的比例")
+    parser.add_argument("--output", help="结果 JSON 文件")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = run(args.questions, args.banks, args.rounds, args.fraction,
+                     args.memory_cap, args.seed, work_dir)
+
+    limits = dict(LIMITS, **dict(args.limit))
+    per_question = result["bytes_per_question"]
+    for key, value in result.items():
+        if key != "bytes_per_question":
+            print(f"{key:>18}: {value}")
+    print(f"\n{'bytes/question':>18}{'value':>10}{'limit':>10}")
+    for name in CATEGORIES:
+        print(f"{name:>18}{per_question[name]:>10.1f}{limits.get(name, 0):>10.0f}")
+
+    if args.output:
+        params = dict(vars(args), limit=limits)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"params": params, "result": result}, f,
+                      ensure_ascii=False, indent=2)
+
+    failures = check(result, limits, args.compare, args.threshold)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print("FAIL" if failures else "PASS")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
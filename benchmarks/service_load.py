@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+抽题服务负载测试
+
+在子进程中启动 python -m src.server，每个连接打开一个会话（模拟一个教室），
+按固定速率（开环，不等待上一个响应）发送抽题请求，统计响应延迟。
+延迟从请求的计划发送时刻算起，客户端或服务端落后时排队时间也计入。
+结束后关闭服务并核对写入数据库的历史记录数。
+
+用法:
+    python -m benchmarks.service_load --rate 1000 --duration 10 --sessions 50
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _prepare(work_dir: str, questions: int, persons: int):
+    bank_path = os.path.join(work_dir, "bank.md")
+    with open(bank_path, "w", encoding="utf-8") as f:
+        for i in range(questions):
+            f.write(f"# 题目 {i}\n请说明第 {i} 个知识点\n\n")
+    roster_path = os.path.join(work_dir, "roster.txt")
+    with open(roster_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(f"学生{i:04d}" for i in range(persons)))
+    return bank_path, roster_path
+
+
+async def _request(reader, writer, request: dict) -> dict:
+    writer.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+    response = json.loads(await reader.readline())
+    if not response.get("ok"):
+        raise RuntimeError(f"请求失败: {request} -> {response}")
+    return response
+
+
+async def _client(index: int, port: int, args, bank_path: str, roster_path: str,
+                  ready: asyncio.Barrier, start_at: list, latencies: list,
+                  errors: list):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 20)
+    await _request(reader, writer, {"op": "open", "session": f"教室{index}",
+                                    "banks": [bank_path], "roster": roster_path,
+                                    "seed": index})
+    await ready.wait()
+
+    loop = asyncio.get_running_loop()
+    interval = args.sessions / args.rate
+    total = int(args.rate * args.duration / args.sessions)
+    # 各连接的发送时刻错开，整体速率均匀
+    first = start_at[0] + index / args.rate
+    scheduled = collections.deque()
+    request = json.dumps({"op": "draw", "session": f"教室{index}",
+                          "count": args.count, "person_no_repeat": False},
+                         ensure_ascii=False).encode("utf-8") + b"\n"
+
+    async def send():
+        for k in range(total):
+            at = first + k * interval
+            delay = at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            scheduled.append(at)
+            writer.write(request)
+
+    async def receive():
+        for _ in range(total):
+            line = await reader.readline()
+            latencies.append(loop.time() - scheduled.popleft())
+            if not json.loads(line).get("ok"):
+                errors.append(line)
+
+    await asyncio.gather(send(), receive())
+    writer.close()
+
+
+async def _run_clients(port: int, args, bank_path: str, roster_path: str) -> dict:
+    ready = asyncio.Barrier(args.sessions + 1)
+    start_at = [0.0]
+    latencies, errors = [], []
+    tasks = [asyncio.create_task(_client(i, port, args, bank_path, roster_path,
+                                         ready, start_at, latencies, errors))
+             for i in range(args.sessions)]
+    loop = asyncio.get_running_loop()
+    start_at[0] = loop.time() + 0.5
+    await ready.wait()
+    start_at[0] = max(start_at[0], loop.time() + 0.1)
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - start_at[0]
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        "target_rate": args.rate,
+        "sessions": args.sessions,
+        "requests": len(latencies),
+        "achieved_rate": round(len(latencies) / elapsed, 1),
+        "errors": len(errors),
+        "p50_ms": round(percentile(0.50), 2),
+        "p90_ms": round(percentile(0.90), 2),
+        "p99_ms": round(percentile(0.99), 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+def run(args, work_dir: str) -> dict:
+    bank_path, roster_path = _prepare(work_dir, args.questions, args.persons)
+    db_path = os.path.join(work_dir, "history.db")
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (ROOT_DIR, env.get("PYTHONPATH")) if p)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.server", "--port", "0", "--db", db_path],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.PIPE, text=True)
+    try:
+        line = proc.stdout.readline()
+        if not line.startswith("listening on"):
+            raise RuntimeError(f"服务启动失败: {line!r}")
+        port = int(line.rsplit(":", 1)[1])
+        result = asyncio.run(_run_clients(port, args, bank_path, roster_path))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+
+    with sqlite3.connect(db_path) as conn:
+        written = conn.execute("SELECT COUNT(*) FROM draw_history").fetchone()[0]
+    result["history_rows"] = written
+    result["history_lost"] = result["requests"] * args.count - written
+    result["server_exit"] = proc.returncode
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="抽题服务负载测试")
+    parser.add_argument("--rate", type=float, default=1000, help="总请求速率（次/秒）")
+    parser.add_argument("--duration", type=float, default=10, help="持续时间（秒）")
+    parser.add_argument("--sessions", type=int, default=50, help="会话（连接）数")
+    parser.add_argument("--count", type=int, default=1, help="每次抽题数")
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--persons", type=int, default=60)
+    parser.add_argument("--output", help="结果 JSON 文件")
+    args = parser.parse_args(argv)
+
+    per_session = args.rate * args.duration / args.sessions * args.count
+    if per_session > args.questions:
+        parser.error(f"每个会话需要抽 {per_session:.0f} 题，题库只有 {args.questions} 题")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = run(args, work_dir)
+
+    for key, value in result.items():
+        print(f"{key:>15}: {value}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"params": vars(args), "result": result}, f,
+                      ensure_ascii=False, indent=2)
+
+    ok = not result["errors"] and not result["history_lost"] and not result["server_exit"]
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
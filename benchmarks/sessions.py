@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+多会话内存与抽题性能测试
+
+同一个题库由 SessionManager 解析一次，打开大量会话后统计：
+- 共享题库占用的内存（即每个会话各持有一个 QuestionBank 时每个会话要多付出的内存）
+- 每个会话的额外内存（已抽位图、随机数生成器等），单位 KB
+- 题库剩余比例不同时单次抽题的耗时
+
+用法:
+    python -m benchmarks.sessions --questions 100000 --sessions 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.core.session import SessionManager
+
+
+def _write_bank(path: str, questions: int):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(questions):
+            f.write(f"# 题目 {i}\n请说明第 {i} 个知识点\n要求举例\n\n")
+
+
+def _traced(func):
+    """执行 func，返回 (结果, 新增内存字节数)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def _draw_latency(manager: SessionManager, bank, fill: float, draws: int = 200) -> float:
+    """题库已抽 fill 比例时单次抽题的平均耗时（微秒）"""
+    session = manager.open_session("latency", [bank], seed=1)
+    size = len(bank.questions)
+    target = min(int(size * fill), size - draws)
+    # 直接构造位图，避免逐题抽取
+    bitmap = bytearray((size + 7) // 8)
+    for i in range(target):
+        bitmap[i >> 3] |= 1 << (i & 7)
+    session.set_drawn_bitmap(bank.name, bytes(bitmap))
+
+    started = time.perf_counter()
+    for _ in range(draws):
+        session.draw(1)
+    elapsed = time.perf_counter() - started
+    manager.close_session("latency")
+    return elapsed / draws * 1e6
+
+
+def run(questions: int, sessions: int, draws: int, work_dir: str) -> dict:
+    bank_path = os.path.join(work_dir, "bank.md")
+    _write_bank(bank_path, questions)
+    manager = SessionManager()
+
+    started = time.perf_counter()
+    bank, bank_bytes = _traced(lambda: manager.load_bank(bank_path))
+    load_s = time.perf_counter() - started
+
+    def open_all():
+        for i in range(sessions):
+            session = manager.open_session(f"教室{i}", [manager.load_bank(bank_path)],
+                                           seed=i)
+            for _ in range(draws):
+                session.draw(1)
+    _, sessions_bytes = _traced(open_all)
+
+    assert all(manager.get_session(name)._banks[bank.name] is bank
+               for name in manager.session_names())
+
+    return {
+        "questions": questions,
+        "sessions": sessions,
+        "draws_per_session": draws,
+        "load_s": round(load_s, 3),
+        "shared_bank_mb": round(bank_bytes / 1e6, 2),
+        "per_session_kb": round(sessions_bytes / sessions / 1024, 2),
+        "all_sessions_mb": round(sessions_bytes / 1e6, 2),
+        "draw_us_empty": round(_draw_latency(manager, bank, 0.0), 1),
+        "draw_us_90pct": round(_draw_latency(manager, bank, 0.9), 1),
+        "draw_us_99pct": round(_draw_latency(manager, bank, 0.99), 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="多会话内存与抽题性能测试")
+    parser.add_argument("--questions", type=int, default=100000)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--draws", type=int, default=50, help="每个会话抽题次数")
+    parser.add_argument("--max-session-kb", type=float, default=64,
+                        help="每个会话内存上限（KB），超过时返回失败")
+    parser.add_argument("--output", help="结果 JSON 文件")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = run(args.questions, args.sessions, args.draws, work_dir)
+
+    for key, value in result.items():
+        print(f"{key:>18}: {value}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"params": vars(args), "result": result}, f,
+                      ensure_ascii=False, indent=2)
+
+    ok = result["per_session_kb"] <= args.max_session_kb
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+启动时间基准
+
+每次在新进程中启动主窗口，测量从进程启动到以下时刻的耗时（毫秒）:
+- imports: 导入 PyQt6 和 src.ui 完成
+- window: MainWindow 构造完成
+- first_paint: 主窗口第一次绘制
+- session: 上次会话的题库和名单恢复完成
+
+冷启动使用空的字节码缓存目录（-X pycache_prefix），模拟首次运行；
+热启动复用已预热的字节码缓存。两者使用同一个预先登记了题库和名单的数据库。
+没有显示器时设置 QT_QPA_PLATFORM=offscreen。
+
+用法:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.startup --runs 5 --questions 20000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PHASES = ["imports", "window", "first_paint", "session"]
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _child(db_path: str, banks: int, launched_at: float) -> int:
+    """在子进程中启动主窗口并报告各阶段耗时"""
+    marks = {}
+
+    def mark(name: str):
+        marks[name] = (time.time() - launched_at) * 1000
+
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QObject, QEvent, QTimer
+    from src.ui import MainWindow
+    mark("imports")
+
+    app = QApplication(sys.argv)
+    window = MainWindow(db_path)
+    mark("window")
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and "first_paint" not in marks:
+                mark("first_paint")
+            return False
+
+    watcher = PaintWatcher()
+    window.installEventFilter(watcher)
+
+    def check_session():
+        if ("first_paint" in marks and len(window._bank.get_bank_names()) >= banks
+                and window._roster.is_loaded()):
+            mark("session")
+            print(json.dumps(marks))
+            app.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(check_session)
+    timer.start(5)
+    # 超时保护
+    QTimer.singleShot(60000, app.quit)
+
+    window.show()
+    app.exec()
+    return 0 if "session" in marks else 1
+
+
+def _prepare(work_dir: str, banks: int, questions: int, persons: int) -> str:
+    """生成题库、名单并在数据库中登记，返回数据库路径"""
+    sys.path.insert(0, ROOT_DIR)
+    from src.storage.database import Database
+
+    db_path = os.path.join(work_dir, "data", "history.db")
+    os.makedirs(os.path.dirname(db_path))
+    db = Database(db_path)
+    for b in range(banks):
+        path = os.path.join(work_dir, f"bank{b}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(questions):
+                f.write(f"# 题目 {i}\n请说明第 {i} 个知识点\n要求举例\n\n")
+        db.register_bank(f"bank{b}", path, questions)
+
+    roster_path = os.path.join(work_dir, "roster.txt")
+    with open(roster_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(f"学生{i:05d}" for i in range(persons)))
+    db.register_roster("roster", roster_path, persons)
+    return db_path
+
+
+def _launch(db_path: str, banks: int, pycache: str) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (ROOT_DIR, env.get("PYTHONPATH")) if p)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    launched_at = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-X", f"pycache_prefix={pycache}", "-m", "benchmarks.startup",
+         "--child", db_path, str(banks), repr(launched_at)],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, timeout=120)
+    if proc.returncode != 0:
+        raise RuntimeError(f"启动失败:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="启动时间基准")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--banks", type=int, default=2)
+    parser.add_argument("--questions", type=int, default=20000)
+    parser.add_argument("--persons", type=int, default=500)
+    parser.add_argument("--output", help="结果 JSON 文件")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        db_path, banks, launched_at = args.child
+        return _child(db_path, int(banks), float(launched_at))
+
+    results = {"cold": [], "warm": []}
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = _prepare(work_dir, args.banks, args.questions, args.persons)
+        warm_cache = os.path.join(work_dir, "pycache-warm")
+        _launch(db_path, args.banks, warm_cache)
+
+        for run in range(args.runs):
+            cold_cache = os.path.join(work_dir, f"pycache-cold-{run}")
+            results["cold"].append(_launch(db_path, args.banks, cold_cache))
+            shutil.rmtree(cold_cache, ignore_errors=True)
+            results["warm"].append(_launch(db_path, args.banks, warm_cache))
+
+    print(f"{'mode':<6}" + "".join(f"{phase:>13}" for phase in PHASES) + "   (median ms)")
+    summary = {}
+    for mode, runs in results.items():
+        summary[mode] = {phase: statistics.median(r[phase] for r in runs)
+                         for phase in PHASES}
+        print(f"{mode:<6}" + "".join(f"{summary[mode][phase]:>13.1f}" for phase in PHASES))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"params": vars(args), "median_ms": summary, "runs": results},
+                      f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+基准测试套件
+
+以固定随机种子生成 1k / 100k / 1M 规模的合成题库、名单（见 synthetic.py）和抽题历史，
+测量解析、加载、抽题、历史读写和导出的耗时，结果写入 JSON 文件，
+可与之前提交的结果对比找出性能回退。
+
+每个用例在预算时间内最多重复 --repeat 次，报告最短和中位耗时，
+以及每项（题目、记录或一次调用）的中位耗时。
+
+用法:
+    python -m benchmarks                              # 全部规模
+    python -m benchmarks --scales 1k 100k --output base.json
+    python -m benchmarks --scales 1k 100k --compare base.json
+    python -m benchmarks --scales 1k --storage memory   # 历史用例改用内存存储
+    python -m benchmarks --scales 1m --cases get_history_all get_history_rows
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from src.core.bank import QuestionBank
+from src.core.drawer import DrawEngine
+from src.core.parser import MDParser
+from src.core.roster import RosterManager
+from src.storage.backend import STORAGE_KINDS, Storage, open_storage
+from src.storage.exporter import Exporter
+from .export_formats import populate
+from .synthetic import write_bank, write_roster
+
+SCALES: Dict[str, int] = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+DEFAULT_SEED = 20240501
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class Context:
+    """一个规模下各用例共用的数据"""
+    size: int
+    seed: int
+    work_dir: str
+    storage: str = "sqlite"
+    bank_path: str = ""
+    roster_path: str = ""
+    db: Optional[Storage] = None
+    bank: Optional[QuestionBank] = None
+    roster: Optional[RosterManager] = None
+    history_db: Optional[Storage] = None
+    records: list = field(default_factory=list)
+    page_key: Optional[tuple] = None
+
+    @property
+    def ops(self) -> int:
+        """逐次调用的用例每轮调用次数（规模越大单次越慢，次数越少）"""
+        return max(20, min(1000, 10 ** 8 // self.size, self.size))
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.work_dir, name)
+
+    def open_storage(self, name: str) -> Storage:
+        """在工作目录中打开名为 name 的存储（内存存储不使用文件）"""
+        ext = ".log" if self.storage == "log" else ".db"
+        return open_storage(f"{self.storage}:{self.path(name + ext)}")
+
+
+@dataclass
+class Case:
+    """基准用例
+
+    run 接收上下文并执行一轮被测操作；setup 在每轮之前执行，不计时。
+    items 返回一轮处理的项数，用于计算每项耗时。
+    """
+    name: str
+    run: Callable[[Context], object]
+    items: Callable[[Context], int]
+    setup: Optional[Callable[[Context], None]] = None
+
+
+def prepare(size: int, seed: int, work_dir: str, storage: str = "sqlite") -> Context:
+    """生成一个规模的题库、名单和历史记录"""
+    ctx = Context(size, seed, work_dir, storage)
+    ctx.bank_path = ctx.path("bank.md")
+    ctx.roster_path = ctx.path("roster.txt")
+    write_bank(ctx.bank_path, size, seed)
+    write_roster(ctx.roster_path, size, seed)
+
+    ctx.bank = QuestionBank()
+    ctx.bank.load_bank(ctx.bank_path)
+
+    ctx.db = ctx.open_storage("history")
+    populate(ctx.db, size, seed)
+    return ctx
+
+
+# ========== 用例 ==========
+
+def _draw(ctx: Context, no_repeat: bool):
+    engine = DrawEngine(ctx.bank, random.Random(ctx.seed))
+    for _ in range(ctx.ops):
+        engine.draw(1, None, no_repeat)
+
+
+def _roster_setup(ctx: Context):
+    roster = RosterManager(random.Random(ctx.seed))
+    roster.load_roster(ctx.roster_path)
+    ctx.roster = roster
+
+
+def _roster_draw(ctx: Context):
+    for _ in range(ctx.ops):
+        ctx.roster.draw(1, True)
+
+
+def _add_history(ctx: Context):
+    db = ctx.history_db
+    for i in range(ctx.ops):
+        db.add_history(f"q-{i}", f"题目 {i}", "内容", "bank", f"学生{i}")
+
+
+def _fresh_db(ctx: Context):
+    if ctx.history_db is not None:
+        ctx.history_db.close()
+    for path in glob.glob(ctx.path("write.*")):
+        os.remove(path)
+    ctx.history_db = ctx.open_storage("write")
+
+
+def _add_history_batch(ctx: Context):
+    populate(ctx.history_db, ctx.size, ctx.seed)
+
+
+def _page_key_setup(ctx: Context):
+    # 一次读取前半部分历史，得到位于中间的续读位置（不计时，只计算一次）
+    if ctx.page_key is None:
+        ctx.page_key = ctx.db.get_history_page(None, ctx.size // 2)[1]
+
+
+def _iter_history(ctx: Context):
+    for _ in ctx.db.iter_history_rows():
+        pass
+
+
+def _load_records(ctx: Context):
+    if len(ctx.records) != ctx.size:
+        ctx.records = ctx.db.get_history(-1)
+
+
+CASES: List[Case] = [
+    Case("parse_file", lambda ctx: MDParser.parse_file(ctx.bank_path),
+         lambda ctx: ctx.size),
+    Case("load_bank", lambda ctx: QuestionBank().load_bank(ctx.bank_path),
+         lambda ctx: ctx.size),
+    Case("draw_no_repeat", lambda ctx: _draw(ctx, True), lambda ctx: ctx.ops,
+         setup=lambda ctx: ctx.bank.reset_drawn()),
+    Case("draw_repeat", lambda ctx: _draw(ctx, False), lambda ctx: ctx.ops),
+    Case("roster_draw", _roster_draw, lambda ctx: ctx.ops, setup=_roster_setup),
+    Case("add_history", _add_history, lambda ctx: ctx.ops, setup=_fresh_db),
+    Case("add_history_batch", _add_history_batch, lambda ctx: ctx.size,
+         setup=_fresh_db),
+    Case("get_history_offset", lambda ctx: ctx.db.get_history(100, ctx.size // 2),
+         lambda ctx: 100),
+    Case("get_history_page", lambda ctx: ctx.db.get_history_page(ctx.page_key, 100),
+         lambda ctx: 100, setup=_page_key_setup),
+    # 全量读取历史（1m 规模即读取 100 万行）
+    Case("get_history_all", lambda ctx: ctx.db.get_history(-1), lambda ctx: ctx.size),
+    Case("get_history_rows", lambda ctx: ctx.db.get_history_rows(-1),
+         lambda ctx: ctx.size),
+    Case("iter_history_rows", _iter_history, lambda ctx: ctx.size),
+    Case("export_txt",
+         lambda ctx: Exporter.export_to_txt(ctx.records, ctx.path("export.txt")),
+         lambda ctx: ctx.size, setup=_load_records),
+    Case("export_excel",
+         lambda ctx: Exporter.export_to_excel(ctx.records, ctx.path("export.xlsx")),
+         lambda ctx: ctx.size, setup=_load_records),
+]
+
+
+# ========== 运行 ==========
+
+def measure(case: Case, ctx: Context, repeat: int, budget: float) -> dict:
+    """重复执行用例，总耗时超过预算后不再重复（至少执行一次）"""
+    times = []
+    while len(times) < repeat:
+        if case.setup is not None:
+            case.setup(ctx)
+        started = time.perf_counter()
+        result = case.run(ctx)
+        times.append(time.perf_counter() - started)
+        if result is False:
+            raise RuntimeError(f"{case.name} 执行失败")
+        if sum(times) >= budget:
+            break
+
+    items = case.items(ctx)
+    median = statistics.median(times)
+    return {
+        "name": case.name,
+        "items": items,
+        "runs": len(times),
+        "min_s": round(min(times), 6),
+        "median_s": round(median, 6),
+        "per_item_us": round(median / items * 1e6, 3),
+    }
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def compare(results: List[dict], baseline_path: str, threshold: float) -> List[str]:
+    """与基线结果比较每项中位耗时，返回回退的用例"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["scale"], r["name"]): r for r in json.load(f)["results"]}
+
+    print(f"\n对比 {baseline_path}（当前 / 基线，> {threshold} 视为回退）")
+    regressions = []
+    for r in results:
+        base = baseline.get((r["scale"], r["name"]))
+        if base is None or not base["per_item_us"]:
+            continue
+        ratio = r["per_item_us"] / base["per_item_us"]
+        r["baseline_ratio"] = round(ratio, 3)
+        mark = "  <-- 回退" if ratio > threshold else ""
+        print(f"{r['scale']:>6} {r['name']:<20}{ratio:>8.2f}x{mark}")
+        if ratio > threshold:
+            regressions.append(f"{r['scale']}/{r['name']}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="基准测试套件")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES))
+    parser.add_argument("--cases", nargs="+", choices=[c.name for c in CASES],
+                        help="只运行指定用例（默认全部）")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--storage", choices=STORAGE_KINDS, default="sqlite",
+                        help="历史读写用例使用的存储")
+    parser.add_argument("--repeat", type=int, default=5, help="每个用例最多重复次数")
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="每个用例的重复时间预算（秒）")
+    parser.add_argument("--output", default="benchmark-results.json", help="结果 JSON 文件")
+    parser.add_argument("--compare", help="基线结果 JSON 文件")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="与基线对比时视为回退的耗时比例")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in CASES if not args.cases or c.name in args.cases]
+    results = []
+    print(f"{'scale':>6} {'case':<20}{'items':>9}{'runs':>6}{'median s':>12}{'us/item':>12}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as work_dir:
+            ctx = prepare(SCALES[scale], args.seed, work_dir, args.storage)
+            for case in cases:
+                r = measure(case, ctx, args.repeat, args.budget)
+                r["scale"] = scale
+                results.append(r)
+                print(f"{scale:>6} {r['name']:<20}{r['items']:>9}{r['runs']:>6}"
+                      f"{r['median_s']:>12.4f}{r['per_item_us']:>12.2f}", flush=True)
+            for storage in (ctx.db, ctx.history_db):
+                if storage is not None:
+                    storage.close()
+
+    regressions = compare(results, args.compare, args.threshold) if args.compare else []
+
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "storage": args.storage,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已写入 {args.output}")
+
+    if regressions:
+        print("回退: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+合成题库与名单生成器
+
+按随机种子确定性地生成任意规模的题库（MDParser 格式）和名单
+（RosterManager 格式），分块流式写入磁盘，内存占用与规模无关。
+
+题库内容模仿 test_bank.md：中英文混排、部分标题带 # 前缀、多行要求，
+并按比例混入对解析器不友好的形状:
+- LF / CRLF 混用的换行符
+- 题目之间连续多个空行，以及只含空格和制表符的“空行”
+- 超长题目块（数千行要求）
+- 只有 # 的标题块（解析时跳过，不计入题目数）
+- 要求中出现 #、列表和代码块等 Markdown 语法
+
+名单包含重名、英文名、注释行、空行和首尾空白。
+
+生成函数返回解析后应得到的题目数或人数，可用于校验解析结果。
+
+用法:
+    python -m benchmarks.synthetic bank big.md --questions 1000000 --seed 7
+    python -m benchmarks.synthetic roster big.txt --persons 100000 --verify
+"""
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+DEFAULT_SEED = 20240501
+
+# 每次写入磁盘的题目（或人员）数
+WRITE_BATCH = 4096
+
+# 预先生成的文本行数，生成题目时从中选取
+LINE_POOL_SIZE = 4096
+
+ZH_WORDS = [
+    "请说明", "实现", "一个", "函数", "数据结构", "算法", "复杂度", "并发", "线程",
+    "进程", "内存", "缓存", "数据库", "索引", "事务", "网络", "协议", "接口",
+    "异常处理", "单元测试", "设计模式", "面向对象", "继承", "多态", "装饰器",
+    "生成器", "迭代器", "上下文管理器", "列表推导式", "字典", "集合", "排序",
+    "查找", "递归", "动态规划", "贪心", "二叉树", "哈希表", "链表", "队列",
+    "要求", "举例", "分析", "比较", "优缺点", "应用场景", "时间复杂度",
+]
+EN_WORDS = [
+    "Python", "list", "dict", "set", "tuple", "lambda", "async", "await",
+    "thread", "process", "GIL", "SQLite", "index", "cache", "LRU", "HTTP",
+    "TCP", "JSON", "API", "class", "object", "method", "decorator", "iterator",
+    "generator", "O(n)", "O(log n)", "hash", "tree", "graph", "queue", "stack",
+    "explain", "implement", "compare", "example", "edge case", "benchmark",
+]
+PUNCTUATION = ["", "。", "？", "；", ".", "?", "：", "！"]
+
+SURNAMES = list("王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘")
+GIVEN_CHARS = list("伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉萍红娥玲芬燕彬鑫宇浩然子轩")
+EN_NAMES = ["Alice", "Bob", "Carol", "David", "Emma", "Frank", "Grace", "Henry",
+            "Ivy", "Jack", "Kevin", "Lily", "Mia", "Noah", "Olivia", "Peter"]
+
+
+@dataclass
+class BankShape:
+    """题库形状参数"""
+    newline: str = "mixed"              # 换行符: lf / crlf / mixed（按题目随机）
+    crlf_ratio: float = 0.3             # mixed 时使用 CRLF 的题目比例
+    header_ratio: float = 0.5           # 标题带 # 前缀的比例
+    max_content_lines: int = 6          # 普通题目的最多要求行数
+    blank_run_max: int = 3              # 题目之间最多连续空行数
+    whitespace_blank_ratio: float = 0.1  # 空行中只含空白字符的比例
+    markdown_ratio: float = 0.1         # 要求中包含 Markdown 语法的题目比例
+    huge_every: int = 10000             # 每隔多少题生成一个超长题目块，0 不生成
+    huge_lines: int = 2000              # 超长题目块的要求行数
+    empty_title_every: int = 5000       # 每隔多少题插入一个只有 # 的块，0 不插入
+    bank_header: bool = True            # 文件开头的“# 题库名”块（解析为一道题）
+
+
+@dataclass
+class RosterShape:
+    """名单形状参数"""
+    newline: str = "mixed"
+    crlf_ratio: float = 0.3
+    duplicate_ratio: float = 0.05       # 与之前某人重名的比例
+    english_ratio: float = 0.1          # 英文名比例
+    comment_every: int = 50             # 每隔多少人插入一行注释，0 不插入
+    blank_ratio: float = 0.02           # 人员之间插入空行的比例
+    padding_ratio: float = 0.05         # 名字带首尾空白的比例
+
+
+def _newline(rng: random.Random, mode: str, crlf_ratio: float) -> str:
+    if mode == "lf":
+        return "\n"
+    if mode == "crlf":
+        return "\r\n"
+    return "\r\n" if rng.random() < crlf_ratio else "\n"
+
+
+def _line_pool(rng: random.Random, size: int = LINE_POOL_SIZE) -> List[str]:
+    """生成中英文混排的文本行"""
+    lines = []
+    for _ in range(size):
+        parts = []
+        for _ in range(rng.randint(3, 12)):
+            if rng.random() < 0.65:
+                parts.append(rng.choice(ZH_WORDS))
+            else:
+                parts.append(f" {rng.choice(EN_WORDS)} ")
+        lines.append("".join(parts).strip() + rng.choice(PUNCTUATION))
+    return lines
+
+
+def _markdown_lines(rng: random.Random, pool: List[str]) -> List[str]:
+    """要求中的 Markdown 片段（不含空行，不会拆分题目块）"""
+    shape = rng.randrange(4)
+    if shape == 0:
+        return [f"- {rng.choice(pool)}" for _ in range(rng.randint(2, 5))]
+    if shape == 1:
+        return ["```python", "def solve(data):",
+                f"    return sorted(data)  # {rng.choice(pool)}", "```"]
+    if shape == 2:
+        # 块内的 # 行属于要求，不是新题目
+        return [f"## {rng.choice(pool)}", rng.choice(pool)]
+    return [f"| {rng.choice(EN_WORDS)} | {rng.choice(ZH_WORDS)} |", "|---|---|",
+            f"| {rng.randrange(100)} | {rng.choice(pool)} |"]
+
+
+def iter_bank(questions: int, seed: int = DEFAULT_SEED,
+              shape: BankShape = None) -> Iterator[str]:
+    """分块生成题库文本
+
+    Args:
+        questions: 解析后的题目数（不含解析时跳过的块）
+        seed: 随机种子
+        shape: 形状参数
+
+    Yields:
+        文本块，按顺序拼接即为完整文件
+    """
+    shape = shape or BankShape()
+    rng = random.Random(seed)
+    pool = _line_pool(rng)
+    buffer: List[str] = []
+
+    def newline() -> str:
+        return _newline(rng, shape.newline, shape.crlf_ratio)
+
+    def blank_run():
+        for _ in range(rng.randint(1, shape.blank_run_max)):
+            blank = rng.choice([" ", "\t", "  \t "]) \
+                if rng.random() < shape.whitespace_blank_ratio else ""
+            buffer.append(blank + newline())
+
+    start = 0
+    if shape.bank_header and questions > 0:
+        buffer.append(f"# 合成题库 Synthetic Bank {seed}{newline()}")
+        blank_run()
+        start = 1
+
+    for i in range(start, questions):
+        nl = newline()
+        title = f"{rng.choice(pool)} {i}"
+        if rng.random() < shape.header_ratio:
+            title = "#" * rng.randint(1, 3) + " " + title
+
+        if shape.huge_every and i % shape.huge_every == shape.huge_every - 1:
+            content = [pool[(i + k) % len(pool)] for k in range(shape.huge_lines)]
+        else:
+            content = [rng.choice(pool)
+                       for _ in range(rng.randint(0, shape.max_content_lines))]
+            if rng.random() < shape.markdown_ratio:
+                content.extend(_markdown_lines(rng, pool))
+
+        buffer.append(title + nl)
+        if content:
+            buffer.append(nl.join(content) + nl)
+        blank_run()
+
+        if shape.empty_title_every and i % shape.empty_title_every == shape.empty_title_every - 1:
+            buffer.append("#" * rng.randint(1, 3) + nl)
+            blank_run()
+
+        if len(buffer) >= WRITE_BATCH:
+            yield "".join(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield "".join(buffer)
+
+
+def _person_name(rng: random.Random, english_ratio: float) -> str:
+    if rng.random() < english_ratio:
+        return f"{rng.choice(EN_NAMES)} {rng.choice(EN_NAMES)[0]}."
+    given = rng.choice(GIVEN_CHARS)
+    if rng.random() < 0.7:
+        given += rng.choice(GIVEN_CHARS)
+    return rng.choice(SURNAMES) + given
+
+
+def iter_roster(persons: int, seed: int = DEFAULT_SEED,
+                shape: RosterShape = None) -> Iterator[str]:
+    """分块生成名单文本
+
+    Args:
+        persons: 解析后的人数（重名按不同的人计算）
+        seed: 随机种子
+        shape: 形状参数
+
+    Yields:
+        文本块
+    """
+    shape = shape or RosterShape()
+    rng = random.Random(seed)
+    names: List[str] = []
+    buffer: List[str] = []
+
+    for i in range(persons):
+        nl = _newline(rng, shape.newline, shape.crlf_ratio)
+        if shape.comment_every and i % shape.comment_every == 0:
+            buffer.append(f"# 第 {i // shape.comment_every + 1} 组{nl}")
+        if rng.random() < shape.blank_ratio:
+            buffer.append(nl)
+
+        if names and rng.random() < shape.duplicate_ratio:
+            name = rng.choice(names)
+        else:
+            name = _person_name(rng, shape.english_ratio)
+            # 只保留一部分用于制造重名，内存与规模无关
+            if len(names) < LINE_POOL_SIZE:
+                names.append(name)
+            else:
+                names[rng.randrange(LINE_POOL_SIZE)] = name
+        if rng.random() < shape.padding_ratio:
+            name = rng.choice([" ", "\t", "　"]) + name + " "
+        buffer.append(name + nl)
+
+        if len(buffer) >= WRITE_BATCH:
+            yield "".join(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield "".join(buffer)
+
+
+def _write(path: str, chunks: Iterator[str]) -> int:
+    """写入文本块（不转换换行符），返回字节数"""
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for chunk in chunks:
+            written += f.write(chunk)
+    return written
+
+
+def write_bank(path: str, questions: int, seed: int = DEFAULT_SEED,
+               shape: BankShape = None) -> int:
+    """生成题库文件
+
+    Returns:
+        解析后应得到的题目数
+    """
+    _write(path, iter_bank(questions, seed, shape))
+    return questions
+
+
+def write_roster(path: str, persons: int, seed: int = DEFAULT_SEED,
+                 shape: RosterShape = None) -> int:
+    """生成名单文件
+
+    Returns:
+        解析后应得到的人数
+    """
+    _write(path, iter_roster(persons, seed, shape))
+    return persons
+
+
+def verify_bank(path: str, expected: int) -> Tuple[bool, int]:
+    """用 MDParser 解析生成的题库，返回 (题目数是否一致, 实际题目数)"""
+    from src.core.parser import MDParser
+    count = len(MDParser.parse_file(path))
+    return count == expected, count
+
+
+def verify_roster(path: str, expected: int) -> Tuple[bool, int]:
+    """用 RosterManager 解析生成的名单，返回 (人数是否一致, 实际人数)"""
+    from src.core.roster import RosterManager
+    count = len(RosterManager.parse_file(path))
+    return count == expected, count
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic",
+                                     description="合成题库与名单生成器")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bank = commands.add_parser("bank", help="生成题库")
+    bank.add_argument("file")
+    bank.add_argument("--questions", type=int, default=100000)
+    bank.add_argument("--newline", choices=["lf", "crlf", "mixed"], default="mixed")
+    bank.add_argument("--huge-every", type=int, default=BankShape.huge_every,
+                      help="每隔多少题生成一个超长题目块，0 不生成")
+    bank.add_argument("--huge-lines", type=int, default=BankShape.huge_lines)
+
+    roster = commands.add_parser("roster", help="生成名单")
+    roster.add_argument("file")
+    roster.add_argument("--persons", type=int, default=1000)
+    roster.add_argument("--newline", choices=["lf", "crlf", "mixed"], default="mixed")
+    roster.add_argument("--duplicate-ratio", type=float,
+                        default=RosterShape.duplicate_ratio)
+
+    for sub in (bank, roster):
+        sub.add_argument("--seed", type=int, default=DEFAULT_SEED)
+        sub.add_argument("--verify", action="store_true", help="生成后解析并核对数量")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == "bank":
+        shape = BankShape(newline=args.newline, huge_every=args.huge_every,
+                          huge_lines=args.huge_lines)
+        expected = write_bank(args.file, args.questions, args.seed, shape)
+        verify = verify_bank
+    else:
+        shape = RosterShape(newline=args.newline, duplicate_ratio=args.duplicate_ratio)
+        expected = write_roster(args.file, args.persons, args.seed, shape)
+        verify = verify_roster
+    elapsed = time.perf_counter() - started
+    print(f"已生成 {args.file}: {expected} 项, {elapsed:.2f} 秒")
+
+    if args.verify:
+        ok, count = verify(args.file, expected)
+        print(f"解析得到 {count} 项" + ("" if ok else f"，应为 {expected}"))
+        return 0 if ok else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
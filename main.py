@@ -4,21 +4,41 @@
 随机抽题机 - 程序入口
 """
 
+import argparse
+import multiprocessing
 import sys
-from PyQt6.QtWidgets import QApplication
-from src.ui import MainWindow
 
 
 def main():
-    """程序主入口"""
-    app = QApplication(sys.argv)
+    """程序主入口
+
+    界面模块在这里才导入：讲义导出的进程池在 Windows（及打包的 exe）上以 spawn
+    方式启动工作进程，工作进程会重新导入本模块，模块级只保留轻量导入。
+    """
+    from PyQt6.QtWidgets import QApplication
+    from src.ui import MainWindow
+    from src.ui.main_window import ARCHIVE_KEEP_MONTHS
+
+    parser = argparse.ArgumentParser(description="随机抽题机")
+    parser.add_argument("--storage",
+                        help="存储位置: sqlite:PATH / memory / log:PATH，"
+                             "默认读取环境变量 RQG_STORAGE，仍未设置则为 data/history.db")
+    parser.add_argument("--archive-months", type=int, default=ARCHIVE_KEEP_MONTHS,
+                        help="启动时主库保留的历史月份数，更早的记录移入归档；"
+                             f"0 表示不归档，默认 {ARCHIVE_KEEP_MONTHS}")
+    # 其余参数交给 Qt 处理
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("随机抽题机")
 
-    window = MainWindow()
+    window = MainWindow(storage=args.storage, archive_months=args.archive_months)
     window.show()
 
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    # 打包的 exe 中，工作进程从这里进入并执行进程池任务，不会启动界面
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+随机抽题机 - 命令行入口
+
+不依赖 PyQt6，可在无界面的环境（定时任务、脚本）中使用。
+
+用法:
+    # 从两个题库中抽 3 轮、每轮 5 题并分配人员，按 JSONL 逐行输出
+    python -m src.cli draw -b a.md -b b.md -r roster.txt -n 5 --rounds 3 --seed 7
+
+    # 抽题并导出为 Excel，不写入历史
+    python -m src.cli draw -b a.md -n 10 --export paper.xlsx --no-db
+
+    # 以 JSONL 流式输出全部历史 / 导出历史（按扩展名选择格式）
+    python -m src.cli history
+    python -m src.cli export-history history.csv.gz
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from src.core import metrics
+from src.core.bank import QuestionBank
+from src.core.drawer import DrawEngine
+from src.core.result import DrawResult
+from src.core.roster import RosterManager
+
+# 存储和导出模块只在需要时导入，--no-db 且不导出时不加载
+
+
+class CliError(Exception):
+    """命令执行失败（输出错误信息并以非零状态退出）"""
+
+
+def _open_storage(args):
+    from src.storage.backend import open_storage
+    return open_storage(args.storage if args.storage else args.db)
+
+
+def _result_line(result: DrawResult, round_no: int, index: int, draw_ts: int) -> str:
+    return json.dumps({
+        "round": round_no,
+        "index": index,
+        "question_id": result.question_id,
+        "question_title": result.question_title,
+        "question_content": result.question_content,
+        "bank_name": result.bank_name,
+        "person_name": result.person_name,
+        "draw_ts": draw_ts,
+    }, ensure_ascii=False)
+
+
+def _result_text(result: DrawResult, round_no: int, index: int) -> str:
+    person = f" [{result.person_name}]" if result.person_name else ""
+    return f"{round_no}.{index} {result.question_title}{person} ({result.bank_name})"
+
+
+def draw_rounds(bank: QuestionBank, roster: Optional[RosterManager],
+                engine: DrawEngine, count: int, rounds: int,
+                bank_name: Optional[str] = None, no_repeat: bool = True,
+                person_no_repeat: bool = True) -> Iterator[List[DrawResult]]:
+    """按轮抽题，每轮产出一组结果（与界面的一次抽取相同）
+
+    Args:
+        bank: 题库管理器
+        roster: 名单管理器，为 None 时不抽人
+        engine: 抽题引擎
+        count: 每轮题目数
+        rounds: 轮数
+        bank_name: 题库名称，为 None 时从所有题库抽取
+        no_repeat: 题目去重
+        person_no_repeat: 人员去重
+
+    Raises:
+        CliError: 题目或人员不足
+    """
+    for round_no in range(1, rounds + 1):
+        if roster is not None and person_no_repeat:
+            available = roster.get_available_count(True)
+            if available < count:
+                raise CliError(f"第 {round_no} 轮剩余人员不足: 仅剩 {available} 人")
+
+        questions = engine.draw(count, bank_name, no_repeat)
+        if not questions:
+            raise CliError(f"第 {round_no} 轮没有可抽取的题目")
+
+        results = []
+        for q in questions:
+            person_name = person_id = ""
+            if roster is not None:
+                person = roster.draw_one(person_no_repeat)
+                if person:
+                    person_name, person_id = person.name, person.id
+            results.append(DrawResult(q.title, q.content, q.id, q.bank_name,
+                                      person_name, person_id))
+        yield results
+
+
+def cmd_draw(args, out: TextIO) -> int:
+    """draw 子命令"""
+    rng = random.Random(args.seed)
+    bank = QuestionBank()
+    for path in args.bank:
+        bank.load_bank(path)
+    if args.bank_name and args.bank_name not in bank.get_bank_names():
+        raise CliError(f"未加载题库: {args.bank_name}")
+
+    roster = None
+    if args.roster:
+        roster = RosterManager(rng)
+        if not roster.load_roster(args.roster):
+            raise CliError(f"名单为空: {args.roster}")
+    engine = DrawEngine(bank, rng)
+
+    db = None if args.no_db else _open_storage(args)
+    if db is not None and args.resume:
+        _restore_state(db, bank, roster)
+
+    from src.storage.backend import now_ms
+
+    collected: List[DrawResult] = []
+    status = 0
+    try:
+        for round_no, results in enumerate(
+                draw_rounds(bank, roster, engine, args.count, args.rounds,
+                            args.bank_name, not args.allow_repeat,
+                            not args.allow_person_repeat), 1):
+            draw_ts = now_ms()
+            for index, result in enumerate(results, 1):
+                if args.format == "jsonl":
+                    out.write(_result_line(result, round_no, index, draw_ts) + "\n")
+                else:
+                    out.write(_result_text(result, round_no, index) + "\n")
+            out.flush()
+
+            if db is not None:
+                db.add_history_batch(
+                    [(r.question_id, r.question_title, r.question_content,
+                      r.bank_name, r.person_name, draw_ts) for r in results])
+            if args.export:
+                collected.extend(results)
+    except CliError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        status = 1
+
+    if db is not None and args.resume:
+        _save_state(db, bank, roster, not args.allow_repeat,
+                    not args.allow_person_repeat)
+
+    if args.export and collected:
+        _export_results(collected, args.export)
+    return status
+
+
+def _restore_state(db, bank: QuestionBank, roster: Optional[RosterManager]):
+    """从存储恢复已抽状态（与图形界面共享）"""
+    bitmaps = db.get_drawn_bitmaps()
+    for bank_name in bank.get_bank_names():
+        saved = bitmaps.get(bank_name)
+        # 题目数或内容指纹不一致时题库已变化，不恢复旧的已抽状态
+        if saved and saved[0] == bank.get_question_count(bank_name):
+            bank.set_drawn_bitmap(bank_name, saved[1], saved[2])
+    if roster is not None:
+        names = {p.name for p in roster.get_persons()}
+        roster.set_drawn_names(db.get_drawn_person_names() & names)
+
+
+def _save_state(db, bank: QuestionBank, roster: Optional[RosterManager],
+                no_repeat: bool, person_no_repeat: bool):
+    """保存已抽状态"""
+    if no_repeat:
+        for bank_name in bank.get_bank_names():
+            db.save_drawn_bitmap(bank_name, bank.get_question_count(bank_name),
+                                 bank.get_drawn_bitmap(bank_name),
+                                 bank.get_fingerprint(bank_name))
+    if roster is not None and person_no_repeat:
+        db.add_drawn_persons(roster.get_drawn_names())
+
+
+def _export_results(results: List[DrawResult], file_path: str):
+    """按扩展名导出抽题结果"""
+    from src.storage.exporter import Exporter
+
+    if file_path.endswith(".xlsx"):
+        ok = Exporter.export_results_to_excel(results, file_path)
+    elif file_path.endswith(".txt"):
+        ok = Exporter.export_results_to_txt(results, file_path)
+    else:
+        raise CliError(f"不支持的导出格式: {file_path}（支持 .xlsx / .txt）")
+    if not ok:
+        raise CliError(f"导出失败: {file_path}")
+    print(f"已导出 {len(results)} 条结果到 {file_path}", file=sys.stderr)
+
+
+def cmd_history(args, out: TextIO) -> int:
+    """history 子命令：以 JSONL 流式输出历史记录（字段与 JSONL 导出相同）"""
+    from src.storage.exporter import DATA_FIELDS, data_row
+
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    remaining = args.limit or None
+    for chunk in _open_storage(args).iter_history_rows():
+        if remaining is not None:
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+        out.write("".join(encode(dict(zip(DATA_FIELDS, data_row(row)))) + "\n"
+                          for row in chunk))
+        out.flush()
+        if remaining == 0:
+            break
+    return 0
+
+
+# 历史导出格式: 扩展名 -> Exporter 方法名
+HISTORY_EXPORTS: Dict[str, str] = {
+    ".csv": "export_history_to_csv",
+    ".csv.gz": "export_history_to_csv",
+    ".jsonl": "export_history_to_jsonl",
+    ".jsonl.gz": "export_history_to_jsonl",
+    ".arrow": "export_history_to_arrow",
+    ".xlsx": "export_history_to_excel",
+}
+
+
+def cmd_export_history(args, out: TextIO) -> int:
+    """export-history 子命令：按扩展名导出全部历史"""
+    from src.storage.exporter import Exporter
+
+    for suffix in sorted(HISTORY_EXPORTS, key=len, reverse=True):
+        if args.file.endswith(suffix):
+            export = getattr(Exporter, HISTORY_EXPORTS[suffix])
+            break
+    else:
+        raise CliError(f"不支持的导出格式: {args.file}"
+                       f"（支持 {' / '.join(HISTORY_EXPORTS)}）")
+
+    if not export(_open_storage(args), args.file):
+        raise CliError(f"导出失败: {args.file}")
+    print(f"已导出历史到 {args.file}", file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli", description="随机抽题机命令行工具（无界面）")
+    location = parser.add_mutually_exclusive_group()
+    location.add_argument("--db", help="SQLite 数据库文件路径，默认与图形界面共用 data/history.db")
+    location.add_argument("--storage",
+                          help="存储位置: sqlite:PATH / memory / log:PATH，"
+                               "默认读取环境变量 RQG_STORAGE")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="记录性能统计，结束时以 Prometheus 文本格式写入 FILE")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    draw = commands.add_parser("draw", help="抽题（可同时抽人）")
+    draw.add_argument("-b", "--bank", action="append", required=True,
+                      help="题库文件，可重复指定")
+    draw.add_argument("--bank-name", help="只从指定名称的题库抽取（默认从所有题库）")
+    draw.add_argument("-r", "--roster", help="名单文件，指定后为每道题分配人员")
+    draw.add_argument("-n", "--count", type=int, default=1, help="每轮题目数")
+    draw.add_argument("--rounds", type=int, default=1, help="轮数")
+    draw.add_argument("--seed", type=int, help="随机种子，指定后结果可复现")
+    draw.add_argument("--allow-repeat", action="store_true", help="关闭题目去重")
+    draw.add_argument("--allow-person-repeat", action="store_true", help="关闭人员去重")
+    draw.add_argument("--format", choices=["jsonl", "text"], default="jsonl",
+                      help="标准输出格式（默认 JSONL，每道题一行）")
+    draw.add_argument("--export", help="同时导出结果（.xlsx / .txt）")
+    draw.add_argument("--no-db", action="store_true", help="不写入历史记录")
+    draw.add_argument("--resume", action="store_true",
+                      help="从存储恢复并保存已抽状态（与图形界面共享）")
+    draw.set_defaults(func=cmd_draw)
+
+    history = commands.add_parser("history", help="以 JSONL 输出历史记录（最新的在前）")
+    history.add_argument("--limit", type=int, default=0, help="最多输出条数，0 为全部")
+    history.set_defaults(func=cmd_history)
+
+    export = commands.add_parser("export-history", help="导出全部历史记录")
+    export.add_argument("file", help="导出文件，格式由扩展名决定")
+    export.set_defaults(func=cmd_export_history)
+    return parser
+
+
+def main(argv=None, out: TextIO = None) -> int:
+    """命令行主入口
+
+    Returns:
+        退出状态码
+    """
+    args = build_parser().parse_args(argv)
+    if getattr(args, "count", 1) < 1 or getattr(args, "rounds", 1) < 1:
+        print("错误: --count 和 --rounds 必须大于 0", file=sys.stderr)
+        return 2
+    if getattr(args, "resume", False) and args.no_db:
+        print("错误: --resume 不能与 --no-db 同时使用", file=sys.stderr)
+        return 2
+
+    if args.metrics:
+        metrics.enable()
+    try:
+        return args.func(args, out or sys.stdout)
+    except CliError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # 下游管道提前关闭（如 | head），丢弃剩余输出
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.metrics:
+            metrics.dump_prometheus(args.metrics)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,10 @@
 # 核心业务逻辑模块
 from .question import Question
+from .result import DrawResult
 from .parser import MDParser
 from .bank import QuestionBank
 from .drawer import DrawEngine
 from .roster import RosterManager
+from .import_job import ImportJob, ImportResult
+from .events import Observable
+from .session import DrawSession, SessionManager, SharedBank, SharedRoster
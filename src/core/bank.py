@@ -4,24 +4,47 @@
 题库管理器
 """
 
-from typing import Dict, List, Optional, Set
+import bisect
+import hashlib
+import os
+import random
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from . import metrics
 from .question import Question
 from .parser import MDParser
+from .events import Observable, BANK_ADDED, BANK_REMOVED, DRAWN_CHANGED
 
 
-class QuestionBank:
+class QuestionBank(Observable):
     """题库管理器
 
-    管理多个题库文件，支持题目的加载、查询和去重标记
+    管理多个题库文件，支持题目的加载、查询和去重标记。
+    题库或已抽取记录变化时通知订阅者（见 Observable.subscribe）。
+
+    线程安全：每个题库有一把锁和一个已抽取ID集合，读写某个题库的已抽状态
+    和可抽数缓存时持有该题库的锁，涉及所有题库的操作按名称顺序获取全部题库锁；
+    draw 在一次加锁中完成选题和标记，多个线程并发去重抽取不会抽到同一道题。
+    监听函数在修改状态的线程中、释放锁之后调用。
     """
 
     def __init__(self):
+        super().__init__()
         # 题库: {题库名称: [Question列表]}
         self._banks: Dict[str, List[Question]] = {}
         # 题库文件路径: {题库名称: 文件路径}
         self._bank_paths: Dict[str, str] = {}
-        # 已抽取的题目ID集合（用于去重）
-        self._drawn_ids: Set[str] = set()
+        # 已抽取的题目ID: {题库名称: ID集合}，由该题库的锁保护
+        self._drawn_ids: Dict[str, Set[str]] = {}
+        # 题库内容指纹缓存: {题库名称: 指纹}，题库加载或移除时清除
+        self._fingerprints: Dict[str, str] = {}
+        # 可抽取题目数缓存: {题库名称: 数量}，在题库锁内写入和移除
+        self._available_counts: Dict[str, int] = {}
+        # 题库锁: {题库名称: 锁}，题库移除后保留，同名题库重新加载时继续使用
+        self._bank_locks: Dict[str, threading.RLock] = {}
+        # 保护题库字典和锁字典的结构修改
+        self._lock = threading.RLock()
 
     def load_bank(self, file_path: str) -> str:
         """加载题库文件
@@ -32,19 +55,39 @@ class QuestionBank:
         Returns:
             题库名称
         """
-        questions = MDParser.parse_file(file_path)
+        return self.add_bank(file_path, MDParser.parse_file(file_path))
+
+    def add_bank(self, file_path: str, questions: List[Question]) -> str:
+        """添加已解析的题库
+
+        解析可以在工作线程中完成，再由持有题库的线程调用本方法登记。
+
+        Args:
+            file_path: MD 文件路径
+            questions: 解析得到的题目列表
+
+        Returns:
+            题库名称
+        """
         bank_name = questions[0].bank_name if questions else ""
 
         if not bank_name:
-            import os
             bank_name = os.path.splitext(os.path.basename(file_path))[0]
 
         # 如果题库已存在，先移除
         if bank_name in self._banks:
             self.remove_bank(bank_name)
 
-        self._banks[bank_name] = questions
-        self._bank_paths[bank_name] = file_path
+        with self._lock:
+            self._bank_locks.setdefault(bank_name, threading.RLock())
+        with self._locked(bank_name):
+            with self._lock:
+                self._banks[bank_name] = questions
+                self._bank_paths[bank_name] = file_path
+                self._drawn_ids[bank_name] = set()
+                self._fingerprints.pop(bank_name, None)
+            self._invalidate(bank_name)
+        self._changed(BANK_ADDED, bank_name)
 
         return bank_name
 
@@ -57,15 +100,18 @@ class QuestionBank:
         Returns:
             是否成功移除
         """
-        if bank_name in self._banks:
-            # 移除该题库中已抽取的题目记录
-            bank_question_ids = {q.id for q in self._banks[bank_name]}
-            self._drawn_ids -= bank_question_ids
-
-            del self._banks[bank_name]
-            del self._bank_paths[bank_name]
-            return True
-        return False
+        with self._locked(bank_name):
+            if bank_name not in self._banks:
+                return False
+            # 同时移除该题库的已抽取记录
+            with self._lock:
+                del self._banks[bank_name]
+                del self._bank_paths[bank_name]
+                del self._drawn_ids[bank_name]
+                self._fingerprints.pop(bank_name, None)
+            self._invalidate(bank_name)
+        self._changed(BANK_REMOVED, bank_name)
+        return True
 
     def get_bank_names(self) -> List[str]:
         """获取所有题库名称"""
@@ -89,7 +135,7 @@ class QuestionBank:
 
         # 返回所有题库的题目
         all_questions = []
-        for questions in self._banks.values():
+        for questions in list(self._banks.values()):
             all_questions.extend(questions)
         return all_questions
 
@@ -104,12 +150,65 @@ class QuestionBank:
         Returns:
             可抽取的题目列表
         """
-        questions = self.get_questions(bank_name)
+        if not exclude_drawn:
+            return list(self.get_questions(bank_name))
+
+        with self._locked(bank_name):
+            return self._available(bank_name)[0]
+
+    def _available(self, bank_name: Optional[str]) -> Tuple[List[Question], List[Tuple[int, str]]]:
+        """可抽取的题目列表及各题库在列表中的结束位置 [(结束位置, 题库名称)]
+
+        调用方须持有相应题库的锁。
+        """
+        available: List[Question] = []
+        ends: List[Tuple[int, str]] = []
+        names = [bank_name] if bank_name else list(self._banks)
+        for name in names:
+            drawn_ids = self._drawn_ids.get(name, ())
+            available.extend(q for q in self._banks.get(name, ()) if q.id not in drawn_ids)
+            ends.append((len(available), name))
+        return available, ends
 
-        if exclude_drawn:
-            questions = [q for q in questions if q.id not in self._drawn_ids]
+    def draw(self, count: int = 1, bank_name: Optional[str] = None,
+             no_repeat: bool = True, rng: Optional[random.Random] = None) -> List[Question]:
+        """随机抽取题目
 
-        return questions
+        去重抽取时，选题和标记已抽取在同一次加锁中完成。
+
+        Args:
+            count: 抽取数量，超过可抽数量时只抽剩余的题目
+            bank_name: 题库名称，为 None 时从所有题库抽取
+            no_repeat: 是否排除并标记已抽取的题目
+            rng: 随机数生成器，默认使用 random 模块的全局生成器
+
+        Returns:
+            抽取的题目列表
+        """
+        rng = rng if rng is not None else random
+        with self._locked(bank_name):
+            with metrics.timer("bank.available_list"):
+                if no_repeat:
+                    available, ends = self._available(bank_name)
+                else:
+                    available, ends = self.get_questions(bank_name), []
+            if not available:
+                return []
+            with metrics.timer("bank.sample"):
+                # 按序号抽样（与直接对题目列表抽样的随机序列相同），以便找到所属题库
+                indexes = rng.sample(range(len(available)), min(count, len(available)))
+                drawn = [available[i] for i in indexes]
+            if no_repeat:
+                with metrics.timer("bank.mark_drawn"):
+                    bounds = [end for end, _ in ends]
+                    for i in indexes:
+                        name = ends[bisect.bisect_right(bounds, i)][1]
+                        self._drawn_ids[name].add(available[i].id)
+                self._invalidate(bank_name or None)
+        metrics.count("bank.questions_drawn", len(drawn))
+        if no_repeat:
+            self._changed(DRAWN_CHANGED, bank_name or None)
+        return drawn
 
     def get_question_count(self, bank_name: Optional[str] = None) -> int:
         """获取题目总数"""
@@ -117,20 +216,48 @@ class QuestionBank:
 
     def get_available_count(self, bank_name: Optional[str] = None,
                             exclude_drawn: bool = True) -> int:
-        """获取可抽取题目数量"""
-        return len(self.get_available_questions(bank_name, exclude_drawn))
+        """获取可抽取题目数量（计数不构建列表，结果缓存到题库下一次变化）"""
+        if not exclude_drawn:
+            return self.get_question_count(bank_name)
+        if not bank_name:
+            return sum(self.get_available_count(name) for name in self.get_bank_names())
+
+        count = self._available_counts.get(bank_name)
+        if count is None:
+            metrics.count("bank.count_cache_misses")
+            # 在题库锁内计数并写入缓存，修改后的清除不会被旧的计数覆盖
+            with self._locked(bank_name), metrics.timer("bank.count_available"):
+                drawn_ids = self._drawn_ids.get(bank_name, ())
+                count = sum(1 for q in self._banks.get(bank_name, ())
+                            if q.id not in drawn_ids)
+                self._available_counts[bank_name] = count
+        return count
 
     def mark_drawn(self, question_ids: List[str]):
         """标记题目为已抽取
 
+        需要查找每个ID所属的题库，耗时与题目总数成正比；
+        不属于任何已加载题库的ID被忽略。
+
         Args:
             question_ids: 题目ID列表
         """
-        self._drawn_ids.update(question_ids)
+        with self._locked():
+            self._add_drawn_ids(set(question_ids))
+            self._invalidate()
+        self._changed(DRAWN_CHANGED)
 
-    def is_drawn(self, question_id: str) -> bool:
-        """检查题目是否已抽取"""
-        return question_id in self._drawn_ids
+    def is_drawn(self, question_id: str, bank_name: Optional[str] = None) -> bool:
+        """检查题目是否已抽取
+
+        Args:
+            question_id: 题目ID
+            bank_name: 题目所属题库，已知时只需持有该题库的锁
+        """
+        with self._locked(bank_name):
+            if bank_name:
+                return question_id in self._drawn_ids.get(bank_name, ())
+            return any(question_id in drawn_ids for drawn_ids in self._drawn_ids.values())
 
     def reset_drawn(self, bank_name: Optional[str] = None):
         """重置已抽取记录
@@ -138,16 +265,141 @@ class QuestionBank:
         Args:
             bank_name: 题库名称，为 None 时重置所有
         """
-        if bank_name:
-            bank_question_ids = {q.id for q in self._banks.get(bank_name, [])}
-            self._drawn_ids -= bank_question_ids
-        else:
-            self._drawn_ids.clear()
+        with self._locked(bank_name):
+            for name in [bank_name] if bank_name else list(self._drawn_ids):
+                if name in self._drawn_ids:
+                    self._drawn_ids[name].clear()
+            self._invalidate(bank_name)
+        self._changed(DRAWN_CHANGED, bank_name)
+
+    def get_drawn_bitmap(self, bank_name: str) -> bytes:
+        """获取题库的已抽状态位图
+
+        第 i 位（小端，按字节）表示题库中第 i 道题是否已抽取。
+        题目ID每次加载都会重新生成，位图按序号记录，可跨启动恢复。
+
+        Args:
+            bank_name: 题库名称
+
+        Returns:
+            位图字节串
+        """
+        with self._locked(bank_name):
+            questions = self._banks.get(bank_name, [])
+            bitmap = bytearray((len(questions) + 7) // 8)
+            drawn_ids = self._drawn_ids.get(bank_name, ())
+            for i, q in enumerate(questions):
+                if q.id in drawn_ids:
+                    bitmap[i >> 3] |= 1 << (i & 7)
+        return bytes(bitmap)
+
+    def get_fingerprint(self, bank_name: str) -> str:
+        """获取题库内容指纹
+
+        按顺序对所有题目的标题和要求计算摘要（题目ID每次加载都会变化，不参与计算），
+        题库文件被编辑或替换后指纹随之改变，用于判断保存的位图是否仍对应同一批题目。
+        结果缓存到题库重新加载。
+
+        Args:
+            bank_name: 题库名称
+
+        Returns:
+            十六进制摘要；题库不存在时返回空字符串
+        """
+        with self._locked(bank_name):
+            fingerprint = self._fingerprints.get(bank_name)
+            if fingerprint is None:
+                questions = self._banks.get(bank_name)
+                if questions is None:
+                    return ""
+                digest = hashlib.blake2b(digest_size=16)
+                for q in questions:
+                    digest.update(q.title.encode("utf-8"))
+                    digest.update(b"\0")
+                    digest.update(q.content.encode("utf-8"))
+                    digest.update(b"\0")
+                fingerprint = self._fingerprints[bank_name] = digest.hexdigest()
+            return fingerprint
+
+    def set_drawn_bitmap(self, bank_name: str, bitmap: bytes,
+                         fingerprint: Optional[str] = None) -> bool:
+        """按位图恢复题库的已抽状态
+
+        Args:
+            bank_name: 题库名称
+            bitmap: get_drawn_bitmap 生成的位图
+            fingerprint: 保存位图时的题库内容指纹，指定时须与当前题库一致
+
+        Returns:
+            位图与题库题目数（及内容指纹）匹配并已恢复时返回 True
+        """
+        with self._locked(bank_name):
+            questions = self._banks.get(bank_name)
+            if questions is None or len(bitmap) != (len(questions) + 7) // 8:
+                return False
+            if fingerprint is not None and fingerprint != self.get_fingerprint(bank_name):
+                return False
+
+            drawn_ids = []
+            for byte_index, byte in enumerate(bitmap):
+                if not byte:
+                    continue
+                base = byte_index << 3
+                for bit in range(8):
+                    if byte >> bit & 1 and base + bit < len(questions):
+                        drawn_ids.append(questions[base + bit].id)
+
+            self._drawn_ids[bank_name] = set(drawn_ids)
+            self._invalidate(bank_name)
+        self._changed(DRAWN_CHANGED, bank_name)
+        return True
 
     def get_drawn_ids(self) -> Set[str]:
-        """获取已抽取的题目ID集合"""
-        return self._drawn_ids.copy()
+        """获取已抽取的题目ID集合（所有题库）"""
+        with self._locked():
+            return set().union(*self._drawn_ids.values())
 
     def set_drawn_ids(self, drawn_ids: Set[str]):
-        """设置已抽取的题目ID集合（用于恢复状态）"""
-        self._drawn_ids = set(drawn_ids)
+        """设置已抽取的题目ID集合（用于恢复状态，不属于已加载题库的ID被忽略）"""
+        with self._locked():
+            for ids in self._drawn_ids.values():
+                ids.clear()
+            self._add_drawn_ids(set(drawn_ids))
+            self._invalidate()
+        self._changed(DRAWN_CHANGED)
+
+    def _add_drawn_ids(self, question_ids: Set[str]):
+        """将ID加入所属题库的已抽取集合（调用方须持有所有题库的锁）"""
+        for name, questions in self._banks.items():
+            drawn_ids = self._drawn_ids[name]
+            drawn_ids.update(q.id for q in questions if q.id in question_ids)
+
+    @contextmanager
+    def _locked(self, bank_name: Optional[str] = None) -> Iterator[None]:
+        """持有指定题库的锁；为 None 时按名称顺序持有所有题库的锁"""
+        with self._lock:
+            if bank_name:
+                locks = [self._bank_locks[bank_name]] if bank_name in self._bank_locks else []
+            else:
+                locks = [self._bank_locks[name] for name in sorted(self._bank_locks)]
+        with metrics.timer("bank.lock_wait"):
+            for lock in locks:
+                lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def _invalidate(self, bank_name: Optional[str] = None):
+        """清除可抽数缓存（调用方须持有相应题库的锁，
+        使并发的 get_available_count 不会在修改后写回旧的计数）"""
+        if bank_name:
+            self._available_counts.pop(bank_name, None)
+        else:
+            self._available_counts.clear()
+
+    def _changed(self, event: str, bank_name: Optional[str] = None):
+        """通知订阅者（在释放题库锁后调用）"""
+        with metrics.timer("bank.notify"):
+            self._notify(event, bank_name)
@@ -6,6 +6,7 @@
 
 import random
 from typing import List, Optional
+from . import metrics
 from .question import Question
 from .bank import QuestionBank
 
@@ -13,16 +14,20 @@ from .bank import QuestionBank
 class DrawEngine:
     """抽题引擎
 
-    提供随机抽题功能，支持去重和批量抽取
+    提供随机抽题功能，支持去重和批量抽取。
+    可在多个线程中共用（同一个题库也可以），去重抽取是原子的。
     """
 
-    def __init__(self, bank: QuestionBank):
+    def __init__(self, bank: QuestionBank, rng: Optional[random.Random] = None):
         """初始化抽题引擎
 
         Args:
             bank: 题库管理器实例
+            rng: 随机数生成器，指定带种子的 random.Random 可复现抽取结果；
+                 默认使用 random 模块的全局生成器
         """
         self._bank = bank
+        self._random = rng if rng is not None else random
 
     def draw(self, count: int = 1,
              bank_name: Optional[str] = None,
@@ -37,22 +42,9 @@ class DrawEngine:
         Returns:
             抽取的题目列表
         """
-        available = self._bank.get_available_questions(bank_name, no_repeat)
-
-        if not available:
-            return []
-
-        # 限制抽取数量不超过可用题目数
-        count = min(count, len(available))
-
-        # 随机抽取
-        drawn = random.sample(available, count)
-
-        # 如果启用去重，标记为已抽取
-        if no_repeat:
-            self._bank.mark_drawn([q.id for q in drawn])
-
-        return drawn
+        # 选题和标记已抽取由题库在一次加锁中完成，多线程抽取不会重复
+        with metrics.timer("engine.draw"):
+            return self._bank.draw(count, bank_name, no_repeat, self._random)
 
     def draw_one(self, bank_name: Optional[str] = None,
                  no_repeat: bool = True) -> Optional[Question]:
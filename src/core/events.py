@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+状态变更通知
+"""
+
+from typing import Callable, List, Optional
+
+# 变更事件类型
+BANK_ADDED = "bank_added"           # 加载了题库
+BANK_REMOVED = "bank_removed"       # 移除了题库
+DRAWN_CHANGED = "drawn_changed"     # 已抽取记录变化（抽取、重置、恢复）
+ROSTER_CHANGED = "roster_changed"   # 名单被替换或清空
+
+# 监听函数: (事件类型, 题库名称或名单名称，为 None 表示全部)
+ChangeListener = Callable[[str, Optional[str]], None]
+
+
+class Observable:
+    """可观察对象
+
+    状态变化时同步调用已注册的监听函数。不依赖 Qt，
+    界面需要合并刷新时由监听函数自行安排（如延迟到下一次事件循环）。
+    """
+
+    def __init__(self):
+        self._listeners: List[ChangeListener] = []
+
+    def subscribe(self, listener: ChangeListener) -> Callable[[], None]:
+        """注册监听函数
+
+        Args:
+            listener: 监听函数 (事件类型, 名称)
+
+        Returns:
+            取消注册的函数
+        """
+        self._listeners.append(listener)
+
+        def unsubscribe():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+        return unsubscribe
+
+    def _notify(self, event: str, name: Optional[str] = None):
+        """通知所有监听函数"""
+        for listener in list(self._listeners):
+            listener(event, name)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+导入任务
+"""
+
+import os
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .parser import MDParser, ParseProgress
+from .roster import RosterManager
+
+
+class ImportCancelled(Exception):
+    """导入被取消"""
+
+
+@dataclass
+class ImportResult:
+    """导入结果"""
+    kind: str                           # ImportJob.BANK / ImportJob.ROSTER
+    file_path: str
+    success: bool
+    cancelled: bool = False
+    data: List = field(default_factory=list)   # 题目列表或人员列表
+    elapsed: float = 0.0                # 耗时（秒）
+    error: str = ""                     # 错误信息
+    error_type: str = ""                # 异常类型名
+    detail: str = ""                    # 完整异常堆栈
+
+    @property
+    def count(self) -> int:
+        """题目数或人数"""
+        return len(self.data)
+
+    @property
+    def file_name(self) -> str:
+        return os.path.basename(self.file_path)
+
+
+class ImportJob:
+    """导入任务
+
+    只负责读取和解析文件，不修改 QuestionBank / RosterManager：
+    解析结果通过 ImportResult 返回，由持有题库的线程调用
+    QuestionBank.add_bank / RosterManager.set_roster 登记。
+    因此多个导入可以同时在工作线程中运行，不影响已加载题库的抽取。
+
+    用法:
+        job = ImportJob(ImportJob.BANK, path)
+        result = job.run(progress=lambda done, total: ...)
+        if result.success:
+            bank.add_bank(result.file_path, result.data)
+    """
+
+    BANK = "bank"
+    ROSTER = "roster"
+
+    def __init__(self, kind: str, file_path: str):
+        """初始化导入任务
+
+        Args:
+            kind: 导入类型，ImportJob.BANK 或 ImportJob.ROSTER
+            file_path: 文件路径
+        """
+        if kind not in (ImportJob.BANK, ImportJob.ROSTER):
+            raise ValueError(f"不支持的导入类型: {kind}")
+        self._kind = kind
+        self._file_path = file_path
+        self._cancel_event = threading.Event()
+
+    @property
+    def kind(self) -> str:
+        return self._kind
+
+    @property
+    def file_path(self) -> str:
+        return self._file_path
+
+    def cancel(self):
+        """请求取消（在下一次进度报告时生效）"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def run(self, progress: Optional[ParseProgress] = None) -> ImportResult:
+        """执行导入
+
+        Args:
+            progress: 进度回调 (已解析块数, 总块数)；名单只在完成时报告一次
+
+        Returns:
+            导入结果
+        """
+        def on_progress(done: int, total: int):
+            if self._cancel_event.is_set():
+                raise ImportCancelled()
+            if progress is not None:
+                progress(done, total)
+
+        started = time.perf_counter()
+        try:
+            if self._cancel_event.is_set():
+                raise ImportCancelled()
+            if self._kind == ImportJob.BANK:
+                data = MDParser.parse_file(self._file_path, progress=on_progress)
+            else:
+                data = RosterManager.parse_file(self._file_path)
+                on_progress(len(data), len(data))
+            return ImportResult(self._kind, self._file_path, True, data=data,
+                                elapsed=time.perf_counter() - started)
+        except ImportCancelled:
+            return ImportResult(self._kind, self._file_path, False, cancelled=True,
+                                elapsed=time.perf_counter() - started)
+        except Exception as e:
+            return ImportResult(self._kind, self._file_path, False,
+                                elapsed=time.perf_counter() - started,
+                                error=str(e) or repr(e),
+                                error_type=type(e).__name__,
+                                detail=traceback.format_exc())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+热点路径计时与计数
+
+默认关闭：timer() 返回共享的空上下文管理器，count() 直接返回，
+关闭时每个埋点只多一次全局变量判断。开启后记录每个计时点的调用次数、
+总耗时和最长耗时，以及各计数器的累计值。
+
+开启方式: enable()，或启动前设置环境变量 RQG_METRICS=1。
+读取方式: snapshot() 返回字典，to_prometheus() / dump_prometheus()
+输出 Prometheus 文本格式；界面中按 Ctrl+Shift+D 打开性能统计面板。
+
+用法:
+    with metrics.timer("bank.sample"):
+        drawn = rng.sample(available, count)
+    metrics.count("db.commits")
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List
+
+# 是否记录（模块级变量，埋点处只读取一次）
+_enabled = os.environ.get("RQG_METRICS", "") not in ("", "0")
+
+_lock = threading.Lock()
+# 计时: {名称: [调用次数, 总耗时（秒）, 最长耗时（秒）]}
+_timers: Dict[str, List[float]] = {}
+# 计数: {名称: 累计值}
+_counters: Dict[str, float] = {}
+
+
+class _NullTimer:
+    """关闭时使用的空计时器"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """记录一次计时（异常退出时同样计入）"""
+
+    __slots__ = ("_name", "_started")
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._started
+        with _lock:
+            entry = _timers.get(self._name)
+            if entry is None:
+                _timers[self._name] = [1, elapsed, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+                if elapsed > entry[2]:
+                    entry[2] = elapsed
+        return False
+
+
+def enable(on: bool = True):
+    """开启或关闭记录（已记录的数据保留）"""
+    global _enabled
+    _enabled = on
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def timer(name: str):
+    """计时上下文管理器
+
+    Args:
+        name: 计时点名称，按“模块.操作”命名，如 bank.sample
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def count(name: str, value: float = 1):
+    """累加计数器"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def reset():
+    """清空已记录的数据"""
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def snapshot() -> Dict[str, Dict]:
+    """获取当前数据
+
+    Returns:
+        {"enabled": bool,
+         "timers": {名称: {"count", "total_s", "max_s", "mean_s"}},
+         "counters": {名称: 值}}
+    """
+    with _lock:
+        timers = {name: {"count": int(entry[0]), "total_s": entry[1], "max_s": entry[2],
+                         "mean_s": entry[1] / entry[0]}
+                  for name, entry in sorted(_timers.items())}
+        counters = dict(sorted(_counters.items()))
+    return {"enabled": _enabled, "timers": timers, "counters": counters}
+
+
+def _label(name: str) -> str:
+    return name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(prefix: str = "rqg") -> str:
+    """以 Prometheus 文本格式输出当前数据
+
+    计时点输出为 {prefix}_timer_calls_total / _seconds_total / _max_seconds，
+    计数器输出为 {prefix}_counter_total，名称放在 name 标签中。
+    """
+    data = snapshot()
+    lines = [
+        f"# HELP {prefix}_metrics_enabled Whether instrumentation is recording.",
+        f"# TYPE {prefix}_metrics_enabled gauge",
+        f"{prefix}_metrics_enabled {int(data['enabled'])}",
+    ]
+    series = [
+        ("timer_calls_total", "counter", "Number of timed calls.", "count"),
+        ("timer_seconds_total", "counter", "Total time spent in timed calls.", "total_s"),
+        ("timer_max_seconds", "gauge", "Longest single timed call.", "max_s"),
+    ]
+    for suffix, kind, help_text, key in series:
+        lines.append(f"# HELP {prefix}_{suffix} {help_text}")
+        lines.append(f"# TYPE {prefix}_{suffix} {kind}")
+        for name, entry in data["timers"].items():
+            lines.append(f'{prefix}_{suffix}{{name="{_label(name)}"}} {entry[key]!r}')
+
+    lines.append(f"# HELP {prefix}_counter_total Instrumentation counters.")
+    lines.append(f"# TYPE {prefix}_counter_total counter")
+    for name, value in data["counters"].items():
+        lines.append(f'{prefix}_counter_total{{name="{_label(name)}"}} {value!r}')
+    return "\n".join(lines) + "\n"
+
+
+def dump_prometheus(file_path: str, prefix: str = "rqg"):
+    """将 Prometheus 文本写入文件（先写临时文件再替换，读取方不会读到半个文件）"""
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(to_prometheus(prefix))
+    os.replace(tmp_path, file_path)
@@ -5,9 +5,16 @@ MD 文件解析器
 """
 
 import os
-from typing import List
+from typing import Callable, List, Optional
+from . import metrics
 from .question import Question
 
+# 解析进度回调 (已解析块数, 总块数)，回调中抛出异常可中止解析
+ParseProgress = Callable[[int, int], None]
+
+# 每解析多少个题目块报告一次进度
+PROGRESS_INTERVAL = 2000
+
 
 class MDParser:
     """Markdown 文件解析器
@@ -19,11 +26,13 @@ class MDParser:
     """
 
     @staticmethod
-    def parse_file(file_path: str) -> List[Question]:
+    def parse_file(file_path: str,
+                   progress: Optional[ParseProgress] = None) -> List[Question]:
         """解析 MD 文件
 
         Args:
             file_path: MD 文件路径
+            progress: 进度回调 (已解析块数, 总块数)
 
         Returns:
             题目列表
@@ -31,19 +40,22 @@ class MDParser:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"文件不存在: {file_path}")
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        with metrics.timer("parser.read_file"):
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
 
         bank_name = os.path.splitext(os.path.basename(file_path))[0]
-        return MDParser.parse_content(content, bank_name)
+        return MDParser.parse_content(content, bank_name, progress)
 
     @staticmethod
-    def parse_content(content: str, bank_name: str = "") -> List[Question]:
+    def parse_content(content: str, bank_name: str = "",
+                      progress: Optional[ParseProgress] = None) -> List[Question]:
         """解析 MD 内容
 
         Args:
             content: MD 文本内容
             bank_name: 题库名称
+            progress: 进度回调 (已解析块数, 总块数)
 
         Returns:
             题目列表
@@ -51,13 +63,24 @@ class MDParser:
         questions = []
 
         # 按空行分割题目块
-        blocks = MDParser._split_blocks(content)
-
-        for block in blocks:
-            question = MDParser._parse_block(block, bank_name)
-            if question:
-                questions.append(question)
-
+        with metrics.timer("parser.split_blocks"):
+            blocks = MDParser._split_blocks(content)
+        total = len(blocks)
+        if progress:
+            progress(0, total)
+
+        with metrics.timer("parser.parse_blocks"):
+            for i, block in enumerate(blocks, 1):
+                question = MDParser._parse_block(block, bank_name)
+                if question:
+                    questions.append(question)
+                if progress and i % PROGRESS_INTERVAL == 0:
+                    progress(i, total)
+
+        if progress:
+            progress(total, total)
+        metrics.count("parser.blocks", total)
+        metrics.count("parser.questions", len(questions))
         return questions
 
     @staticmethod
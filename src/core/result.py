@@ -0,0 +1,18 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+抽取结果数据模型
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class DrawResult:
+    """抽取结果"""
+    question_title: str
+    question_content: str
+    question_id: str
+    bank_name: str
+    person_name: str = ""
+    person_id: str = ""                 # 抽中人员的唯一标识（区分同名人员）
@@ -6,30 +6,49 @@
 
 import os
 import random
+import threading
+import uuid
 from typing import List, Set, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from . import metrics
+from .events import Observable, DRAWN_CHANGED, ROSTER_CHANGED
 
 
 @dataclass
 class Person:
     """人员数据类"""
     name: str
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))  # 唯一标识（同名人员不同）
 
     def __str__(self) -> str:
         return self.name
 
 
-class RosterManager:
+class RosterManager(Observable):
     """名单管理器
 
-    管理人员名单，支持随机抽取
+    管理人员名单，支持随机抽取。
+    名单或已抽取记录变化时通知订阅者（见 Observable.subscribe）。
+    可在多个线程中共用，去重抽取时选人和标记在一次加锁中完成。
     """
 
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
+        """初始化名单管理器
+
+        Args:
+            rng: 随机数生成器，指定带种子的 random.Random 可复现抽取结果；
+                 默认使用 random 模块的全局生成器
+        """
+        super().__init__()
+        self._random = rng if rng is not None else random
         self._persons: List[Person] = []
         self._roster_name: str = ""
         self._roster_path: str = ""
         self._drawn_names: Set[str] = set()
+        # 可抽取人数缓存，任何变化时清空
+        self._available_count: Optional[int] = None
+        self._lock = threading.RLock()
 
     def load_roster(self, file_path: str) -> int:
         """加载名单文件
@@ -42,22 +61,48 @@ class RosterManager:
         Returns:
             加载的人数
         """
+        return self.set_roster(file_path, RosterManager.parse_file(file_path))
+
+    @staticmethod
+    def parse_file(file_path: str) -> List[Person]:
+        """解析名单文件（不修改当前名单，可在工作线程中调用）
+
+        Args:
+            file_path: 名单文件路径
+
+        Returns:
+            人员列表
+        """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"文件不存在: {file_path}")
 
         with open(file_path, "r", encoding="utf-8") as f:
             content = f.read()
 
-        self._persons = []
+        persons = []
         for line in content.split("\n"):
             name = line.strip()
             # 跳过空行和注释行
             if name and not name.startswith("#"):
-                self._persons.append(Person(name=name))
+                persons.append(Person(name=name))
+        return persons
 
-        self._roster_name = os.path.splitext(os.path.basename(file_path))[0]
-        self._roster_path = file_path
-        self._drawn_names.clear()
+    def set_roster(self, file_path: str, persons: List[Person]) -> int:
+        """设置名单（替换当前名单并清空已抽取记录）
+
+        Args:
+            file_path: 名单文件路径
+            persons: parse_file 解析得到的人员列表
+
+        Returns:
+            人数
+        """
+        with self._lock:
+            self._persons = list(persons)
+            self._roster_name = os.path.splitext(os.path.basename(file_path))[0]
+            self._roster_path = file_path
+            self._drawn_names.clear()
+        self._changed(ROSTER_CHANGED)
 
         return len(self._persons)
 
@@ -83,7 +128,8 @@ class RosterManager:
             可抽取的人员列表
         """
         if exclude_drawn:
-            return [p for p in self._persons if p.name not in self._drawn_names]
+            with self._lock:
+                return [p for p in self._persons if p.name not in self._drawn_names]
         return self._persons.copy()
 
     def get_count(self) -> int:
@@ -91,8 +137,16 @@ class RosterManager:
         return len(self._persons)
 
     def get_available_count(self, exclude_drawn: bool = True) -> int:
-        """获取可抽取人数"""
-        return len(self.get_available_persons(exclude_drawn))
+        """获取可抽取人数（计数不构建列表，结果缓存到下一次变化）"""
+        if not exclude_drawn:
+            return len(self._persons)
+        count = self._available_count
+        if count is None:
+            with self._lock:
+                drawn_names = self._drawn_names
+                count = sum(1 for p in self._persons if p.name not in drawn_names)
+                self._available_count = count
+        return count
 
     def draw(self, count: int = 1, no_repeat: bool = True) -> List[Person]:
         """随机抽取人员
@@ -104,18 +158,21 @@ class RosterManager:
         Returns:
             抽取的人员列表
         """
-        available = self.get_available_persons(no_repeat)
+        with metrics.timer("roster.draw"), self._lock:
+            with metrics.timer("roster.available_list"):
+                available = self.get_available_persons(no_repeat)
 
-        if not available:
-            return []
+            if not available:
+                return []
 
-        count = min(count, len(available))
-        drawn = random.sample(available, count)
+            count = min(count, len(available))
+            drawn = self._random.sample(available, count)
 
-        if no_repeat:
-            for p in drawn:
-                self._drawn_names.add(p.name)
+            if no_repeat:
+                self._drawn_names.update(p.name for p in drawn)
 
+        if no_repeat:
+            self._changed(DRAWN_CHANGED)
         return drawn
 
     def draw_one(self, no_repeat: bool = True) -> Optional[Person]:
@@ -125,14 +182,18 @@ class RosterManager:
 
     def reset(self):
         """重置已抽取记录"""
-        self._drawn_names.clear()
+        with self._lock:
+            self._drawn_names.clear()
+        self._changed(DRAWN_CHANGED)
 
     def clear(self):
         """清空名单"""
-        self._persons = []
-        self._roster_name = ""
-        self._roster_path = ""
-        self._drawn_names.clear()
+        with self._lock:
+            self._persons = []
+            self._roster_name = ""
+            self._roster_path = ""
+            self._drawn_names.clear()
+        self._changed(ROSTER_CHANGED)
 
     def is_loaded(self) -> bool:
         """是否已加载名单"""
@@ -140,8 +201,16 @@ class RosterManager:
 
     def get_drawn_names(self) -> Set[str]:
         """获取已抽取的名字集合"""
-        return self._drawn_names.copy()
+        with self._lock:
+            return self._drawn_names.copy()
 
     def set_drawn_names(self, names: Set[str]):
         """设置已抽取的名字集合"""
-        self._drawn_names = set(names)
+        with self._lock:
+            self._drawn_names = set(names)
+        self._changed(DRAWN_CHANGED)
+
+    def _changed(self, event: str):
+        """清空计数缓存并通知订阅者"""
+        self._available_count = None
+        self._notify(event, self._roster_name)
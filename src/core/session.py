@@ -0,0 +1,385 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+多会话抽题
+
+多个会话（如多个教室）共用同一份只读的题库和名单数据，
+每个会话只保存自己的已抽状态位图和随机数生成器。
+"""
+
+import os
+import random
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from .parser import MDParser
+from .question import Question
+from .result import DrawResult
+from .roster import Person, RosterManager
+
+# 可抽比例不低于 1/REJECTION_DENSITY 时用拒绝采样，否则按位计数定位
+REJECTION_DENSITY = 8
+
+# 按位计数定位时每次转换为整数的字节数
+SCAN_CHUNK = 1024
+
+
+class SessionError(Exception):
+    """会话请求无法完成"""
+
+
+@dataclass(frozen=True)
+class SharedBank:
+    """共享的只读题库
+
+    解析一次后由所有会话共用，会话不会修改其中的题目。
+    """
+    name: str
+    path: str
+    questions: Tuple[Question, ...]
+
+
+@dataclass(frozen=True)
+class SharedRoster:
+    """共享的只读名单"""
+    name: str
+    path: str
+    persons: Tuple[Person, ...]
+
+
+class DrawnBitmap:
+    """已抽状态位图
+
+    第 i 位（小端，按字节）表示第 i 项是否已抽取，格式与
+    QuestionBank.get_drawn_bitmap 相同，可直接保存到数据库。
+    可抽比例较高时随机选位重试，较低时按位计数直接定位第 r 个可抽项，
+    两种方式都不构建可抽列表。
+    """
+
+    __slots__ = ("size", "available", "_bits")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.available = size
+        self._bits = bytearray((size + 7) // 8)
+
+    def is_set(self, index: int) -> bool:
+        return bool(self._bits[index >> 3] >> (index & 7) & 1)
+
+    def set(self, index: int):
+        byte = self._bits[index >> 3]
+        mask = 1 << (index & 7)
+        if not byte & mask:
+            self._bits[index >> 3] = byte | mask
+            self.available -= 1
+
+    def clear(self):
+        self._bits = bytearray(len(self._bits))
+        self.available = self.size
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+    def load(self, bitmap: bytes) -> bool:
+        """恢复位图，长度与项数不匹配时返回 False"""
+        if len(bitmap) != len(self._bits):
+            return False
+        self._bits = bytearray(bitmap)
+        # 忽略超出项数的填充位
+        if self.size & 7:
+            self._bits[-1] &= (1 << (self.size & 7)) - 1
+        self.available = self.size - int.from_bytes(self._bits, "little").bit_count()
+        return True
+
+    def pick(self, rng: random.Random) -> int:
+        """随机选择一个未抽取的项（调用方保证 available > 0），不做标记"""
+        if self.available * REJECTION_DENSITY >= self.size:
+            while True:
+                index = rng.randrange(self.size)
+                if not self.is_set(index):
+                    return index
+        return self._nth_clear(rng.randrange(self.available))
+
+    def _nth_clear(self, rank: int) -> int:
+        """第 rank 个（从 0 开始）未抽取项的序号"""
+        bits = self._bits
+        for start in range(0, len(bits), SCAN_CHUNK):
+            chunk = bits[start:start + SCAN_CHUNK]
+            clear = len(chunk) * 8 - int.from_bytes(chunk, "little").bit_count()
+            if rank < clear:
+                break
+            rank -= clear
+        for offset, byte in enumerate(chunk):
+            clear = 8 - byte.bit_count()
+            if rank < clear:
+                for bit in range(8):
+                    if not byte >> bit & 1:
+                        if rank == 0:
+                            return (start + offset) * 8 + bit
+                        rank -= 1
+            rank -= clear
+        raise IndexError("没有未抽取的项")
+
+
+class DrawSession:
+    """一个会话的抽题状态
+
+    只保存每个题库的已抽位图、名单的已抽位图和随机数生成器，
+    题目和人员数据引用共享的 SharedBank / SharedRoster。
+    名单中的同名人员按不同的人计算。
+    """
+
+    def __init__(self, name: str, banks: List[SharedBank],
+                 roster: Optional[SharedRoster] = None, seed: Optional[int] = None):
+        """初始化会话
+
+        Args:
+            name: 会话名称
+            banks: 共享题库
+            roster: 共享名单，为 None 时只抽题
+            seed: 随机种子，指定后抽取结果可复现
+        """
+        self.name = name
+        self._random = random.Random(seed)
+        self._banks: Dict[str, SharedBank] = {}
+        self._drawn: Dict[str, DrawnBitmap] = {}
+        for bank in banks:
+            self._banks[bank.name] = bank
+            self._drawn[bank.name] = DrawnBitmap(len(bank.questions))
+        self._roster = roster
+        self._drawn_persons = DrawnBitmap(len(roster.persons)) if roster else None
+        self.draw_count = 0
+
+    def get_bank_names(self) -> List[str]:
+        return list(self._banks)
+
+    def get_question_count(self, bank_name: Optional[str] = None) -> int:
+        if bank_name:
+            return len(self._bank(bank_name).questions)
+        return sum(len(bank.questions) for bank in self._banks.values())
+
+    def get_available_count(self, bank_name: Optional[str] = None) -> int:
+        if bank_name:
+            self._bank(bank_name)
+            return self._drawn[bank_name].available
+        return sum(bitmap.available for bitmap in self._drawn.values())
+
+    def get_available_person_count(self) -> int:
+        return self._drawn_persons.available if self._drawn_persons else 0
+
+    def draw(self, count: int = 1, bank_name: Optional[str] = None,
+             no_repeat: bool = True, person_no_repeat: bool = True) -> List[DrawResult]:
+        """抽题并为每道题分配人员（有名单时）
+
+        Args:
+            count: 抽取数量，超过可抽数量时只抽剩余的题目
+            bank_name: 题库名称，为 None 时从所有题库抽取
+            no_repeat: 题目去重
+            person_no_repeat: 人员去重
+
+        Returns:
+            抽取结果列表
+
+        Raises:
+            SessionError: 参数无效、没有可抽取的题目或人员不足
+        """
+        if count < 1:
+            raise SessionError("抽取数量必须大于 0")
+        names = [self._bank(bank_name).name] if bank_name else list(self._banks)
+
+        # 空名单不分配人员，也不检查剩余人数
+        persons = self._drawn_persons
+        if (persons is not None and persons.size and person_no_repeat
+                and persons.available < count):
+            raise SessionError(f"剩余人员不足: 仅剩 {persons.available} 人")
+
+        picks = self._pick_questions(names, count, no_repeat)
+        if not picks:
+            raise SessionError("没有可抽取的题目")
+
+        results = []
+        for name, index in picks:
+            q = self._banks[name].questions[index]
+            person_name = person_id = ""
+            if persons is not None and persons.size:
+                person = self._pick_person(person_no_repeat)
+                person_name, person_id = person.name, person.id
+            results.append(DrawResult(q.title, q.content, q.id, q.bank_name,
+                                      person_name, person_id))
+        self.draw_count += 1
+        return results
+
+    def _pick_questions(self, names: List[str], count: int,
+                        no_repeat: bool) -> List[Tuple[str, int]]:
+        """在指定题库中随机选择题目，返回 (题库名称, 序号) 列表"""
+        rng = self._random
+        if not no_repeat:
+            sizes = [len(self._banks[name].questions) for name in names]
+            offsets = list(accumulate(sizes))
+            total = offsets[-1] if offsets else 0
+            picks = []
+            for flat in rng.sample(range(total), min(count, total)):
+                i = bisect_right(offsets, flat)
+                picks.append((names[i], flat - (offsets[i - 1] if i else 0)))
+            return picks
+
+        bitmaps = [self._drawn[name] for name in names]
+        picks = []
+        for _ in range(count):
+            # 按各题库剩余数量加权选择题库，再在题库内均匀选择，整体在所有剩余题目中均匀
+            offsets = list(accumulate(bitmap.available for bitmap in bitmaps))
+            if not offsets or not offsets[-1]:
+                break
+            i = bisect_right(offsets, rng.randrange(offsets[-1]))
+            index = bitmaps[i].pick(rng)
+            bitmaps[i].set(index)
+            picks.append((names[i], index))
+        return picks
+
+    def _pick_person(self, no_repeat: bool) -> Person:
+        persons = self._roster.persons
+        if not no_repeat:
+            return persons[self._random.randrange(len(persons))]
+        index = self._drawn_persons.pick(self._random)
+        self._drawn_persons.set(index)
+        return persons[index]
+
+    def reset(self, bank_name: Optional[str] = None):
+        """重置已抽题目；不指定题库时同时重置已抽人员"""
+        if bank_name:
+            self._bank(bank_name)
+            self._drawn[bank_name].clear()
+            return
+        for bitmap in self._drawn.values():
+            bitmap.clear()
+        if self._drawn_persons is not None:
+            self._drawn_persons.clear()
+
+    def get_drawn_bitmap(self, bank_name: str) -> bytes:
+        """获取题库的已抽位图（格式与 QuestionBank.get_drawn_bitmap 相同）"""
+        self._bank(bank_name)
+        return self._drawn[bank_name].to_bytes()
+
+    def set_drawn_bitmap(self, bank_name: str, bitmap: bytes) -> bool:
+        """恢复题库的已抽位图，长度不匹配时返回 False"""
+        return bank_name in self._drawn and self._drawn[bank_name].load(bitmap)
+
+    def _bank(self, bank_name: str) -> SharedBank:
+        bank = self._banks.get(bank_name)
+        if bank is None:
+            raise SessionError(f"未加载题库: {bank_name}")
+        return bank
+
+    def status(self) -> dict:
+        return {
+            "session": self.name,
+            "banks": self.get_bank_names(),
+            "questions": self.get_question_count(),
+            "available": self.get_available_count(),
+            "persons": len(self._roster.persons) if self._roster else 0,
+            "available_persons": self.get_available_person_count(),
+            "draws": self.draw_count,
+        }
+
+
+class SessionManager:
+    """会话管理器
+
+    同一个文件（按绝对路径和修改时间）只解析一次，得到的 SharedBank /
+    SharedRoster 由所有会话共用；文件修改后再打开的会话使用新的解析结果。
+    load_bank / load_roster 可在工作线程中调用（同一文件并发加载时只解析一次），
+    会话的创建、查询和抽取应在同一个线程中进行。
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, DrawSession] = {}
+        self._files: Dict[Tuple[str, str], Tuple[float, object]] = {}
+        self._file_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    # ========== 共享数据 ==========
+
+    def load_bank(self, file_path: str) -> SharedBank:
+        """加载共享题库（已加载且文件未修改时直接返回）"""
+        def parse(path: str) -> SharedBank:
+            questions = MDParser.parse_file(path)
+            name = questions[0].bank_name if questions else ""
+            if not name:
+                name = os.path.splitext(os.path.basename(path))[0]
+            return SharedBank(name, path, tuple(questions))
+        return self._load("bank", file_path, parse)
+
+    def load_roster(self, file_path: str) -> SharedRoster:
+        """加载共享名单（已加载且文件未修改时直接返回）"""
+        def parse(path: str) -> SharedRoster:
+            name = os.path.splitext(os.path.basename(path))[0]
+            return SharedRoster(name, path, tuple(RosterManager.parse_file(path)))
+        return self._load("roster", file_path, parse)
+
+    def _load(self, kind: str, file_path: str, parse):
+        key = (kind, os.path.abspath(file_path))
+        try:
+            mtime = os.path.getmtime(key[1])
+        except OSError:
+            raise SessionError(f"文件不存在: {file_path}")
+
+        with self._lock:
+            file_lock = self._file_locks.setdefault(key, threading.Lock())
+        with file_lock:
+            entry = self._files.get(key)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+            try:
+                data = parse(key[1])
+            except (OSError, ValueError) as e:
+                raise SessionError(f"解析失败: {file_path}: {e}")
+            self._files[key] = (mtime, data)
+            return data
+
+    def prune(self) -> int:
+        """释放没有会话使用的共享数据
+
+        Returns:
+            释放的文件数
+        """
+        used = set()
+        for session in self._sessions.values():
+            used.update(id(bank) for bank in session._banks.values())
+            if session._roster is not None:
+                used.add(id(session._roster))
+        with self._lock:
+            unused = [key for key, (_, data) in self._files.items()
+                      if id(data) not in used]
+            for key in unused:
+                del self._files[key]
+                self._file_locks.pop(key, None)
+        return len(unused)
+
+    # ========== 会话 ==========
+
+    def open_session(self, name: str, banks: List[SharedBank],
+                     roster: Optional[SharedRoster] = None,
+                     seed: Optional[int] = None) -> DrawSession:
+        """创建会话，替换同名会话"""
+        session = DrawSession(name, banks, roster, seed)
+        self._sessions[name] = session
+        return session
+
+    def get_session(self, name: str) -> DrawSession:
+        session = self._sessions.get(name)
+        if session is None:
+            raise SessionError(f"会话不存在: {name}")
+        return session
+
+    def close_session(self, name: str):
+        self.get_session(name)
+        del self._sessions[name]
+
+    def session_names(self) -> List[str]:
+        return list(self._sessions)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -0,0 +1,3 @@
+# 抽题服务模块（无界面，多会话）
+from .service import DrawService
+from .writer import HistoryWriter
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+抽题服务入口
+
+用法:
+    python -m src.server --port 8765 --db data/history.db
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+
+from src.core import metrics
+
+from .service import DrawService
+from .writer import HistoryWriter
+
+
+async def _dump_metrics(file_path: str, interval: float, stop: asyncio.Event):
+    """定期写入性能统计，直到服务停止"""
+    while not stop.is_set():
+        metrics.dump_prometheus(file_path)
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def serve(args) -> int:
+    storage = writer = None
+    if not args.no_db:
+        from src.storage.backend import open_storage
+        storage = open_storage(args.storage if args.storage else args.db)
+        writer = HistoryWriter(storage, args.batch_size, args.batch_delay)
+
+    service = DrawService(writer)
+    port = await service.start(args.host, args.port)
+    print(f"listening on {args.host}:{port}", flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            # Windows 不支持，依赖 KeyboardInterrupt
+            pass
+
+    server_task = loop.create_task(service.serve_forever())
+    try:
+        if args.metrics:
+            await _dump_metrics(args.metrics, args.metrics_interval, stop)
+        await stop.wait()
+    finally:
+        server_task.cancel()
+        lost = await service.close()
+        if storage is not None:
+            storage.close()
+        if args.metrics:
+            metrics.dump_prometheus(args.metrics)
+    if lost:
+        print(f"有 {lost} 条历史记录未能写入", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.server",
+                                     description="抽题服务（JSON Lines over TCP）")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口，0 为自动分配")
+    location = parser.add_mutually_exclusive_group()
+    location.add_argument("--db", help="SQLite 数据库文件路径，默认 data/history.db")
+    location.add_argument("--storage",
+                          help="存储位置: sqlite:PATH / memory / log:PATH，"
+                               "默认读取环境变量 RQG_STORAGE")
+    location.add_argument("--no-db", action="store_true", help="不记录历史")
+    parser.add_argument("--batch-size", type=int, default=500, help="每个写事务的最大记录数")
+    parser.add_argument("--batch-delay", type=float, default=0.05,
+                        help="记录入队后最多等待多久提交（秒）")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="记录性能统计，并定期以 Prometheus 文本格式写入 FILE")
+    parser.add_argument("--metrics-interval", type=float, default=10.0,
+                        help="写入性能统计的间隔（秒）")
+    args = parser.parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+    try:
+        return asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+抽题服务
+
+基于 asyncio 的 JSON Lines 协议服务：客户端通过 TCP 连接每行发送一个
+JSON 请求，服务端按顺序每行返回一个 JSON 响应。请求中的 id 字段原样返回。
+
+请求:
+    {"op": "open", "session": "一班", "banks": ["a.md"], "roster": "r.txt", "seed": 1}
+    {"op": "draw", "session": "一班", "count": 3, "bank": "a",
+     "no_repeat": true, "person_no_repeat": true}
+    {"op": "reset", "session": "一班", "bank": "a"}
+    {"op": "status", "session": "一班"}     # 不带 session 时返回服务统计
+    {"op": "close", "session": "一班"}
+    {"op": "metrics"}                       # 性能统计（见 src.core.metrics）
+    {"op": "ping"}
+
+响应:
+    {"id": ..., "ok": true, ...}
+    {"id": ..., "ok": false, "error": "错误信息"}
+"""
+
+import asyncio
+import json
+from typing import Optional, Set
+
+from src.core import metrics
+from src.core.session import DrawSession, SessionError, SessionManager
+from src.storage.backend import now_ms
+from .writer import HistoryWriter
+
+# 单行请求的最大长度
+MAX_LINE = 1 << 20
+
+
+class DrawService:
+    """抽题服务
+
+    在一个事件循环中托管多个命名会话（见 SessionManager），题库和名单
+    只解析一次并由所有会话共用。抽题全部在内存中完成，
+    历史记录交给 HistoryWriter 批量异步写入，请求不等待数据库。
+    """
+
+    def __init__(self, writer: Optional[HistoryWriter] = None):
+        """初始化服务
+
+        Args:
+            writer: 历史写入器，为 None 时不记录历史
+        """
+        self._writer = writer
+        self._sessions = SessionManager()
+        self._server: Optional[asyncio.AbstractServer] = None
+        # 正在处理的客户端连接任务，关闭服务时取消
+        self._clients: Set[asyncio.Task] = set()
+        self.requests = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """开始监听
+
+        Returns:
+            实际监听的端口（port 为 0 时由系统分配）
+        """
+        if self._writer is not None:
+            self._writer.start()
+        self._server = await asyncio.start_server(self._handle_client, host, port,
+                                                  limit=MAX_LINE)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> int:
+        """停止监听并写入剩余历史
+
+        Returns:
+            未能写入的历史记录数
+        """
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._clients):
+                task.cancel()
+            await asyncio.gather(*self._clients, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._writer is not None:
+            return await self._writer.close()
+        return 0
+
+    # ========== 连接处理 ==========
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # 超过 MAX_LINE 的请求行无法继续解析，断开连接
+                    writer.write(self._encode({"ok": False, "error": "请求过长"}))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write(self._encode(await self.handle_line(line)))
+                # 客户端读取过慢时暂停处理，避免响应堆积在内存中
+                await writer.drain()
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            # 服务关闭时取消连接：正常结束任务，
+            # 否则 Python 3.11 的 start_server 回调会把取消当作异常输出
+            pass
+        finally:
+            self._clients.discard(task)
+            writer.close()
+
+    @staticmethod
+    def _encode(response: dict) -> bytes:
+        return json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    async def handle_line(self, line: bytes) -> dict:
+        """处理一行请求，返回响应字典"""
+        self.requests += 1
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("请求必须是 JSON 对象")
+        except ValueError as e:
+            return {"ok": False, "error": f"无效请求: {e}"}
+
+        response = {"id": request["id"]} if "id" in request else {}
+        op = request.get("op")
+        handler = self._HANDLERS.get(op)
+        if handler is None:
+            response.update(ok=False, error=f"未知操作: {op}")
+            return response
+        try:
+            with metrics.timer(f"server.{op}"):
+                response.update(await handler(self, request))
+            response["ok"] = True
+        except SessionError as e:
+            response.update(ok=False, error=str(e))
+        except (KeyError, TypeError, ValueError) as e:
+            response.update(ok=False, error=f"参数错误: {e!r}")
+        return response
+
+    # ========== 操作 ==========
+
+    @staticmethod
+    def _session_name(request: dict) -> str:
+        """请求中的会话名称，只接受字符串，避免 1 与 "1" 被当作不同会话"""
+        name = request["session"]
+        if not isinstance(name, str):
+            raise SessionError(f"会话名称必须是字符串: {name!r}")
+        return name
+
+    def _session(self, request: dict) -> DrawSession:
+        return self._sessions.get_session(self._session_name(request))
+
+    async def _op_open(self, request: dict) -> dict:
+        name = self._session_name(request)
+        # 文件解析在线程池中进行，已加载的文件直接复用
+        loop = asyncio.get_running_loop()
+        banks = [await loop.run_in_executor(None, self._sessions.load_bank, path)
+                 for path in request.get("banks", [])]
+        roster = None
+        if request.get("roster"):
+            roster = await loop.run_in_executor(None, self._sessions.load_roster,
+                                                request["roster"])
+        # 加载完成后才替换同名会话，加载失败时保留原会话
+        session = self._sessions.open_session(name, banks, roster, request.get("seed"))
+        return session.status()
+
+    async def _op_draw(self, request: dict) -> dict:
+        session = self._session(request)
+        results = session.draw(int(request.get("count", 1)), request.get("bank"),
+                               bool(request.get("no_repeat", True)),
+                               bool(request.get("person_no_repeat", True)))
+        draw_ts = now_ms()
+        if self._writer is not None:
+            self._writer.submit([(r.question_id, r.question_title, r.question_content,
+                                  r.bank_name, r.person_name, draw_ts)
+                                 for r in results])
+        return {"draw_ts": draw_ts, "results": [
+            {"question_id": r.question_id, "question_title": r.question_title,
+             "question_content": r.question_content, "bank_name": r.bank_name,
+             "person_name": r.person_name} for r in results]}
+
+    async def _op_reset(self, request: dict) -> dict:
+        session = self._session(request)
+        session.reset(request.get("bank"))
+        return session.status()
+
+    async def _op_status(self, request: dict) -> dict:
+        if "session" in request:
+            return self._session(request).status()
+        return self.stats()
+
+    async def _op_close(self, request: dict) -> dict:
+        self._sessions.close_session(self._session_name(request))
+        self._sessions.prune()
+        return {}
+
+    async def _op_metrics(self, request: dict) -> dict:
+        return metrics.snapshot()
+
+    async def _op_ping(self, request: dict) -> dict:
+        return {}
+
+    _HANDLERS = {
+        "open": _op_open,
+        "draw": _op_draw,
+        "reset": _op_reset,
+        "status": _op_status,
+        "close": _op_close,
+        "metrics": _op_metrics,
+        "ping": _op_ping,
+    }
+
+    def stats(self) -> dict:
+        """服务统计"""
+        stats = {"sessions": len(self._sessions), "requests": self.requests}
+        if self._writer is not None:
+            stats.update(pending_rows=self._writer.pending_count(),
+                         written_rows=self._writer.written_rows,
+                         write_batches=self._writer.batches,
+                         write_failures=self._writer.failures)
+        return stats
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+异步批量历史写入器
+"""
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from src.storage.backend import HistoryRow, Storage
+
+
+class HistoryWriter:
+    """异步批量历史写入器
+
+    抽题请求只把记录放入内存队列，不等待数据库。后台任务攒够一批
+    （或等待 max_delay 秒）后在专用线程中以一个事务写入，
+    同一时刻最多一个写事务，多个会话的记录合并提交。
+    写入失败的记录放回队首，稍后重试。
+    """
+
+    def __init__(self, db: Storage, max_batch: int = 500, max_delay: float = 0.05,
+                 retry_delay: float = 1.0):
+        """初始化写入器
+
+        Args:
+            db: 存储
+            max_batch: 每个事务最多写入的记录数
+            max_delay: 第一条记录入队后最多等待多久提交（秒）
+            retry_delay: 写入失败后的重试间隔（秒）
+        """
+        self._db = db
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._retry_delay = retry_delay
+        self._pending: List[HistoryRow] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        # 单线程执行器保证事务按提交顺序执行
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="history-writer")
+        self.written_rows = 0
+        self.batches = 0
+        self.failures = 0
+
+    def start(self):
+        """启动后台写入任务（须在事件循环中调用）"""
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, rows: List[HistoryRow]):
+        """提交记录，立即返回"""
+        if not rows:
+            return
+        self._pending.extend(rows)
+        self._wakeup.set()
+        if len(self._pending) >= self._max_batch:
+            self._full.set()
+
+    def pending_count(self) -> int:
+        """尚未写入的记录数"""
+        return len(self._pending)
+
+    async def close(self) -> int:
+        """写入剩余记录并停止
+
+        Returns:
+            最终未能写入的记录数
+        """
+        self._closing = True
+        if self._task is not None:
+            self._wakeup.set()
+            self._full.set()
+            await self._task
+            self._task = None
+        self._executor.shutdown(wait=True)
+        return len(self._pending)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            if not self._pending:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                continue
+
+            # 攒批：队列满或超时后提交
+            if not self._closing and len(self._pending) < self._max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self._max_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._pending[:self._max_batch]
+            del self._pending[:len(batch)]
+            if len(self._pending) < self._max_batch:
+                self._full.clear()
+            if not self._pending and not self._closing:
+                self._wakeup.clear()
+
+            try:
+                await loop.run_in_executor(self._executor,
+                                           self._db.add_history_batch, batch)
+            except Exception as e:
+                self.failures += 1
+                print(f"写入历史失败（{len(batch)} 条）: {e}", file=sys.stderr)
+                self._pending[:0] = batch
+                if self._closing:
+                    return
+                await asyncio.sleep(self._retry_delay)
+                continue
+            self.written_rows += len(batch)
+            self.batches += 1
@@ -1,3 +1,29 @@
 # 数据持久化模块
-from .database import Database
-from .exporter import Exporter
+#
+# 各子模块在首次访问时才导入（PEP 562），
+# 导入 src.storage.database 等子模块时不会连带加载导出、讲义等较重的模块。
+import importlib
+
+_EXPORTS = {
+    "Storage": ".backend",
+    "open_storage": ".backend",
+    "Database": ".database",
+    "MemoryStorage": ".memory",
+    "LogStorage": ".log_storage",
+    "Exporter": ".exporter",
+    "ExportJob": ".export_job",
+    "ExportResult": ".export_job",
+    "HandoutExporter": ".handouts",
+    "ResultStore": ".result_store",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
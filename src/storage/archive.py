@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+历史记录归档模块
+"""
+
+import bisect
+import heapq
+import json
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 除抽取时间外可排序的列在记录元组中的位置（题目标题、题库、人员）
+SORTED_COLUMNS = (2, 4, 6)
+
+# 按列排序的段文件中每块的记录数
+SORTED_BLOCK_ROWS = 1000
+
+# 缓存的已解压排序块数上限
+SORTED_BLOCK_CACHE = 64
+
+
+def month_of(ts: int) -> str:
+    """毫秒时间戳所在的月份（本地时间），格式 YYYY-MM"""
+    return datetime.fromtimestamp(ts / 1000).strftime("%Y-%m")
+
+
+def month_start_ms(month: str) -> int:
+    """月份第一天零点（本地时间）的毫秒时间戳"""
+    year, mon = (int(part) for part in month.split("-"))
+    return int(datetime(year, mon, 1).timestamp() * 1000)
+
+
+def shift_month(month: str, delta: int) -> str:
+    """将月份前后移动 delta 个月"""
+    year, mon = (int(part) for part in month.split("-"))
+    index = year * 12 + (mon - 1) + delta
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class HistoryArchive:
+    """历史记录归档
+
+    较早月份的抽题历史按月压缩为 zlib 段文件（history-YYYY-MM.jsonl.z），
+    每行为一条记录的 JSON 数组，列顺序与 HISTORY_COLUMNS 一致，
+    段内按抽取时间降序排列。各段的记录数保存在 index.json 中，
+    统计总数时无需解压。
+
+    每个月份另外为 SORTED_COLUMNS 中的每一列保存一份按 (列值, 记录ID)
+    升序排列的段文件（history-YYYY-MM.cN.z），按 SORTED_BLOCK_ROWS 条
+    分块压缩，文件头是各块首条记录的排序键和位置。按这些列分页时
+    各月份只解压续读位置所在的块，再用 heapq.merge 逐条合并，
+    内存占用与归档总量无关。代价是每条记录在磁盘上多存三份。
+    排序段只在写入归档时生成（add_rows / repair），读取不写文件；
+    排序段缺失或与时间段不一致时，读取该月份时在内存中排序。
+
+    线程安全：缓存的读写和段文件的生成由实例锁保护，临时文件名唯一。
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, archive_dir: str):
+        """初始化归档
+
+        Args:
+            archive_dir: 归档目录，首次写入时创建
+        """
+        self._dir = archive_dir
+        self._lock = threading.RLock()
+        # 最近读取的段: (月份, 文件修改时间, 记录)，分页浏览时避免重复解压
+        self._cache: Tuple[str, int, List[Tuple]] = ("", 0, [])
+        # 排序段文件的块目录: 路径 -> (文件修改时间, 记录数, 各块首键, 各块位置)
+        self._directories: Dict[str, Tuple] = {}
+        # 已解压的排序块: (路径, 文件修改时间, 块位置) -> 记录列表
+        self._blocks: "OrderedDict[Tuple, List[Tuple]]" = OrderedDict()
+
+    def _segment_path(self, month: str) -> str:
+        return os.path.join(self._dir, f"history-{month}.jsonl.z")
+
+    def _sorted_path(self, month: str, column: int) -> str:
+        return os.path.join(self._dir, f"history-{month}.c{column}.z")
+
+    def _load_index(self) -> Dict[str, int]:
+        path = os.path.join(self._dir, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_index(self, index: Dict[str, int]):
+        path = os.path.join(self._dir, self.INDEX_FILE)
+        self._write_atomic(path, json.dumps(index, sort_keys=True).encode("utf-8"))
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        """先写同目录下的唯一临时文件再替换，避免中断时留下不完整的文件，
+        多个线程或进程同时写入也不会互相覆盖临时文件"""
+        directory, name = os.path.split(path)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def months(self) -> List[str]:
+        """已归档的月份，按时间降序"""
+        return sorted(self._load_index(), reverse=True)
+
+    def count(self, month: str = None) -> int:
+        """归档记录数
+
+        Args:
+            month: 月份，为 None 时返回所有月份的总数
+        """
+        index = self._load_index()
+        if month is not None:
+            return index.get(month, 0)
+        return sum(index.values())
+
+    def read_segment(self, month: str) -> List[Tuple]:
+        """读取一个月份的全部记录（按抽取时间降序）
+
+        返回的列表可能被缓存复用，调用方不应修改。
+        """
+        with self._lock:
+            return self._read_segment(month)
+
+    def _read_segment(self, month: str) -> List[Tuple]:
+        path = self._segment_path(month)
+        if not os.path.exists(path):
+            return []
+        mtime = os.stat(path).st_mtime_ns
+        if self._cache[0] == month and self._cache[1] == mtime:
+            return self._cache[2]
+
+        with open(path, "rb") as f:
+            data = zlib.decompress(f.read()).decode("utf-8")
+        rows = [tuple(json.loads(line)) for line in data.splitlines() if line]
+        self._cache = (month, mtime, rows)
+        return rows
+
+    def _write_sorted(self, month: str, rows: List[Tuple]):
+        """写出一个月份各排序列的分块段文件
+
+        文件格式: 4 字节目录长度 + JSON 目录 + 各块的 zlib 压缩数据；
+        目录为 {"rows": 记录数, "blocks": [[首条列值, 首条记录ID, 偏移, 长度], ...]}，
+        偏移从目录之后算起。目录和数据在同一个文件中，整体原子替换。
+        """
+        for column in SORTED_COLUMNS:
+            ordered = sorted(rows, key=lambda row: (row[column], row[0]))
+            blocks, chunks, offset = [], [], 0
+            for start in range(0, len(ordered), SORTED_BLOCK_ROWS):
+                block = ordered[start:start + SORTED_BLOCK_ROWS]
+                data = zlib.compress("".join(
+                    json.dumps(row, ensure_ascii=False) + "\n" for row in block
+                ).encode("utf-8"), 6)
+                blocks.append([block[0][column], block[0][0], offset, len(data)])
+                chunks.append(data)
+                offset += len(data)
+            directory = json.dumps({"rows": len(ordered), "blocks": blocks},
+                                   ensure_ascii=False).encode("utf-8")
+            self._write_atomic(self._sorted_path(month, column),
+                               struct.pack("<I", len(directory)) + directory
+                               + b"".join(chunks))
+
+    def _sorted_directory(self, month: str, column: int) -> Optional[Tuple]:
+        """读取排序段文件的块目录: (文件修改时间, 各块首键, 各块位置)
+
+        文件不存在或记录数与 index.json 不一致（旧版本归档，或正与归档写入交错）
+        时返回 None，由调用方改为在内存中排序该月份。
+        """
+        path = self._sorted_path(month, column)
+        with self._lock:
+            if not os.path.exists(path):
+                return None
+            mtime = os.stat(path).st_mtime_ns
+            cached = self._directories.get(path)
+            if cached is None or cached[0] != mtime:
+                with open(path, "rb") as f:
+                    size = struct.unpack("<I", f.read(4))[0]
+                    directory = json.loads(f.read(size).decode("utf-8"))
+                firsts = [(b[0], b[1]) for b in directory["blocks"]]
+                spans = [(4 + size + b[2], b[3]) for b in directory["blocks"]]
+                cached = (mtime, directory["rows"], firsts, spans)
+                self._directories[path] = cached
+            if cached[1] != self.count(month):
+                return None
+            return cached[0], cached[2], cached[3]
+
+    def _read_block(self, path: str, mtime: int, span: Tuple[int, int]) -> Optional[List[Tuple]]:
+        """读取并解压一个排序块（缓存最近使用的 SORTED_BLOCK_CACHE 块）
+
+        文件在读取块目录之后被替换时返回 None。
+        """
+        key = (path, mtime, span[0])
+        with self._lock:
+            rows = self._blocks.get(key)
+            if rows is not None:
+                self._blocks.move_to_end(key)
+                return rows
+            if not os.path.exists(path) or os.stat(path).st_mtime_ns != mtime:
+                return None
+            with open(path, "rb") as f:
+                f.seek(span[0])
+                data = zlib.decompress(f.read(span[1])).decode("utf-8")
+            rows = [tuple(json.loads(line)) for line in data.splitlines() if line]
+            self._blocks[key] = rows
+            if len(self._blocks) > SORTED_BLOCK_CACHE:
+                self._blocks.popitem(last=False)
+            return rows
+
+    def _iter_month_sorted(self, month: str, column: int, after: Optional[Tuple],
+                           descending: bool) -> Iterator[Tuple]:
+        """按 (列值, 记录ID) 遍历一个月份中排在 after 之后的记录，逐块解压
+
+        排序段不可用时在内存中排序该月份；遍历中途排序段被替换时，
+        从已返回的最后一条记录之后重新定位。
+        """
+        def key(row):
+            return (row[column], row[0])
+
+        located = self._sorted_directory(month, column)
+        if located is None:
+            rows = sorted(self.read_segment(month), key=key)
+            if descending:
+                end = len(rows) if after is None else bisect.bisect_left(rows, after, key=key)
+                yield from reversed(rows[:end])
+            else:
+                start = 0 if after is None else bisect.bisect_right(rows, after, key=key)
+                yield from rows[start:]
+            return
+
+        path = self._sorted_path(month, column)
+        mtime, firsts, spans = located
+        if not firsts:
+            return
+        if descending:
+            block = len(firsts) - 1 if after is None else bisect.bisect_left(firsts, after) - 1
+            indexes = range(block, -1, -1)
+        else:
+            block = 0 if after is None else max(bisect.bisect_right(firsts, after) - 1, 0)
+            indexes = range(block, len(firsts))
+        for index in indexes:
+            rows = self._read_block(path, mtime, spans[index])
+            if rows is None:
+                yield from self._iter_month_sorted(month, column, after, descending)
+                return
+            if descending:
+                end = len(rows)
+                if after is not None and index == block:
+                    end = bisect.bisect_left(rows, after, key=key)
+                selected = reversed(rows[:end])
+            else:
+                start = 0
+                if after is not None and index == block:
+                    start = bisect.bisect_right(rows, after, key=key)
+                selected = rows[start:]
+            for row in selected:
+                after = key(row)
+                yield row
+
+    def _iter_by_time(self, after: Optional[Tuple], descending: bool) -> Iterator[Tuple]:
+        """按 (抽取时间, 记录ID) 遍历排在 after 之后的记录
+
+        各月份的时间范围互不重叠，按月份顺序逐段读取即可，同一时刻只解压一个月份。
+        """
+        def key(row):
+            # 段内按 (抽取时间, 记录ID) 降序，取负后为升序，便于二分
+            return (-row[5], -row[0])
+
+        months = self.months()
+        if not descending:
+            months.reverse()
+        if after is not None:
+            first = month_of(after[0])
+            months = [m for m in months if (m <= first if descending else m >= first)]
+        for month in months:
+            segment = self.read_segment(month)
+            if descending:
+                start = 0 if after is None else bisect.bisect_right(
+                    segment, (-after[0], -after[1]), key=key)
+                yield from segment[start:]
+            else:
+                end = len(segment) if after is None else bisect.bisect_left(
+                    segment, (-after[0], -after[1]), key=key)
+                for i in range(end - 1, -1, -1):
+                    yield segment[i]
+
+    def iter_sorted(self, column: int, after: Optional[Tuple] = None,
+                    descending: bool = False) -> Iterator[Tuple]:
+        """按 (列值, 记录ID) 顺序遍历排在 after 之后的归档记录
+
+        SORTED_COLUMNS 中的列读取各月份的排序段，逐块解压并用 heapq.merge
+        合并，同一时刻每个月份只解压一块，取前几页时只读取续读位置附近的块；
+        抽取时间列（位置 5）按月份顺序读取时间段。
+
+        Args:
+            column: 排序列在记录元组中的位置，须为 5 或在 SORTED_COLUMNS 中
+            after: 续读位置 (列值, 记录ID)，不含该位置；为 None 时从头开始
+            descending: 是否降序
+        """
+        if column == 5:
+            return self._iter_by_time(after, descending)
+        if column not in SORTED_COLUMNS:
+            raise ValueError(f"不支持的排序列位置: {column}")
+        iterators = [self._iter_month_sorted(month, column, after, descending)
+                     for month in self.months()]
+        return heapq.merge(*iterators, key=lambda row: (row[column], row[0]),
+                           reverse=descending)
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        """按抽取时间降序遍历所有归档记录，每次只解压一个月份"""
+        for month in self.months():
+            yield from self.read_segment(month)
+
+    def add_rows(self, rows: Iterable[Tuple]) -> int:
+        """将记录归档到对应月份的段文件
+
+        与已有段合并，并按记录ID去重，重复归档同一批记录不会产生重复数据。
+
+        Args:
+            rows: 记录元组（列顺序与 HISTORY_COLUMNS 一致）
+
+        Returns:
+            归档的记录数
+        """
+        by_month: Dict[str, List[Tuple]] = {}
+        total = 0
+        for row in rows:
+            by_month.setdefault(month_of(row[5]), []).append(row)
+            total += 1
+        if not by_month:
+            return 0
+
+        with self._lock:
+            os.makedirs(self._dir, exist_ok=True)
+            index = self._load_index()
+            for month, month_rows in by_month.items():
+                merged = {row[0]: row for row in self._read_segment(month)}
+                merged.update((row[0], tuple(row)) for row in month_rows)
+                ordered = sorted(merged.values(), key=lambda r: (r[5], r[0]), reverse=True)
+
+                data = "".join(json.dumps(row, ensure_ascii=False) + "\n"
+                               for row in ordered)
+                self._write_atomic(self._segment_path(month),
+                                   zlib.compress(data.encode("utf-8"), 6))
+                self._write_sorted(month, ordered)
+                index[month] = len(ordered)
+
+            self._save_index(index)
+        return total
+
+    def repair(self) -> int:
+        """为缺少排序段或排序段与时间段不一致的月份重新生成排序段
+
+        在写入归档的流程中调用（见 Database.archive_before）。
+
+        Returns:
+            重新生成的月份数
+        """
+        repaired = 0
+        with self._lock:
+            for month in self.months():
+                if any(self._sorted_directory(month, column) is None
+                       for column in SORTED_COLUMNS):
+                    self._write_sorted(month, self._read_segment(month))
+                    repaired += 1
+        return repaired
+
+    def needs_repair(self) -> bool:
+        """是否有月份缺少可用的排序段（只读取各排序段的文件头）"""
+        with self._lock:
+            return any(self._sorted_directory(month, column) is None
+                       for month in self.months() for column in SORTED_COLUMNS)
+
+    def clear(self):
+        """删除所有归档"""
+        with self._lock:
+            self._cache = ("", 0, [])
+            self._directories.clear()
+            self._blocks.clear()
+            for month in self._load_index():
+                paths = [self._segment_path(month)]
+                paths.extend(self._sorted_path(month, column)
+                             for column in SORTED_COLUMNS)
+                for path in paths:
+                    if os.path.exists(path):
+                        os.remove(path)
+            index_path = os.path.join(self._dir, self.INDEX_FILE)
+            if os.path.exists(index_path):
+                os.remove(index_path)
@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+存储接口
+
+界面、命令行和抽题服务只依赖 Storage 接口，具体实现在启动时选择:
+- sqlite:PATH  SQLite 数据库文件（默认，见 database.py）
+- memory       内存存储，不读写磁盘，进程退出即丢失（测试、基准）
+- log:PATH     追加写日志文件，并发写入合并提交（见 log_storage.py）
+
+不带前缀的字符串视为 SQLite 文件路径。未指定时读取环境变量 RQG_STORAGE，
+仍未设置则使用程序目录下的 data/history.db。
+"""
+
+import itertools
+import os
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# 历史浏览可排序的列: 列名 -> 在历史记录行元组中的位置
+HISTORY_SORT_COLUMNS = {"draw_time": 5, "person_name": 6,
+                        "question_title": 2, "bank_name": 4}
+
+# (question_id, question_title, question_content, bank_name, person_name, draw_ts)
+HistoryRow = Tuple[str, str, str, str, str, int]
+
+# 未指定存储位置时读取的环境变量
+STORAGE_ENV = "RQG_STORAGE"
+
+STORAGE_KINDS = ("sqlite", "memory", "log")
+
+
+def now_ms() -> int:
+    """当前时间的毫秒时间戳"""
+    return time.time_ns() // 1_000_000
+
+
+def ms_to_datetime(ts: int) -> datetime:
+    """毫秒时间戳转换为本地时间"""
+    return datetime.fromtimestamp(ts / 1000)
+
+
+def default_data_dir() -> str:
+    """程序目录下的 data 目录（不存在时创建）"""
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    data_dir = os.path.join(base_dir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+
+class DrawRecord:
+    """抽题记录
+
+    抽取时间以毫秒时间戳 draw_ts 保存，访问 draw_time 时才转换为 datetime，
+    大量读取历史时无需逐行解析时间字符串。
+    """
+
+    __slots__ = ("id", "question_id", "question_title", "question_content",
+                 "bank_name", "draw_ts", "person_name", "_draw_time")
+
+    def __init__(self, id: int, question_id: str, question_title: str,
+                 question_content: str, bank_name: str, draw_ts: int,
+                 person_name: str = ""):
+        self.id = id
+        self.question_id = question_id
+        self.question_title = question_title
+        self.question_content = question_content
+        self.bank_name = bank_name
+        self.draw_ts = draw_ts              # 抽取时间（毫秒时间戳）
+        self.person_name = person_name      # 抽到的人员名字
+        self._draw_time = None
+
+    @property
+    def draw_time(self) -> datetime:
+        """抽取时间（延迟转换）"""
+        if self._draw_time is None:
+            self._draw_time = ms_to_datetime(self.draw_ts)
+        return self._draw_time
+
+    def __repr__(self) -> str:
+        return (f"DrawRecord(id={self.id!r}, question_title={self.question_title!r}, "
+                f"bank_name={self.bank_name!r}, draw_ts={self.draw_ts!r})")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DrawRecord):
+            return NotImplemented
+        return self.to_row() == other.to_row()
+
+    def to_row(self) -> Tuple:
+        """转换为元组（与历史记录行的列顺序一致）"""
+        return (self.id, self.question_id, self.question_title,
+                self.question_content, self.bank_name, self.draw_ts,
+                self.person_name)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "question_id": self.question_id,
+            "question_title": self.question_title,
+            "question_content": self.question_content,
+            "bank_name": self.bank_name,
+            "person_name": self.person_name,
+            "draw_time": self.draw_time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+
+class DrawRecords(Sequence):
+    """抽题记录序列
+
+    只保存历史记录行元组，访问时才创建 DrawRecord。大批量读取历史时
+    耗时只有查询本身，不为没有用到的行创建记录对象。
+    """
+
+    __slots__ = ("_rows",)
+
+    def __init__(self, rows: List[Tuple]):
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return DrawRecords(self._rows[index])
+        return DrawRecord(*self._rows[index])
+
+    def __iter__(self) -> Iterator[DrawRecord]:
+        return itertools.starmap(DrawRecord, self._rows)
+
+    def __repr__(self) -> str:
+        return f"DrawRecords({len(self._rows)} rows)"
+
+    def rows(self) -> List[Tuple]:
+        """原始行元组列表（调用方不应修改）"""
+        return self._rows
+
+
+class Storage(ABC):
+    """存储接口
+
+    历史记录行为元组 (id, question_id, question_title, question_content,
+    bank_name, draw_ts, person_name)，draw_ts 为毫秒时间戳。
+    实现须允许多个线程同时调用（界面线程、导出线程和后台写入线程）。
+    """
+
+    # ========== 抽题历史 ==========
+
+    @abstractmethod
+    def add_history(self, question_id: str, question_title: str,
+                    question_content: str, bank_name: str,
+                    person_name: str = "", draw_ts: Optional[int] = None) -> int:
+        """添加一条抽题记录
+
+        Args:
+            draw_ts: 抽取时间（毫秒时间戳），默认为当前时间
+
+        Returns:
+            记录ID；实现可在记录暂未写入存储时返回 0（见 Database）
+        """
+
+    @abstractmethod
+    def add_history_batch(self, rows: Iterable[HistoryRow]) -> int:
+        """批量添加抽题记录（一次提交）
+
+        Args:
+            rows: HistoryRow 元组，draw_ts 为 None 时使用当前时间
+
+        Returns:
+            写入的记录数
+        """
+
+    @abstractmethod
+    def get_history_rows(self, limit: int = 100, offset: int = 0) -> List[Tuple]:
+        """按抽取时间倒序获取抽题历史的原始行
+
+        Args:
+            limit: 返回记录数量，小于 0 时不限制
+            offset: 偏移量
+        """
+
+    def get_history(self, limit: int = 100, offset: int = 0) -> DrawRecords:
+        """按抽取时间倒序获取抽题历史（记录在访问时才创建）"""
+        return DrawRecords(self.get_history_rows(limit, offset))
+
+    @abstractmethod
+    def iter_history_rows(self, chunk_size: int = 10000) -> Iterator[List[Tuple]]:
+        """按抽取时间倒序分块遍历全部抽题历史"""
+
+    @abstractmethod
+    def get_history_count(self, include_archive: bool = True) -> int:
+        """获取历史记录总数"""
+
+    @abstractmethod
+    def get_history_page(self, after: Optional[Tuple] = None, limit: int = 200,
+                         sort_by: str = "draw_time", descending: bool = True,
+                         keyword: str = "") -> Tuple[List[Tuple], Optional[Tuple]]:
+        """键集分页读取抽题历史
+
+        Args:
+            after: 上一页返回的续读位置，为 None 时从头开始
+            limit: 每页记录数
+            sort_by: 排序列，见 HISTORY_SORT_COLUMNS
+            descending: 是否降序
+            keyword: 筛选关键字（匹配题目标题、人员、题库）
+
+        Returns:
+            (记录元组列表, 下一页续读位置)；续读位置为 None 表示已读完
+        """
+
+    @abstractmethod
+    def get_total_draw_count(self) -> int:
+        """获取抽取总次数（含已归档记录）"""
+
+    @abstractmethod
+    def clear_history(self):
+        """清空抽题历史"""
+
+    def needs_archive(self, keep_months: int = 3) -> bool:
+        """是否有需要移入归档的历史记录，不支持归档的存储直接返回 False"""
+        return False
+
+    def archive_history(self, keep_months: int = 3) -> int:
+        """将较早月份的历史记录移入归档，不支持归档的存储直接返回 0"""
+        return 0
+
+    # ========== 会话状态 ==========
+
+    @abstractmethod
+    def get_session_state(self) -> Dict:
+        """读取恢复会话所需的全部状态
+
+        Returns:
+            {"banks": [题库信息字典，最近导入的在前],
+             "bitmaps": {题库名称: (题目数, 位图, 内容指纹)},
+             "roster": 名单信息字典或 None,
+             "drawn_persons": 已抽人员名字集合}
+            题库和名单信息字典含 name、file_path、question_count / person_count
+            和 import_time。
+        """
+
+    @abstractmethod
+    def register_bank(self, name: str, file_path: str, question_count: int):
+        """记录新导入的题库并清除其旧的已抽状态"""
+
+    @abstractmethod
+    def forget_bank(self, name: str):
+        """移除题库信息及其已抽状态"""
+
+    @abstractmethod
+    def register_roster(self, name: str, file_path: str, person_count: int):
+        """替换名单信息并清空已抽人员"""
+
+    @abstractmethod
+    def forget_roster(self):
+        """清空名单信息和已抽人员"""
+
+    @abstractmethod
+    def save_drawn_bitmap(self, bank_name: str, question_count: int, bitmap: bytes,
+                          fingerprint: str = ""):
+        """保存题库的已抽状态位图
+
+        Args:
+            bank_name: 题库名称
+            question_count: 题库题目数（恢复时用于校验位图是否仍然有效）
+            bitmap: 已抽状态位图，第 i 位表示第 i 道题
+            fingerprint: 题库内容指纹（见 QuestionBank.get_fingerprint），
+                恢复时与重新加载的题库比对，文件内容变化后旧位图失效
+        """
+
+    @abstractmethod
+    def get_drawn_bitmaps(self) -> Dict[str, Tuple[int, bytes, str]]:
+        """获取所有题库的已抽状态位图 {题库名称: (题目数, 位图, 内容指纹)}"""
+
+    @abstractmethod
+    def clear_drawn_bitmap(self, bank_name: Optional[str] = None):
+        """清除已抽状态位图，bank_name 为 None 时清除全部"""
+
+    def add_drawn_person(self, person_name: str):
+        """记录已抽人员"""
+        self.add_drawn_persons([person_name])
+
+    @abstractmethod
+    def add_drawn_persons(self, person_names: Iterable[str]):
+        """批量记录已抽人员"""
+
+    @abstractmethod
+    def get_drawn_person_names(self) -> Set[str]:
+        """获取已抽人员名字集合"""
+
+    @abstractmethod
+    def clear_drawn_persons(self):
+        """清空已抽人员记录"""
+
+    def close(self):
+        """关闭存储（之后不应再调用其他方法）"""
+
+
+def open_storage(spec: Optional[str] = None) -> Storage:
+    """按存储位置打开存储
+
+    Args:
+        spec: "sqlite:PATH"、"memory"、"log:PATH" 或 SQLite 文件路径；
+            为 None 时读取环境变量 RQG_STORAGE，仍未设置则使用默认 SQLite 文件。
+            sqlite / log 省略路径时使用 data 目录下的 history.db / history.log
+
+    Returns:
+        存储对象
+    """
+    if spec is None:
+        spec = os.environ.get(STORAGE_ENV, "")
+    kind, sep, path = spec.partition(":")
+    if not sep:
+        kind, path = (spec, "") if spec in STORAGE_KINDS else ("sqlite", spec)
+    elif len(kind) == 1:
+        # Windows 盘符（C:\...）不是存储类型
+        kind, path = "sqlite", spec
+
+    if kind == "memory":
+        from .memory import MemoryStorage
+        return MemoryStorage()
+    if kind == "log":
+        from .log_storage import LogStorage
+        return LogStorage(path or os.path.join(default_data_dir(), "history.log"))
+    if kind == "sqlite":
+        from .database import Database
+        return Database(path or None)
+    raise ValueError(f"不支持的存储类型: {kind}（可用 sqlite、memory、log）")
@@ -4,59 +4,165 @@
 数据库操作模块
 """
 
+import json
 import os
+import random
 import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Set, Optional
-from dataclasses import dataclass
-
-
-@dataclass
-class DrawRecord:
-    """抽题记录"""
-    id: int
-    question_id: str
-    question_title: str
-    question_content: str
-    bank_name: str
-    draw_time: datetime
-    person_name: str = ""  # 抽到的人员名字
-
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "question_id": self.question_id,
-            "question_title": self.question_title,
-            "question_content": self.question_content,
-            "bank_name": self.bank_name,
-            "person_name": self.person_name,
-            "draw_time": self.draw_time.strftime("%Y-%m-%d %H:%M:%S")
-        }
-
-
-class Database:
-    """数据库操作类"""
-
-    def __init__(self, db_path: str = None):
+from typing import (Callable, Dict, Iterable, Iterator, List, Optional, Set,
+                    Tuple, TypeVar)
+
+from src.core import metrics
+from .archive import HistoryArchive, month_of, month_start_ms, shift_month
+# 记录类型和工具函数定义在 backend 中，这里导入以保持原有的导入路径
+from .backend import (HISTORY_SORT_COLUMNS, DrawRecord, HistoryRow, Storage,
+                      default_data_dir, now_ms)
+
+T = TypeVar("T")
+
+
+# 历史记录查询列，顺序与 DrawRecord 构造参数一致
+HISTORY_COLUMNS = ("id, question_id, question_title, "
+                   "COALESCE(question_content, ''), bank_name, draw_time, "
+                   "COALESCE(person_name, '')")
+
+
+# 写入历史记录的 SQL，参数顺序见 HistoryRow
+INSERT_HISTORY_SQL = """
+    INSERT INTO draw_history
+    (question_id, question_title, question_content, bank_name,
+     person_name, draw_time)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# 补写本地写日志的 SQL，参数为 (日志键, *HistoryRow)；
+# 日志键已存在的记录（上次补写已提交）直接跳过
+INSERT_JOURNAL_SQL = """
+    INSERT INTO draw_history
+    (journal_key, question_id, question_title, question_content, bank_name,
+     person_name, draw_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (journal_key) WHERE journal_key IS NOT NULL DO NOTHING
+"""
+
+# 数据库结构版本（PRAGMA user_version），与文件中的版本一致时启动跳过建表和迁移
+SCHEMA_VERSION = 5
+
+# 锁冲突重试的退避参数（秒）
+_RETRY_BASE_DELAY = 0.01
+_RETRY_MAX_DELAY = 0.5
+
+
+def _is_busy_error(error: sqlite3.OperationalError) -> bool:
+    """是否为数据库锁冲突错误"""
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class Database(Storage):
+    """SQLite 存储
+
+    支持多个实例（多个进程）同时访问同一数据库文件：
+    - 数据库使用 WAL 模式，读写互不阻塞
+    - 每个连接设置忙等待超时
+    - 写操作在 BEGIN IMMEDIATE 事务中执行，锁冲突时带随机抖动退避重试
+    - 可选的本地写日志：重试仍失败的历史记录先写入日志，下次写入时补写
+
+    抽题历史按月分区：近期月份保存在主库中，较早的月份可通过
+    archive_history 移入压缩归档，历史查询和导出会自动读取归档。
+    """
+
+    def __init__(self, db_path: str = None, busy_timeout: float = 5.0,
+                 max_retries: int = 8, journal_path: Optional[str] = None,
+                 archive_dir: Optional[str] = None):
         """初始化数据库
 
         Args:
             db_path: 数据库文件路径，默认为程序目录下的 data/history.db
+            busy_timeout: 等待数据库锁的超时时间（秒）
+            max_retries: 写操作遇到锁冲突时的最大重试次数
+            journal_path: 本实例的本地写日志路径，为 None 时不启用
+            archive_dir: 历史归档目录，默认为数据库所在目录下的 archive
         """
         if db_path is None:
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(
-                os.path.abspath(__file__))))
-            data_dir = os.path.join(base_dir, "data")
-            os.makedirs(data_dir, exist_ok=True)
-            db_path = os.path.join(data_dir, "history.db")
+            db_path = os.path.join(default_data_dir(), "history.db")
 
         self._db_path = db_path
+        self._busy_timeout = busy_timeout
+        self._max_retries = max_retries
+        self._journal_path = journal_path
+        # 保护本地写日志的追加和补写
+        self._journal_lock = threading.Lock()
+        if archive_dir is None:
+            archive_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)),
+                                       "archive")
+        self._archive = HistoryArchive(archive_dir)
         self._init_db()
+        self.flush_journal()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开数据库连接，退出时提交并关闭"""
+        with metrics.timer("db.connection"):
+            conn = sqlite3.connect(self._db_path, timeout=self._busy_timeout)
+            try:
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def _run_write(self, operation: Callable[[sqlite3.Cursor], T]) -> T:
+        """在 BEGIN IMMEDIATE 事务中执行写操作
+
+        事务开始即获取写锁，避免读锁升级写锁时的死锁。
+        忙等待超时后仍冲突时，按指数退避加随机抖动重试。
+
+        Args:
+            operation: 接收游标并执行写入的函数
+
+        Returns:
+            operation 的返回值
+        """
+        delay = _RETRY_BASE_DELAY
+        for attempt in range(self._max_retries + 1):
+            conn = sqlite3.connect(self._db_path, timeout=self._busy_timeout,
+                                   isolation_level=None)
+            try:
+                cursor = conn.cursor()
+                with metrics.timer("db.write_transaction"):
+                    cursor.execute("BEGIN IMMEDIATE")
+                    result = operation(cursor)
+                    cursor.execute("COMMIT")
+                metrics.count("db.commits")
+                return result
+            except sqlite3.OperationalError as e:
+                if not _is_busy_error(e) or attempt == self._max_retries:
+                    raise
+            finally:
+                # 未提交的事务在关闭时自动回滚
+                conn.close()
+            metrics.count("db.busy_retries")
+            time.sleep(random.uniform(0, delay))
+            delay = min(delay * 2, _RETRY_MAX_DELAY)
 
     def _init_db(self):
-        """初始化数据库表"""
-        with sqlite3.connect(self._db_path) as conn:
+        """初始化数据库表
+
+        结构版本已是最新时只读取一次 user_version，
+        不再重复执行建表语句和需要扫描全表的迁移。
+        """
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= SCHEMA_VERSION:
+                return
+
+            # WAL 模式允许多个实例并发读写（设置会保存在数据库文件中）
+            cursor.execute("PRAGMA journal_mode=WAL")
 
             # 抽题历史表
             cursor.execute("""
@@ -67,7 +173,7 @@ class Database:
                     question_content TEXT,
                     bank_name TEXT NOT NULL,
                     person_name TEXT DEFAULT '',
-                    draw_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    draw_time INTEGER NOT NULL
                 )
             """)
 
@@ -77,15 +183,65 @@ class Database:
             if "person_name" not in columns:
                 cursor.execute("ALTER TABLE draw_history ADD COLUMN person_name TEXT DEFAULT ''")
 
-            # 已抽题目表（去重用）
+            # 本地写日志中的记录带有日志键，重复补写时按唯一索引跳过
+            if "journal_key" not in columns:
+                cursor.execute("ALTER TABLE draw_history ADD COLUMN journal_key TEXT")
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS drawn_questions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    question_id TEXT UNIQUE NOT NULL,
-                    bank_name TEXT NOT NULL
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_draw_history_journal_key
+                ON draw_history (journal_key) WHERE journal_key IS NOT NULL
+            """)
+
+            # 旧数据库的 draw_time 为 UTC 文本，迁移为毫秒时间戳
+            cursor.execute("""
+                UPDATE draw_history
+                SET draw_time = CAST(strftime('%s', draw_time) AS INTEGER) * 1000
+                WHERE typeof(draw_time) = 'text'
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_draw_history_time
+                ON draw_history (draw_time)
+            """)
+
+            # 历史浏览按列排序用的索引（隐含 id，支持键集分页）
+            for column in ("person_name", "question_title", "bank_name"):
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_draw_history_{column}
+                    ON draw_history ({column})
+                """)
+
+            # 待归档记录：与删除在同一事务中从 draw_history 移入，
+            # 提交后再写入归档段文件（见 archive_before）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS archive_pending (
+                    id INTEGER PRIMARY KEY,
+                    question_id TEXT NOT NULL,
+                    question_title TEXT NOT NULL,
+                    question_content TEXT NOT NULL,
+                    bank_name TEXT NOT NULL,
+                    draw_time INTEGER NOT NULL,
+                    person_name TEXT NOT NULL
                 )
             """)
 
+            # 已抽题目改为按题库保存位图（bank_drawn_state），删除旧的逐题记录表
+            cursor.execute("DROP TABLE IF EXISTS drawn_questions")
+
+            # 题库已抽状态表（按题目在题库中的序号存储位图）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bank_drawn_state (
+                    bank_name TEXT PRIMARY KEY,
+                    question_count INTEGER NOT NULL,
+                    bitmap BLOB NOT NULL,
+                    fingerprint TEXT NOT NULL DEFAULT ''
+                )
+            """)
+            # 位图对应的题库内容指纹（兼容旧数据库，旧位图的指纹为空，恢复时丢弃）
+            cursor.execute("PRAGMA table_info(bank_drawn_state)")
+            if "fingerprint" not in [col[1] for col in cursor.fetchall()]:
+                cursor.execute("ALTER TABLE bank_drawn_state "
+                               "ADD COLUMN fingerprint TEXT NOT NULL DEFAULT ''")
+
             # 已抽人员表（去重用）
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS drawn_persons (
@@ -116,153 +272,857 @@ class Database:
                 )
             """)
 
+            self._init_stats(cursor)
+
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             conn.commit()
 
+    def _init_stats(self, cursor: sqlite3.Cursor):
+        """初始化统计汇总表及维护触发器
+
+        汇总表由 draw_history 的插入触发器增量维护，统计查询无需扫描历史表。
+        题目ID每次加载都会变化，题目统计按 (题库, 标题) 汇总。
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_draw_stats'")
+        stats_exist = cursor.fetchone() is not None
+
+        # 题目抽取次数
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS question_draw_stats (
+                bank_name TEXT NOT NULL,
+                question_title TEXT NOT NULL,
+                draw_count INTEGER NOT NULL DEFAULT 0,
+                last_draw_time INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (bank_name, question_title)
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_question_draw_stats_count
+            ON question_draw_stats (bank_name, draw_count)
+        """)
+
+        # 人员抽中次数
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS person_draw_stats (
+                person_name TEXT PRIMARY KEY,
+                draw_count INTEGER NOT NULL DEFAULT 0,
+                last_draw_time INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_person_draw_stats_count
+            ON person_draw_stats (draw_count)
+        """)
+
+        # 题库抽取次数及已覆盖的不同题目数
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS bank_draw_stats (
+                bank_name TEXT PRIMARY KEY,
+                draw_count INTEGER NOT NULL DEFAULT 0,
+                drawn_questions INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        # 每日抽取次数（本地日期）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_draw_stats (
+                day TEXT PRIMARY KEY,
+                draw_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_draw_history_stats
+            AFTER INSERT ON draw_history
+            BEGIN
+                -- 题库行须先于题目行写入，覆盖数触发器依赖它
+                INSERT INTO bank_draw_stats (bank_name, draw_count)
+                VALUES (NEW.bank_name, 1)
+                ON CONFLICT (bank_name) DO UPDATE SET draw_count = draw_count + 1;
+
+                INSERT INTO question_draw_stats
+                    (bank_name, question_title, draw_count, last_draw_time)
+                VALUES (NEW.bank_name, NEW.question_title, 1, NEW.draw_time)
+                ON CONFLICT (bank_name, question_title) DO UPDATE SET
+                    draw_count = draw_count + 1,
+                    last_draw_time = MAX(last_draw_time, excluded.last_draw_time);
+
+                INSERT INTO daily_draw_stats (day, draw_count)
+                VALUES (date(NEW.draw_time / 1000, 'unixepoch', 'localtime'), 1)
+                ON CONFLICT (day) DO UPDATE SET draw_count = draw_count + 1;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_draw_history_person_stats
+            AFTER INSERT ON draw_history
+            WHEN NEW.person_name <> ''
+            BEGIN
+                INSERT INTO person_draw_stats (person_name, draw_count, last_draw_time)
+                VALUES (NEW.person_name, 1, NEW.draw_time)
+                ON CONFLICT (person_name) DO UPDATE SET
+                    draw_count = draw_count + 1,
+                    last_draw_time = MAX(last_draw_time, excluded.last_draw_time);
+            END
+        """)
+        # 题目首次被抽到时，题库覆盖数加一
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_question_draw_stats_coverage
+            AFTER INSERT ON question_draw_stats
+            BEGIN
+                UPDATE bank_draw_stats SET drawn_questions = drawn_questions + 1
+                WHERE bank_name = NEW.bank_name;
+            END
+        """)
+
+        # 旧数据库首次创建汇总表时，由已有历史重建
+        if not stats_exist:
+            self._rebuild_stats(cursor)
+
+    @staticmethod
+    def _rebuild_stats(cursor: sqlite3.Cursor):
+        """由 draw_history 全量重建统计汇总表"""
+        for table in ("question_draw_stats", "person_draw_stats",
+                      "bank_draw_stats", "daily_draw_stats"):
+            cursor.execute(f"DELETE FROM {table}")
+
+        # 先建立题库行，题目汇总插入时由触发器累加覆盖数
+        cursor.execute("""
+            INSERT INTO bank_draw_stats (bank_name, draw_count)
+            SELECT bank_name, COUNT(*) FROM draw_history GROUP BY bank_name
+        """)
+        cursor.execute("""
+            INSERT INTO question_draw_stats
+                (bank_name, question_title, draw_count, last_draw_time)
+            SELECT bank_name, question_title, COUNT(*), MAX(draw_time)
+            FROM draw_history GROUP BY bank_name, question_title
+        """)
+        cursor.execute("""
+            INSERT INTO person_draw_stats (person_name, draw_count, last_draw_time)
+            SELECT person_name, COUNT(*), MAX(draw_time)
+            FROM draw_history WHERE person_name <> '' GROUP BY person_name
+        """)
+        cursor.execute("""
+            INSERT INTO daily_draw_stats (day, draw_count)
+            SELECT date(draw_time / 1000, 'unixepoch', 'localtime'), COUNT(*)
+            FROM draw_history GROUP BY 1
+        """)
+
     # ========== 抽题历史操作 ==========
 
     def add_history(self, question_id: str, question_title: str,
                     question_content: str, bank_name: str,
-                    person_name: str = "") -> int:
+                    person_name: str = "", draw_ts: Optional[int] = None) -> int:
         """添加抽题记录
 
+        Args:
+            draw_ts: 抽取时间（毫秒时间戳），默认为当前时间
+
         Returns:
-            记录ID
+            记录ID；记录暂存到本地写日志时返回 0
         """
-        with sqlite3.connect(self._db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO draw_history
-                (question_id, question_title, question_content, bank_name, person_name)
-                VALUES (?, ?, ?, ?, ?)
-            """, (question_id, question_title, question_content, bank_name, person_name))
-            conn.commit()
-            return cursor.lastrowid
+        if draw_ts is None:
+            draw_ts = now_ms()
+        return self._write_history([(question_id, question_title, question_content,
+                                     bank_name, person_name, draw_ts)])
 
-    def get_history(self, limit: int = 100, offset: int = 0) -> List[DrawRecord]:
-        """获取抽题历史
+    def add_history_batch(self, rows: Iterable[HistoryRow]) -> int:
+        """批量添加抽题记录
+
+        所有记录在同一个事务中写入，一次抽取只需提交一次。
+
+        Args:
+            rows: HistoryRow 元组，draw_ts 为 None 时使用当前时间
+
+        Returns:
+            写入的记录数（包括暂存到本地写日志的记录）
+        """
+        ts = now_ms()
+        rows = [row if row[5] is not None else (*row[:5], ts) for row in rows]
+        if rows:
+            self._write_history(rows)
+        return len(rows)
+
+    def _write_history(self, rows: List[HistoryRow]) -> int:
+        """写入历史记录，先补写本地写日志中的记录
+
+        Returns:
+            最后一条记录的ID；记录暂存到本地写日志时返回 0
+        """
+        self.flush_journal()
+        try:
+            return self._insert_history(rows)
+        except sqlite3.OperationalError as e:
+            if not self._journal_path or not _is_busy_error(e):
+                raise
+            self._append_journal(rows)
+            return 0
+
+    def _insert_history(self, rows: List[HistoryRow]) -> int:
+        """在一个写事务中插入历史记录，返回最后一条记录的ID"""
+        metrics.count("db.history_rows", len(rows))
+
+        def insert(cursor: sqlite3.Cursor) -> int:
+            cursor.executemany(INSERT_HISTORY_SQL, rows)
+            cursor.execute("SELECT last_insert_rowid()")
+            return cursor.fetchone()[0]
+        return self._run_write(insert)
+
+    # ========== 本地写日志 ==========
+
+    @property
+    def _flushing_path(self) -> str:
+        """补写中的日志路径：补写前先将日志改名，补写期间的新记录写入新日志"""
+        return self._journal_path + ".flushing"
+
+    def _append_journal(self, rows: List[HistoryRow]):
+        """将历史记录追加到本地写日志，每条记录带唯一的日志键"""
+        with self._journal_lock:
+            with open(self._journal_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps([uuid.uuid4().hex, *row], ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def get_journal_count(self) -> int:
+        """获取本地写日志中待补写的记录数"""
+        if not self._journal_path:
+            return 0
+        count = 0
+        with self._journal_lock:
+            for path in (self._flushing_path, self._journal_path):
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8") as f:
+                        count += sum(1 for line in f if line.strip())
+        return count
+
+    def flush_journal(self) -> int:
+        """将本地写日志中的记录补写到数据库
+
+        日志先原子改名为 .flushing 文件再读取，补写事务提交后才删除；
+        提交后、删除前中断时，下次补写按日志键跳过已写入的记录，不会重复。
+
+        Returns:
+            补写的记录数；数据库仍被占用时返回 0，日志保留待下次补写
+        """
+        if not self._journal_path:
+            return 0
+
+        with self._journal_lock:
+            flushing = self._flushing_path
+            if not os.path.exists(flushing):
+                if not os.path.exists(self._journal_path):
+                    return 0
+                os.replace(self._journal_path, flushing)
+
+            with open(flushing, "r", encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+            if rows:
+                metrics.count("db.history_rows", len(rows))
+                try:
+                    self._run_write(
+                        lambda cursor: cursor.executemany(INSERT_JOURNAL_SQL, rows))
+                except sqlite3.OperationalError as e:
+                    if _is_busy_error(e):
+                        return 0
+                    raise
+            os.remove(flushing)
+        # 上一次补写失败时 .flushing 之外可能还有新日志
+        return len(rows) + self.flush_journal()
+
+    def get_history_rows(self, limit: int = 100, offset: int = 0) -> List[Tuple]:
+        """获取抽题历史的原始行
+
+        行为元组，列顺序见 HISTORY_COLUMNS，draw_time 为毫秒时间戳。
+        适合大批量读取，不创建任何记录对象。
+        主库中的记录不足时，继续从归档中按时间倒序读取。
 
         Args:
-            limit: 返回记录数量
+            limit: 返回记录数量，小于 0 时不限制
             offset: 偏移量
 
         Returns:
-            抽题记录列表
+            元组列表
         """
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM draw_history
-                ORDER BY draw_time DESC
+            cursor.execute(f"""
+                SELECT {HISTORY_COLUMNS} FROM draw_history
+                ORDER BY draw_time DESC, id DESC
                 LIMIT ? OFFSET ?
             """, (limit, offset))
+            rows = cursor.fetchall()
+
+            if 0 <= limit <= len(rows):
+                return rows
+            months = self._archive.months()
+            if not months:
+                return rows
+
+            # 主库已读完，计算需要在归档中跳过的记录数
+            skip = 0
+            if not rows and offset:
+                cursor.execute("SELECT COUNT(*) FROM draw_history")
+                skip = max(0, offset - cursor.fetchone()[0])
 
-            records = []
-            for row in cursor.fetchall():
-                records.append(DrawRecord(
-                    id=row["id"],
-                    question_id=row["question_id"],
-                    question_title=row["question_title"],
-                    question_content=row["question_content"] or "",
-                    bank_name=row["bank_name"],
-                    person_name=row["person_name"] if "person_name" in row.keys() else "",
-                    draw_time=datetime.strptime(row["draw_time"],
-                                                "%Y-%m-%d %H:%M:%S")
-                ))
-            return records
-
-    def get_history_count(self) -> int:
-        """获取历史记录总数"""
-        with sqlite3.connect(self._db_path) as conn:
+        for month in months:
+            if 0 <= limit <= len(rows):
+                break
+            month_count = self._archive.count(month)
+            if skip >= month_count:
+                skip -= month_count
+                continue
+            segment = self._archive.read_segment(month)
+            end = len(segment) if limit < 0 else skip + limit - len(rows)
+            rows.extend(segment[skip:end])
+            skip = 0
+        return rows
+
+    def iter_history_rows(self, chunk_size: int = 10000) -> Iterator[List[Tuple]]:
+        """按抽取时间倒序分块遍历全部抽题历史（含归档）
+
+        主库记录通过同一个游标分块读取，归档每次只解压一个月份，
+        内存占用与历史总量无关。
+
+        Args:
+            chunk_size: 每块的记录数
+
+        Yields:
+            元组列表，列顺序见 HISTORY_COLUMNS
+        """
+        conn = sqlite3.connect(self._db_path, timeout=self._busy_timeout)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {HISTORY_COLUMNS} FROM draw_history
+                ORDER BY draw_time DESC, id DESC
+            """)
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            conn.close()
+
+        for month in self._archive.months():
+            segment = self._archive.read_segment(month)
+            for start in range(0, len(segment), chunk_size):
+                yield segment[start:start + chunk_size]
+
+    def get_history_count(self, include_archive: bool = True) -> int:
+        """获取历史记录总数
+
+        Args:
+            include_archive: 是否包含已归档的记录
+        """
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) FROM draw_history")
-            return cursor.fetchone()[0]
+            count = cursor.fetchone()[0]
+        if include_archive:
+            count += self._archive.count()
+        return count
 
     def clear_history(self):
-        """清空抽题历史"""
-        with sqlite3.connect(self._db_path) as conn:
-            cursor = conn.cursor()
+        """清空抽题历史（同时清空统计和归档）"""
+        def write(cursor: sqlite3.Cursor):
             cursor.execute("DELETE FROM draw_history")
-            conn.commit()
+            cursor.execute("DELETE FROM archive_pending")
+            self._rebuild_stats(cursor)
+
+        self._run_write(write)
+        self._archive.clear()
 
-    # ========== 已抽题目操作（去重） ==========
+    # ========== 历史归档 ==========
 
-    def add_drawn_question(self, question_id: str, bank_name: str):
-        """记录已抽题目"""
-        with sqlite3.connect(self._db_path) as conn:
+    @staticmethod
+    def _keep_from(keep_months: int) -> str:
+        """保留 keep_months 个月份（含当前月）时，主库保留的最早月份"""
+        current = datetime.now().strftime("%Y-%m")
+        return shift_month(current, -(keep_months - 1))
+
+    def needs_archive(self, keep_months: int = 3) -> bool:
+        """是否有需要移入归档的历史记录
+
+        只按 draw_time 索引查找一条早于保留范围的记录、上次中断时留下的
+        待归档记录，以及缺少排序段的归档月份，耗时与历史总量无关。
+
+        Args:
+            keep_months: 主库中保留的月份数（含当前月）
+        """
+        cutoff = month_start_ms(self._keep_from(keep_months))
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT OR IGNORE INTO drawn_questions (question_id, bank_name)
-                VALUES (?, ?)
-            """, (question_id, bank_name))
-            conn.commit()
+                SELECT EXISTS (SELECT 1 FROM draw_history WHERE draw_time < ?)
+                    OR EXISTS (SELECT 1 FROM archive_pending)
+            """, (cutoff,))
+            if cursor.fetchone()[0]:
+                return True
+        return self._archive.needs_repair()
+
+    def archive_history(self, keep_months: int = 3) -> int:
+        """将较早月份的历史记录移入压缩归档
+
+        Args:
+            keep_months: 主库中保留的月份数（含当前月）
+
+        Returns:
+            归档的记录数
+        """
+        return self.archive_before(self._keep_from(keep_months))
+
+    def archive_before(self, month: str) -> int:
+        """将指定月份之前的历史记录移入压缩归档
+
+        逐月处理，每个月份分两个写事务：先把记录从 draw_history 移入
+        archive_pending，提交后再写入段文件并清空 archive_pending。
+        段文件只在删除提交之后写入，删除回滚不会在归档中留下重复记录；
+        写段文件前中断时记录留在 archive_pending，下次归档时先补写。
+        统计汇总表不受影响，仍包含已归档的记录。
+
+        Args:
+            month: 月份（YYYY-MM），该月及之后的记录保留在主库
+
+        Returns:
+            归档的记录数
+        """
+        cutoff = month_start_ms(month)
+
+        def move_oldest_month(cursor: sqlite3.Cursor) -> int:
+            cursor.execute(
+                "SELECT MIN(draw_time) FROM draw_history WHERE draw_time < ?",
+                (cutoff,))
+            oldest = cursor.fetchone()[0]
+            if oldest is None:
+                return 0
+            end = min(month_start_ms(shift_month(month_of(oldest), 1)), cutoff)
+            cursor.execute(f"""
+                INSERT OR REPLACE INTO archive_pending
+                SELECT {HISTORY_COLUMNS} FROM draw_history
+                WHERE draw_time < ?
+            """, (end,))
+            cursor.execute("DELETE FROM draw_history WHERE draw_time < ?", (end,))
+            return cursor.rowcount
 
-    def get_drawn_question_ids(self, bank_name: Optional[str] = None) -> Set[str]:
-        """获取已抽题目ID集合"""
-        with sqlite3.connect(self._db_path) as conn:
+        def write_pending(cursor: sqlite3.Cursor) -> int:
+            cursor.execute(f"SELECT {HISTORY_COLUMNS} FROM archive_pending")
+            rows = cursor.fetchall()
+            if rows:
+                # 段文件按记录ID合并去重，本事务回滚后重新写入不会产生重复
+                self._archive.add_rows(rows)
+                cursor.execute("DELETE FROM archive_pending")
+            return len(rows)
+
+        # 先补写上次中断时留下的待归档记录，并补齐缺失的排序段
+        self._run_write(write_pending)
+        self._archive.repair()
+        total = 0
+        while True:
+            count = self._run_write(move_oldest_month)
+            if not count:
+                return total
+            self._run_write(write_pending)
+            total += count
+
+    def get_history_page(self, after: Optional[Tuple] = None, limit: int = 200,
+                         sort_by: str = "draw_time", descending: bool = True,
+                         keyword: str = "") -> Tuple[List[Tuple], Optional[Tuple]]:
+        """键集分页读取抽题历史
+
+        排序和筛选在 SQL 中完成，每页只按索引定位到上一页末尾继续读取，
+        翻页耗时与历史总量无关。按抽取时间倒序浏览时，主库读完后继续读取归档；
+        其他排序下归档记录按排序键与主库合并（见 _merge_archive_page）。
+
+        Args:
+            after: 上一页返回的续读位置，为 None 时从头开始
+            limit: 每页记录数
+            sort_by: 排序列，见 HISTORY_SORT_COLUMNS
+            descending: 是否降序
+            keyword: 筛选关键字（匹配题目标题、人员、题库）
+
+        Returns:
+            (记录元组列表, 下一页续读位置)；续读位置为 None 表示已读完
+        """
+        if sort_by not in HISTORY_SORT_COLUMNS:
+            raise ValueError(f"不支持的排序列: {sort_by}")
+
+        column = HISTORY_SORT_COLUMNS[sort_by]
+        if after is None or after[0] == "main":
+            rows = self._get_main_page(after, limit, sort_by, descending, keyword)
+            # 只有按时间倒序时归档记录才整体排在主库之后，其他排序逐页合并
+            archive_last = sort_by == "draw_time" and descending
+            if not archive_last and self._archive.count():
+                rows = self._merge_archive_page(after, rows, limit, column,
+                                                descending, keyword)
+            if len(rows) == limit:
+                last = rows[-1]
+                return rows, ("main", last[column], last[0])
+            if not archive_last:
+                return rows, None
+            after = ("archive", 0, 0)
+        else:
+            rows = []
+
+        return self._get_archive_page(after, rows, limit, keyword)
+
+    def _get_main_page(self, after: Optional[Tuple], limit: int, sort_by: str,
+                       descending: bool, keyword: str) -> List[Tuple]:
+        """从主库读取一页
+
+        续读分两步：先读与上一页末尾排序值相同、id 更靠后的记录，
+        再读排序值更靠后的记录。两步都能直接按索引定位，
+        排序列存在大量相同值时也不必从头扫描。
+        """
+        filters = []
+        filter_params: list = []
+        if keyword:
+            pattern = "%" + keyword.replace("\\", "\\\\").replace(
+                "%", "\\%").replace("_", "\\_") + "%"
+            filters.append(
+                "(question_title LIKE ? ESCAPE '\\' OR person_name LIKE ? ESCAPE '\\' "
+                "OR bank_name LIKE ? ESCAPE '\\')")
+            filter_params.extend([pattern] * 3)
+
+        order = "DESC" if descending else "ASC"
+        op = "<" if descending else ">"
+        if after is None:
+            steps = [([], [])]
+        else:
+            value, last_id = after[1], after[2]
+            steps = [([f"{sort_by} = ?", f"id {op} ?"], [value, last_id]),
+                     ([f"{sort_by} {op} ?"], [value])]
+
+        rows: List[Tuple] = []
+        with self._connect() as conn:
             cursor = conn.cursor()
-            if bank_name:
-                cursor.execute(
-                    "SELECT question_id FROM drawn_questions WHERE bank_name = ?",
-                    (bank_name,))
-            else:
-                cursor.execute("SELECT question_id FROM drawn_questions")
-            return {row[0] for row in cursor.fetchall()}
+            for conditions, params in steps:
+                conditions = conditions + filters
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                cursor.execute(f"""
+                    SELECT {HISTORY_COLUMNS} FROM draw_history
+                    {where}
+                    ORDER BY {sort_by} {order}, id {order}
+                    LIMIT ?
+                """, (*params, *filter_params, limit - len(rows)))
+                rows.extend(cursor.fetchall())
+                if len(rows) >= limit:
+                    break
+        return rows
+
+    def _merge_archive_page(self, after: Optional[Tuple], rows: List[Tuple], limit: int,
+                            column: int, descending: bool, keyword: str) -> List[Tuple]:
+        """把排在续读位置之后的归档记录与主库的一页合并，返回合并后的一页
+
+        续读位置 (列值, id) 对主库和归档同样有效（记录ID全局唯一），
+        因此从归档的按列排序段中按续读位置定位，取出最多 limit 条匹配的记录即可。
+        无关键字时每个归档月份只需解压一块；有关键字时按顺序逐块扫描，
+        直到凑满一页或读完归档（与主库的 LIKE 筛选一样，耗时随匹配稀疏程度增长，
+        内存占用不随归档总量增长）。
+        """
+        after_key = None if after is None else (after[1], after[2])
+        keyword = keyword.lower()
+        candidates = []
+        for row in self._archive.iter_sorted(column, after_key, descending):
+            if (not keyword or keyword in row[2].lower()
+                    or keyword in row[6].lower() or keyword in row[4].lower()):
+                candidates.append(row)
+                if len(candidates) == limit:
+                    break
+
+        merged = sorted(rows + candidates, key=lambda row: (row[column], row[0]),
+                        reverse=descending)
+        return merged[:limit]
+
+    def _get_archive_page(self, after: Tuple, rows: List[Tuple], limit: int,
+                          keyword: str) -> Tuple[List[Tuple], Optional[Tuple]]:
+        """从归档继续读取，补足一页"""
+        keyword = keyword.lower()
+        months = self._archive.months()
+        month_index, offset = after[1], after[2]
+        while month_index < len(months) and len(rows) < limit:
+            segment = self._archive.read_segment(months[month_index])
+            while offset < len(segment) and len(rows) < limit:
+                row = segment[offset]
+                offset += 1
+                if (not keyword or keyword in row[2].lower()
+                        or keyword in row[6].lower() or keyword in row[4].lower()):
+                    rows.append(row)
+            if offset >= len(segment):
+                month_index, offset = month_index + 1, 0
+
+        if month_index >= len(months):
+            return rows, None
+        return rows, ("archive", month_index, offset)
+
+    def get_archived_months(self) -> List[str]:
+        """获取已归档的月份（按时间降序）"""
+        return self._archive.months()
+
+    # ========== 抽取统计 ==========
+
+    def get_total_draw_count(self) -> int:
+        """获取抽取总次数（来自统计汇总，含已归档记录，无需扫描历史表）"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(SUM(draw_count), 0) FROM bank_draw_stats")
+            return cursor.fetchone()[0]
+
+    def get_question_draw_count(self, bank_name: str, question_title: str) -> int:
+        """获取题目被抽取的次数"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT draw_count FROM question_draw_stats
+                WHERE bank_name = ? AND question_title = ?
+            """, (bank_name, question_title))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+
+    def get_question_stats(self, bank_name: str, limit: int = 20) -> List[Dict]:
+        """获取题库中抽取次数最多的题目
+
+        Args:
+            bank_name: 题库名称
+            limit: 返回数量
+
+        Returns:
+            [{"question_title", "draw_count", "last_draw_time"}]，按次数降序
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT question_title, draw_count, last_draw_time
+                FROM question_draw_stats
+                WHERE bank_name = ?
+                ORDER BY draw_count DESC
+                LIMIT ?
+            """, (bank_name, limit))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_person_draw_count(self, person_name: str) -> int:
+        """获取人员被抽中的次数"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT draw_count FROM person_draw_stats WHERE person_name = ?",
+                (person_name,))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+
+    def get_person_stats(self, limit: int = 20) -> List[Dict]:
+        """获取被抽中次数最多的人员
+
+        Returns:
+            [{"person_name", "draw_count", "last_draw_time"}]，按次数降序
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT person_name, draw_count, last_draw_time
+                FROM person_draw_stats
+                ORDER BY draw_count DESC
+                LIMIT ?
+            """, (limit,))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_bank_coverage(self, bank_name: str) -> Dict:
+        """获取题库覆盖情况
+
+        Returns:
+            {"draw_count": 抽取次数, "drawn_questions": 抽到过的题目数,
+             "question_count": 题目总数, "coverage": 覆盖率 0~1}
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COALESCE(s.draw_count, 0), COALESCE(s.drawn_questions, 0),
+                       COALESCE(b.question_count, 0)
+                FROM (SELECT ? AS bank_name) AS k
+                LEFT JOIN bank_draw_stats AS s ON s.bank_name = k.bank_name
+                LEFT JOIN question_banks AS b ON b.name = k.bank_name
+            """, (bank_name,))
+            draw_count, drawn_questions, question_count = cursor.fetchone()
+            coverage = (min(drawn_questions, question_count) / question_count
+                        if question_count else 0.0)
+            return {
+                "draw_count": draw_count,
+                "drawn_questions": drawn_questions,
+                "question_count": question_count,
+                "coverage": coverage
+            }
+
+    def get_daily_counts(self, start_day: Optional[str] = None,
+                         end_day: Optional[str] = None) -> Dict[str, int]:
+        """获取每日抽取次数
+
+        Args:
+            start_day: 起始日期（含），格式 YYYY-MM-DD
+            end_day: 结束日期（含），格式 YYYY-MM-DD
+
+        Returns:
+            {日期: 抽取次数}，按日期升序
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT day, draw_count FROM daily_draw_stats
+                WHERE day >= ? AND day <= ?
+                ORDER BY day
+            """, (start_day or "", end_day or "9999-12-31"))
+            return dict(cursor.fetchall())
+
+    # ========== 题库已抽状态（位图） ==========
+
+    def save_drawn_bitmap(self, bank_name: str, question_count: int, bitmap: bytes,
+                          fingerprint: str = ""):
+        """保存题库的已抽状态位图
+
+        Args:
+            bank_name: 题库名称
+            question_count: 题库题目数（恢复时用于校验位图是否仍然有效）
+            bitmap: 已抽状态位图，第 i 位表示第 i 道题
+            fingerprint: 题库内容指纹（见 QuestionBank.get_fingerprint）
+        """
+        self._run_write(lambda cursor: cursor.execute("""
+            INSERT OR REPLACE INTO bank_drawn_state
+            (bank_name, question_count, bitmap, fingerprint)
+            VALUES (?, ?, ?, ?)
+        """, (bank_name, question_count, bitmap, fingerprint)))
+
+    def get_drawn_bitmaps(self) -> Dict[str, Tuple[int, bytes, str]]:
+        """获取所有题库的已抽状态位图
 
-    def clear_drawn_questions(self, bank_name: Optional[str] = None):
-        """清空已抽题目记录"""
-        with sqlite3.connect(self._db_path) as conn:
+        Returns:
+            {题库名称: (题目数, 位图, 内容指纹)}
+        """
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.execute("SELECT bank_name, question_count, bitmap, fingerprint "
+                           "FROM bank_drawn_state")
+            return {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+
+    def clear_drawn_bitmap(self, bank_name: Optional[str] = None):
+        """清除已抽状态位图"""
+        def write(cursor: sqlite3.Cursor):
             if bank_name:
                 cursor.execute(
-                    "DELETE FROM drawn_questions WHERE bank_name = ?",
+                    "DELETE FROM bank_drawn_state WHERE bank_name = ?",
                     (bank_name,))
             else:
-                cursor.execute("DELETE FROM drawn_questions")
-            conn.commit()
+                cursor.execute("DELETE FROM bank_drawn_state")
+
+        self._run_write(write)
 
     # ========== 已抽人员操作（去重） ==========
 
     def add_drawn_person(self, person_name: str):
         """记录已抽人员"""
-        with sqlite3.connect(self._db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        self.add_drawn_persons([person_name])
+
+    def add_drawn_persons(self, person_names: Iterable[str]):
+        """批量记录已抽人员"""
+        params = [(name,) for name in person_names]
+        if params:
+            self._run_write(lambda cursor: cursor.executemany("""
                 INSERT OR IGNORE INTO drawn_persons (person_name)
                 VALUES (?)
-            """, (person_name,))
-            conn.commit()
+            """, params))
 
     def get_drawn_person_names(self) -> Set[str]:
         """获取已抽人员名字集合"""
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT person_name FROM drawn_persons")
             return {row[0] for row in cursor.fetchall()}
 
     def clear_drawn_persons(self):
         """清空已抽人员记录"""
-        with sqlite3.connect(self._db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM drawn_persons")
-            conn.commit()
+        self._run_write(lambda cursor: cursor.execute("DELETE FROM drawn_persons"))
 
-    # ========== 题库记录操作 ==========
+    # ========== 会话状态 ==========
 
-    def save_bank_info(self, name: str, file_path: str, question_count: int):
-        """保存题库信息"""
-        with sqlite3.connect(self._db_path) as conn:
+    def get_session_state(self) -> Dict:
+        """读取恢复会话所需的全部状态（一次连接）
+
+        Returns:
+            {"banks": get_bank_info 的结果,
+             "bitmaps": get_drawn_bitmaps 的结果,
+             "roster": get_roster_info 的结果,
+             "drawn_persons": get_drawn_person_names 的结果}
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
+            cursor.execute("SELECT * FROM question_banks ORDER BY import_time DESC")
+            banks = [dict(row) for row in cursor.fetchall()]
+            cursor.execute("SELECT bank_name, question_count, bitmap, fingerprint "
+                           "FROM bank_drawn_state")
+            bitmaps = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+            cursor.execute("SELECT * FROM roster_info ORDER BY import_time DESC LIMIT 1")
+            row = cursor.fetchone()
+            roster = dict(row) if row else None
+            cursor.execute("SELECT person_name FROM drawn_persons")
+            drawn_persons = {row[0] for row in cursor.fetchall()}
+        return {"banks": banks, "bitmaps": bitmaps, "roster": roster,
+                "drawn_persons": drawn_persons}
+
+    def register_bank(self, name: str, file_path: str, question_count: int):
+        """记录新导入的题库并清除其旧的已抽状态（一个事务）"""
+        def write(cursor: sqlite3.Cursor):
             cursor.execute("""
                 INSERT OR REPLACE INTO question_banks
                 (name, file_path, question_count, import_time)
                 VALUES (?, ?, ?, CURRENT_TIMESTAMP)
             """, (name, file_path, question_count))
-            conn.commit()
+            cursor.execute("DELETE FROM bank_drawn_state WHERE bank_name = ?", (name,))
+
+        self._run_write(write)
+
+    def forget_bank(self, name: str):
+        """移除题库信息及其已抽状态（一个事务）"""
+        def write(cursor: sqlite3.Cursor):
+            cursor.execute("DELETE FROM question_banks WHERE name = ?", (name,))
+            cursor.execute("DELETE FROM bank_drawn_state WHERE bank_name = ?", (name,))
+
+        self._run_write(write)
+
+    def register_roster(self, name: str, file_path: str, person_count: int):
+        """替换名单信息并清空已抽人员（一个事务）"""
+        def write(cursor: sqlite3.Cursor):
+            cursor.execute("DELETE FROM roster_info")
+            cursor.execute("DELETE FROM drawn_persons")
+            cursor.execute("""
+                INSERT INTO roster_info (name, file_path, person_count, import_time)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            """, (name, file_path, person_count))
+
+        self._run_write(write)
+
+    def forget_roster(self):
+        """清空名单信息和已抽人员（一个事务）"""
+        def write(cursor: sqlite3.Cursor):
+            cursor.execute("DELETE FROM roster_info")
+            cursor.execute("DELETE FROM drawn_persons")
+
+        self._run_write(write)
+
+    # ========== 题库记录操作 ==========
+
+    def save_bank_info(self, name: str, file_path: str, question_count: int):
+        """保存题库信息"""
+        self._run_write(lambda cursor: cursor.execute("""
+            INSERT OR REPLACE INTO question_banks
+            (name, file_path, question_count, import_time)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        """, (name, file_path, question_count)))
 
     def get_bank_info(self) -> List[Dict]:
         """获取所有题库信息"""
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM question_banks ORDER BY import_time DESC")
@@ -270,34 +1130,26 @@ class Database:
 
     def remove_bank_info(self, name: str):
         """移除题库信息"""
-        with sqlite3.connect(self._db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM question_banks WHERE name = ?", (name,))
-            conn.commit()
+        self._run_write(lambda cursor: cursor.execute(
+            "DELETE FROM question_banks WHERE name = ?", (name,)))
 
     def clear_all_bank_info(self):
         """清空所有题库信息"""
-        with sqlite3.connect(self._db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM question_banks")
-            conn.commit()
+        self._run_write(lambda cursor: cursor.execute("DELETE FROM question_banks"))
 
     # ========== 名单记录操作 ==========
 
     def save_roster_info(self, name: str, file_path: str, person_count: int):
         """保存名单信息"""
-        with sqlite3.connect(self._db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO roster_info
-                (name, file_path, person_count, import_time)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            """, (name, file_path, person_count))
-            conn.commit()
+        self._run_write(lambda cursor: cursor.execute("""
+            INSERT OR REPLACE INTO roster_info
+            (name, file_path, person_count, import_time)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        """, (name, file_path, person_count)))
 
     def get_roster_info(self) -> Optional[Dict]:
         """获取名单信息"""
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM roster_info ORDER BY import_time DESC LIMIT 1")
@@ -306,7 +1158,4 @@ class Database:
 
     def clear_roster_info(self):
         """清空名单信息"""
-        with sqlite3.connect(self._db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM roster_info")
-            conn.commit()
+        self._run_write(lambda cursor: cursor.execute("DELETE FROM roster_info"))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+导出任务
+"""
+
+import os
+import shutil
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .exporter import ExportCancelled, ProgressCallback
+
+
+@dataclass
+class ExportResult:
+    """导出结果"""
+    file_path: str
+    success: bool
+    cancelled: bool = False
+    rows: int = 0                       # 已导出行数
+    elapsed: float = 0.0                # 耗时（秒）
+    error: str = ""                     # 错误信息
+    error_type: str = ""                # 异常类型名
+    detail: str = ""                    # 完整异常堆栈
+
+    @property
+    def message(self) -> str:
+        """面向用户的结果说明"""
+        if self.success:
+            return f"已导出 {self.rows} 条记录到:\n{self.file_path}"
+        if self.cancelled:
+            return "导出已取消"
+        return f"导出失败 ({self.error_type}): {self.error}"
+
+
+class ExportJob:
+    """导出任务
+
+    包装 Exporter 的导出方法，提供进度回调、取消和原子写入：
+    先写入同目录下的临时文件（或目录），成功后再替换为目标，
+    失败或取消时目标保持不变。任务本身与线程无关，
+    可在任意工作线程中调用 run。
+
+    用法:
+        job = ExportJob(Exporter.export_history_to_csv, db, path)
+        result = job.run(progress=lambda done, total: ...)
+    """
+
+    def __init__(self, export_func: Callable, source, file_path: str, **kwargs):
+        """初始化导出任务
+
+        Args:
+            export_func: Exporter 的导出方法，签名为 (数据, 文件路径, ..., progress=...)
+            source: 导出的数据（记录列表、结果列表或数据库）
+            file_path: 目标文件路径
+            **kwargs: 导出方法的其他参数
+        """
+        # 调用未包装的导出函数，以获得具体异常
+        self._export = getattr(export_func, "__wrapped__", export_func)
+        self._source = source
+        self._file_path = file_path
+        self._kwargs = kwargs
+        self._cancel_event = threading.Event()
+
+    @property
+    def file_path(self) -> str:
+        return self._file_path
+
+    def cancel(self):
+        """请求取消（在下一次进度报告时生效）"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _temp_path(self) -> str:
+        """同目录临时文件路径，保留完整扩展名（如 .csv.gz）"""
+        directory, name = os.path.split(os.path.abspath(self._file_path))
+        return os.path.join(directory, f".~{name}")
+
+    def run(self, progress: Optional[ProgressCallback] = None) -> ExportResult:
+        """执行导出
+
+        Args:
+            progress: 进度回调 (已导出行数, 总行数)
+
+        Returns:
+            导出结果
+        """
+        rows = 0
+
+        def on_progress(done: int, total: int):
+            nonlocal rows
+            rows = done
+            if self._cancel_event.is_set():
+                raise ExportCancelled()
+            if progress is not None:
+                progress(done, total)
+
+        temp_path = self._temp_path()
+        started = time.perf_counter()
+        try:
+            if self._cancel_event.is_set():
+                raise ExportCancelled()
+            self._export(self._source, temp_path, progress=on_progress,
+                         **self._kwargs)
+            self._commit(temp_path)
+            return ExportResult(self._file_path, True, rows=rows,
+                                elapsed=time.perf_counter() - started)
+        except ExportCancelled:
+            self._remove_temp(temp_path)
+            return ExportResult(self._file_path, False, cancelled=True, rows=rows,
+                                elapsed=time.perf_counter() - started)
+        except Exception as e:
+            self._remove_temp(temp_path)
+            return ExportResult(self._file_path, False, rows=rows,
+                                elapsed=time.perf_counter() - started,
+                                error=str(e) or repr(e),
+                                error_type=type(e).__name__,
+                                detail=traceback.format_exc())
+
+    def _commit(self, temp_path: str):
+        """用临时文件（或目录）替换目标
+
+        os.replace 不能覆盖已存在的目录（Windows 上即使目录为空也会失败），
+        因此先将旧目录移到一旁，替换成功后再删除；替换失败时恢复旧目录。
+        """
+        if not (os.path.isdir(temp_path) and os.path.exists(self._file_path)):
+            os.replace(temp_path, self._file_path)
+            return
+        directory, name = os.path.split(os.path.abspath(self._file_path))
+        backup_path = os.path.join(directory, f".~old~{name}")
+        self._remove_temp(backup_path)
+        os.replace(self._file_path, backup_path)
+        try:
+            os.replace(temp_path, self._file_path)
+        except OSError:
+            os.replace(backup_path, self._file_path)
+            raise
+        self._remove_temp(backup_path)
+
+    @staticmethod
+    def _remove_temp(temp_path: str):
+        """删除临时文件（按人员导出时为临时目录）"""
+        try:
+            if os.path.isdir(temp_path):
+                shutil.rmtree(temp_path)
+            elif os.path.exists(temp_path):
+                os.remove(temp_path)
+        except OSError:
+            pass
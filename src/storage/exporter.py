@@ -4,195 +4,472 @@
 导出功能模块
 """
 
+import csv
+import functools
+import gzip
+import io
+import json
 import os
+import re
+import zipfile
 from datetime import datetime
-from typing import List, Union, TYPE_CHECKING
+from typing import (IO, Callable, Iterable, Iterator, List, Optional, Tuple,
+                    Union, TYPE_CHECKING)
 
 if TYPE_CHECKING:
-    from src.ui.result_panel import DrawResult
-
-from .database import DrawRecord
+    from src.core.result import DrawResult
+
+from src.core import metrics
+from .backend import DrawRecord, Storage, ms_to_datetime
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Excel 列定义: (列名, 列宽)
+HISTORY_EXCEL_COLUMNS = [("序号", 8), ("人员", 12), ("题目标题", 35),
+                         ("题库", 15), ("抽取时间", 20), ("题目要求", 45)]
+RESULT_EXCEL_COLUMNS = [("序号", 8), ("人员", 12), ("题目标题", 35),
+                        ("题库", 15), ("题目要求", 45)]
+
+# 每个 Excel 工作表最多 1048576 行（含表头），超出后续写到新工作表
+EXCEL_MAX_DATA_ROWS = 1048575
+
+# 数据导出（CSV / JSONL / Arrow）的字段，draw_ts 为毫秒时间戳
+DATA_FIELDS = ["id", "question_id", "question_title", "question_content",
+               "bank_name", "person_name", "draw_time", "draw_ts"]
+
+# 进度回调: (已导出行数, 总行数)；回调中抛出 ExportCancelled 可取消导出
+ProgressCallback = Callable[[int, int], None]
+
+# 列表导出时每隔多少行报告一次进度
+PROGRESS_INTERVAL = 1000
+
+
+class ExportCancelled(Exception):
+    """导出已取消"""
+
+
+def data_row(row: Tuple) -> list:
+    """历史记录行（见 Storage）转换为 DATA_FIELDS 顺序"""
+    return [row[0], row[1], row[2], row[3], row[4], row[6],
+            ms_to_datetime(row[5]).strftime(TIME_FORMAT), row[5]]
+
+
+def _pin_xlsx_timestamps(source: IO[bytes], file_path: str, timestamp: datetime):
+    """将 xlsx 的修改时间和压缩包内各文件的时间固定为 timestamp 后写出
+
+    openpyxl 保存时总是把文档修改时间设为当前时间，压缩包条目也带当前时间。
+    """
+    stamp = timestamp.strftime("%Y-%m-%dT%H:%M:%SZ")
+    date_time = max(timestamp, datetime(1980, 1, 1)).timetuple()[:6]
+    with zipfile.ZipFile(source) as src, \
+            zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename == "docProps/core.xml":
+                data = re.sub(rb"(<dcterms:modified[^>]*>)[^<]*(</dcterms:modified>)",
+                              rb"\g<1>" + stamp.encode("ascii") + rb"\g<2>", data)
+            entry = zipfile.ZipInfo(info.filename, date_time)
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            dst.writestr(entry, data)
+
+
+def _open_text(file_path: str, compress: Optional[bool],
+               encoding: str = "utf-8") -> IO[str]:
+    """打开文本输出文件
+
+    Args:
+        compress: 是否 gzip 压缩，为 None 时按 .gz 后缀判断
+    """
+    if compress is None:
+        compress = file_path.endswith(".gz")
+    if compress:
+        return gzip.open(file_path, "wt", encoding=encoding, newline="",
+                         compresslevel=6)
+    return open(file_path, "w", encoding=encoding, newline="")
+
+
+def _with_progress(items: Iterable, total: int,
+                   progress: Optional[ProgressCallback]) -> Iterator:
+    """遍历列表项，每隔 PROGRESS_INTERVAL 项报告一次进度"""
+    metrics.count("exporter.rows", total)
+    if progress is None:
+        yield from items
+        return
+    done = 0
+    for item in items:
+        yield item
+        done += 1
+        if done % PROGRESS_INTERVAL == 0:
+            progress(done, total)
+    progress(done, total)
+
+
+def _history_chunks(db: Storage, chunk_size: int,
+                    progress: Optional[ProgressCallback]) -> Iterator[List[Tuple]]:
+    """分块读取全部历史，每块报告一次进度"""
+    total = db.get_history_count() if progress is not None else 0
+    done = 0
+    if progress is not None:
+        progress(0, total)
+    for chunk in db.iter_history_rows(chunk_size):
+        metrics.count("exporter.rows", len(chunk))
+        yield chunk
+        if progress is not None:
+            done += len(chunk)
+            progress(done, total)
+
+
+def _bool_result(func):
+    """导出失败时返回 False 而不抛出异常
+
+    原始函数可通过 __wrapped__ 调用，以获得具体的异常信息（见 ExportJob）。
+    两种调用方式都计入 exporter.<方法名> 计时。
+    """
+    timer_name = f"exporter.{func.__name__}"
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        with metrics.timer(timer_name):
+            return func(*args, **kwargs)
+
+    @functools.wraps(timed)
+    def wrapper(*args, **kwargs) -> bool:
+        try:
+            timed(*args, **kwargs)
+            return True
+        except Exception:
+            return False
+    return wrapper
 
 
 class Exporter:
-    """导出器"""
+    """导出器
+
+    所有导出方法均返回是否成功；需要进度、取消或错误详情时，
+    通过 ExportJob 执行。
+    """
 
     @staticmethod
-    def export_to_txt(records: List[DrawRecord], file_path: str) -> bool:
+    @_bool_result
+    def export_to_txt(records: List[DrawRecord], file_path: str,
+                      progress: Optional[ProgressCallback] = None) -> bool:
         """导出为 TXT 文件
 
         Args:
             records: 抽题记录列表
             file_path: 导出文件路径
+            progress: 进度回调
 
         Returns:
             是否成功
         """
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write("随机抽题记录\n")
-                f.write(f"导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"共 {len(records)} 条记录\n")
-                f.write("=" * 50 + "\n\n")
-
-                for i, record in enumerate(records, 1):
-                    f.write(f"【{i}】{record.question_title}\n")
-                    if record.person_name:
-                        f.write(f"抽中人员: {record.person_name}\n")
-                    f.write(f"题库: {record.bank_name}\n")
-                    f.write(f"抽取时间: {record.draw_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    if record.question_content:
-                        f.write(f"题目要求:\n{record.question_content}\n")
-                    f.write("-" * 50 + "\n\n")
-
-            return True
-        except Exception:
-            return False
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("随机抽题记录\n")
+            f.write(f"导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"共 {len(records)} 条记录\n")
+            f.write("=" * 50 + "\n\n")
+
+            for i, record in enumerate(
+                    _with_progress(records, len(records), progress), 1):
+                f.write(f"【{i}】{record.question_title}\n")
+                if record.person_name:
+                    f.write(f"抽中人员: {record.person_name}\n")
+                f.write(f"题库: {record.bank_name}\n")
+                f.write(f"抽取时间: {record.draw_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                if record.question_content:
+                    f.write(f"题目要求:\n{record.question_content}\n")
+                f.write("-" * 50 + "\n\n")
 
     @staticmethod
-    def export_to_excel(records: List[DrawRecord], file_path: str) -> bool:
+    @_bool_result
+    def export_to_excel(records: List[DrawRecord], file_path: str,
+                        progress: Optional[ProgressCallback] = None) -> bool:
         """导出为 Excel 文件
 
         Args:
             records: 抽题记录列表
             file_path: 导出文件路径
+            progress: 进度回调
 
         Returns:
             是否成功
         """
-        try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, Alignment, Border, Side
-
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "抽题记录"
-
-            # 表头样式
-            header_font = Font(bold=True)
-            header_alignment = Alignment(horizontal="center", vertical="center")
-            thin_border = Border(
-                left=Side(style="thin"),
-                right=Side(style="thin"),
-                top=Side(style="thin"),
-                bottom=Side(style="thin")
-            )
-
-            # 写入表头
-            headers = ["序号", "人员", "题目标题", "题库", "抽取时间", "题目要求"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = header_font
-                cell.alignment = header_alignment
-                cell.border = thin_border
-
-            # 写入数据
-            for row, record in enumerate(records, 2):
-                ws.cell(row=row, column=1, value=row - 1).border = thin_border
-                ws.cell(row=row, column=2, value=record.person_name or "-").border = thin_border
-                ws.cell(row=row, column=3, value=record.question_title).border = thin_border
-                ws.cell(row=row, column=4, value=record.bank_name).border = thin_border
-                ws.cell(row=row, column=5,
-                        value=record.draw_time.strftime('%Y-%m-%d %H:%M:%S')).border = thin_border
-                ws.cell(row=row, column=6, value=record.question_content).border = thin_border
-
-            # 调整列宽
-            ws.column_dimensions["A"].width = 8
-            ws.column_dimensions["B"].width = 12
-            ws.column_dimensions["C"].width = 35
-            ws.column_dimensions["D"].width = 15
-            ws.column_dimensions["E"].width = 20
-            ws.column_dimensions["F"].width = 45
+        rows = ([i, r.person_name or "-", r.question_title, r.bank_name,
+                 r.draw_time.strftime(TIME_FORMAT), r.question_content]
+                for i, r in enumerate(
+                    _with_progress(records, len(records), progress), 1))
+        Exporter._write_excel_stream(
+            file_path, "抽题记录", HISTORY_EXCEL_COLUMNS, rows)
+
+    @staticmethod
+    @_bool_result
+    def export_history_to_excel(db: Storage, file_path: str,
+                                chunk_size: int = 10000,
+                                progress: Optional[ProgressCallback] = None) -> bool:
+        """流式导出全部抽题历史（含归档）为 Excel 文件
+
+        按块从存储读取记录并逐行写出，内存占用与历史总量无关。
+
+        Args:
+            db: 存储
+            file_path: 导出文件路径
+            chunk_size: 每次从存储读取的记录数
+            progress: 进度回调
 
+        Returns:
+            是否成功
+        """
+        def rows():
+            index = 0
+            for chunk in _history_chunks(db, chunk_size, progress):
+                for row in chunk:
+                    index += 1
+                    yield [index, row[6] or "-", row[2], row[4],
+                           ms_to_datetime(row[5]).strftime(TIME_FORMAT), row[3]]
+
+        Exporter._write_excel_stream(
+            file_path, "抽题记录", HISTORY_EXCEL_COLUMNS, rows())
+
+    @staticmethod
+    def _write_excel_stream(file_path: str, sheet_title: str,
+                            columns: List[Tuple[str, int]],
+                            rows: Iterable[List],
+                            timestamp: Optional[datetime] = None):
+        """以 write_only 模式流式写出 Excel 表格
+
+        表头和数据单元格使用共享的命名样式；每列复用同一个带样式的单元格，
+        逐行写出后即释放，不在内存中保留整张表。
+        每个工作表写满 EXCEL_MAX_DATA_ROWS 行数据后新建工作表
+        （"名称 (2)"、"名称 (3)" ...），并重复表头。
+
+        Args:
+            file_path: 导出文件路径
+            sheet_title: 工作表名称
+            columns: [(列名, 列宽)]
+            rows: 每行的值列表
+            timestamp: 固定的文档创建和修改时间；指定后相同内容总是得到
+                完全相同的文件（在内存中生成后再写出，适合小文件）
+        """
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Alignment, Border, Side, NamedStyle
+        from openpyxl.utils import get_column_letter
+
+        wb = Workbook(write_only=True)
+
+        thin_border = Border(
+            left=Side(style="thin"),
+            right=Side(style="thin"),
+            top=Side(style="thin"),
+            bottom=Side(style="thin")
+        )
+        header_style = NamedStyle(
+            name="export_header",
+            font=Font(bold=True),
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=thin_border
+        )
+        body_style = NamedStyle(name="export_body", border=thin_border)
+        wb.add_named_style(header_style)
+        wb.add_named_style(body_style)
+
+        def new_sheet(index: int):
+            """新建工作表并写入表头，返回 (工作表, 数据单元格)"""
+            title = sheet_title if index == 1 else f"{sheet_title} ({index})"
+            ws = wb.create_sheet(title)
+
+            # write_only 模式下列宽须在写入数据前设置
+            for col, (_, width) in enumerate(columns, 1):
+                ws.column_dimensions[get_column_letter(col)].width = width
+
+            header_cells = []
+            for header, _ in columns:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.style = "export_header"
+                header_cells.append(cell)
+            ws.append(header_cells)
+
+            # 每行写出后立即序列化，可复用同一组单元格
+            body_cells = []
+            for _ in columns:
+                cell = WriteOnlyCell(ws)
+                cell.style = "export_body"
+                body_cells.append(cell)
+            return ws, body_cells
+
+        sheet_index = 1
+        ws, body_cells = new_sheet(sheet_index)
+        sheet_rows = 0
+        for values in rows:
+            if sheet_rows == EXCEL_MAX_DATA_ROWS:
+                sheet_index += 1
+                ws, body_cells = new_sheet(sheet_index)
+                sheet_rows = 0
+            for cell, value in zip(body_cells, values):
+                cell.value = value
+            ws.append(body_cells)
+            sheet_rows += 1
+
+        if timestamp is None:
             wb.save(file_path)
+        else:
+            wb.properties.created = timestamp
+            buffer = io.BytesIO()
+            wb.save(buffer)
+            _pin_xlsx_timestamps(buffer, file_path, timestamp)
+
+    @staticmethod
+    @_bool_result
+    def export_history_to_csv(db: Storage, file_path: str,
+                              compress: Optional[bool] = None,
+                              chunk_size: int = 10000,
+                              progress: Optional[ProgressCallback] = None) -> bool:
+        """流式导出全部抽题历史（含归档）为 CSV 文件
+
+        Args:
+            db: 存储
+            file_path: 导出文件路径
+            compress: 是否 gzip 压缩，为 None 时按 .gz 后缀判断
+            chunk_size: 每次从存储读取的记录数
+            progress: 进度回调
+
+        Returns:
+            是否成功
+        """
+        # 带 BOM 以便 Excel 正确识别中文
+        with _open_text(file_path, compress, "utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(DATA_FIELDS)
+            for chunk in _history_chunks(db, chunk_size, progress):
+                writer.writerows(map(data_row, chunk))
+
+    @staticmethod
+    @_bool_result
+    def export_history_to_jsonl(db: Storage, file_path: str,
+                                compress: Optional[bool] = None,
+                                chunk_size: int = 10000,
+                                progress: Optional[ProgressCallback] = None) -> bool:
+        """流式导出全部抽题历史（含归档）为 JSON Lines 文件
+
+        每行一个 JSON 对象，字段见 DATA_FIELDS。
+
+        Args:
+            db: 存储
+            file_path: 导出文件路径
+            compress: 是否 gzip 压缩，为 None 时按 .gz 后缀判断
+            chunk_size: 每次从存储读取的记录数
+            progress: 进度回调
+
+        Returns:
+            是否成功
+        """
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        with _open_text(file_path, compress) as f:
+            for chunk in _history_chunks(db, chunk_size, progress):
+                f.write("".join(
+                    encode(dict(zip(DATA_FIELDS, data_row(row)))) + "\n"
+                    for row in chunk))
+
+    @staticmethod
+    def arrow_available() -> bool:
+        """是否可以导出 Arrow 格式（需要安装 pyarrow）"""
+        try:
+            import pyarrow  # noqa: F401
             return True
-        except Exception:
+        except ImportError:
             return False
 
     @staticmethod
-    def export_results_to_txt(results: List["DrawResult"], file_path: str) -> bool:
+    @_bool_result
+    def export_history_to_arrow(db: Storage, file_path: str,
+                                chunk_size: int = 65536,
+                                progress: Optional[ProgressCallback] = None) -> bool:
+        """流式导出全部抽题历史（含归档）为 Arrow IPC 文件
+
+        列式二进制格式，供数据分析使用；每块记录写为一个 RecordBatch。
+        需要安装 pyarrow。
+
+        Args:
+            db: 存储
+            file_path: 导出文件路径（通常为 .arrow）
+            chunk_size: 每个 RecordBatch 的记录数
+            progress: 进度回调
+
+        Returns:
+            是否成功
+        """
+        import pyarrow as pa
+
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("question_id", pa.string()),
+            ("question_title", pa.string()),
+            ("question_content", pa.string()),
+            ("bank_name", pa.string()),
+            ("person_name", pa.string()),
+            ("draw_time", pa.timestamp("ms")),
+        ])
+        with pa.OSFile(file_path, "wb") as sink:
+            with pa.ipc.new_file(sink, schema) as writer:
+                for chunk in _history_chunks(db, chunk_size, progress):
+                    columns = list(zip(*chunk))
+                    writer.write_batch(pa.record_batch([
+                        pa.array(columns[0], pa.int64()),
+                        pa.array(columns[1], pa.string()),
+                        pa.array(columns[2], pa.string()),
+                        pa.array(columns[3], pa.string()),
+                        pa.array(columns[4], pa.string()),
+                        pa.array(columns[6], pa.string()),
+                        pa.array(columns[5], pa.timestamp("ms")),
+                    ], schema=schema))
+
+    @staticmethod
+    @_bool_result
+    def export_results_to_txt(results: List["DrawResult"], file_path: str,
+                              progress: Optional[ProgressCallback] = None) -> bool:
         """导出当前抽题结果为 TXT 文件
 
         Args:
             results: 抽题结果列表 (DrawResult)
             file_path: 导出文件路径
+            progress: 进度回调
 
         Returns:
             是否成功
         """
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write("随机抽题结果\n")
-                f.write(f"导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"共 {len(results)} 条记录\n")
-                f.write("=" * 50 + "\n\n")
-
-                for i, result in enumerate(results, 1):
-                    f.write(f"【{i}】{result.question_title}\n")
-                    if result.person_name:
-                        f.write(f"抽中人员: {result.person_name}\n")
-                    f.write(f"题库: {result.bank_name}\n")
-                    if result.question_content:
-                        f.write(f"题目要求:\n{result.question_content}\n")
-                    f.write("-" * 50 + "\n\n")
-
-            return True
-        except Exception:
-            return False
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("随机抽题结果\n")
+            f.write(f"导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"共 {len(results)} 条记录\n")
+            f.write("=" * 50 + "\n\n")
+
+            for i, result in enumerate(
+                    _with_progress(results, len(results), progress), 1):
+                f.write(f"【{i}】{result.question_title}\n")
+                if result.person_name:
+                    f.write(f"抽中人员: {result.person_name}\n")
+                f.write(f"题库: {result.bank_name}\n")
+                if result.question_content:
+                    f.write(f"题目要求:\n{result.question_content}\n")
+                f.write("-" * 50 + "\n\n")
 
     @staticmethod
-    def export_results_to_excel(results: List["DrawResult"], file_path: str) -> bool:
+    @_bool_result
+    def export_results_to_excel(results: List["DrawResult"], file_path: str,
+                                progress: Optional[ProgressCallback] = None) -> bool:
         """导出当前抽题结果为 Excel 文件
 
         Args:
             results: 抽题结果列表 (DrawResult)
             file_path: 导出文件路径
+            progress: 进度回调
 
         Returns:
             是否成功
         """
-        try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, Alignment, Border, Side
-
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "抽题结果"
-
-            # 表头样式
-            header_font = Font(bold=True)
-            header_alignment = Alignment(horizontal="center", vertical="center")
-            thin_border = Border(
-                left=Side(style="thin"),
-                right=Side(style="thin"),
-                top=Side(style="thin"),
-                bottom=Side(style="thin")
-            )
-
-            # 写入表头
-            headers = ["序号", "人员", "题目标题", "题库", "题目要求"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = header_font
-                cell.alignment = header_alignment
-                cell.border = thin_border
-
-            # 写入数据
-            for row, result in enumerate(results, 2):
-                ws.cell(row=row, column=1, value=row - 1).border = thin_border
-                ws.cell(row=row, column=2, value=result.person_name or "-").border = thin_border
-                ws.cell(row=row, column=3, value=result.question_title).border = thin_border
-                ws.cell(row=row, column=4, value=result.bank_name).border = thin_border
-                ws.cell(row=row, column=5, value=result.question_content).border = thin_border
-
-            # 调整列宽
-            ws.column_dimensions["A"].width = 8
-            ws.column_dimensions["B"].width = 12
-            ws.column_dimensions["C"].width = 35
-            ws.column_dimensions["D"].width = 15
-            ws.column_dimensions["E"].width = 45
-
-            wb.save(file_path)
-            return True
-        except Exception:
-            return False
+        rows = ([i, r.person_name or "-", r.question_title, r.bank_name,
+                 r.question_content]
+                for i, r in enumerate(
+                    _with_progress(results, len(results), progress), 1))
+        Exporter._write_excel_stream(
+            file_path, "抽题结果", RESULT_EXCEL_COLUMNS, rows)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+按人员批量导出讲义
+"""
+
+import html
+import json
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+from string import Template
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .exporter import Exporter, ProgressCallback, RESULT_EXCEL_COLUMNS, TIME_FORMAT
+
+# 讲义中的一道题（字段与 DrawResult 同名，可直接交给 Exporter 使用）
+HandoutItem = namedtuple("HandoutItem",
+                         ["question_title", "question_content", "bank_name",
+                          "person_name"])
+
+# 支持的讲义格式: 扩展名
+HANDOUT_FORMATS = {"txt": ".txt", "xlsx": ".xlsx", "html": ".html"}
+
+MANIFEST_FILE = "manifest.json"
+
+# 每个进程任务包含的人数，减少进程间通信次数
+TASK_SIZE = 64
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<title>$name</title>
+<style>
+body { font-family: sans-serif; margin: 2em; }
+h1 { font-size: 22px; }
+.question { border-bottom: 1px solid #ddd; padding: 12px 0; }
+.title { font-weight: bold; font-size: 16px; }
+.bank { color: #888; font-size: 12px; }
+.content { white-space: pre-wrap; margin-top: 6px; }
+</style>
+</head>
+<body>
+<h1>$name</h1>
+<p class="bank">生成时间: $generated_at | 共 $count 道题</p>
+$questions
+</body>
+</html>
+"""
+
+_HTML_QUESTION = """<div class="question">
+<div class="title">$index. $title</div>
+<div class="bank">题库: $bank</div>
+<div class="content">$content</div>
+</div>"""
+
+_UNSAFE_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+@lru_cache(maxsize=None)
+def _html_templates() -> Tuple[Template, Template]:
+    """解析后的 HTML 模板（每个进程只解析一次）"""
+    return Template(_HTML_TEMPLATE), Template(_HTML_QUESTION)
+
+
+def safe_file_name(name: str) -> str:
+    """将人员名字转换为可用的文件名"""
+    name = _UNSAFE_CHARS.sub("_", name).strip(" .")
+    return name[:80] or "_"
+
+
+def _write_txt(path: str, name: str, items: List[HandoutItem], generated_at: str):
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(f"{name}\n")
+        f.write(f"生成时间: {generated_at}\n")
+        f.write(f"共 {len(items)} 道题\n")
+        f.write("=" * 50 + "\n\n")
+        for i, item in enumerate(items, 1):
+            f.write(f"【{i}】{item.question_title}\n")
+            f.write(f"题库: {item.bank_name}\n")
+            if item.question_content:
+                f.write(f"题目要求:\n{item.question_content}\n")
+            f.write("-" * 50 + "\n\n")
+
+
+def _write_html(path: str, name: str, items: List[HandoutItem], generated_at: str):
+    page, question = _html_templates()
+    questions = "\n".join(
+        question.substitute(index=i, title=html.escape(item.question_title),
+                            bank=html.escape(item.bank_name),
+                            content=html.escape(item.question_content or "（无详细要求）"))
+        for i, item in enumerate(items, 1))
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(page.substitute(name=html.escape(name), generated_at=generated_at,
+                                count=len(items), questions=questions))
+
+
+def _write_xlsx(path: str, name: str, items: List[HandoutItem], generated_at: str):
+    rows = ([i, item.person_name, item.question_title, item.bank_name,
+             item.question_content] for i, item in enumerate(items, 1))
+    # 文档时间固定为生成时间，相同输入得到完全相同的文件
+    try:
+        timestamp = datetime.strptime(generated_at, TIME_FORMAT)
+    except ValueError:
+        timestamp = None
+    Exporter._write_excel_stream(path, "讲义", RESULT_EXCEL_COLUMNS, rows, timestamp)
+
+
+_WRITERS = {"txt": _write_txt, "xlsx": _write_xlsx, "html": _write_html}
+
+
+def _write_handouts(fmt: str, output_dir: str, generated_at: str,
+                    tasks: List[Tuple[str, str, List[HandoutItem]]]) -> List[Tuple[str, int]]:
+    """写出一组讲义（在工作进程中执行）
+
+    Returns:
+        [(文件名, 文件大小)]
+    """
+    writer = _WRITERS[fmt]
+    written = []
+    for file_name, name, items in tasks:
+        path = os.path.join(output_dir, file_name)
+        writer(path, name, items, generated_at)
+        written.append((file_name, os.path.getsize(path)))
+    return written
+
+
+class HandoutExporter:
+    """讲义批量导出器
+
+    按人员分组抽题结果，每人写出一个文件，并生成 manifest.json 清单。
+    文件名为 "序号_名字.扩展名"，序号按人员首次出现的顺序编号，
+    相同输入总是得到相同的文件名和内容。人数较多时使用进程池并行写出。
+    """
+
+    @staticmethod
+    def group_by_person(results: Iterable) -> List[Tuple[str, List[HandoutItem]]]:
+        """按人员分组（保持人员首次出现的顺序，跳过未分配人员的结果）
+
+        按人员唯一标识（person_id）分组，同名的不同人员各得一份讲义；
+        没有 person_id 的结果（如 HandoutItem）按名字分组。
+
+        Args:
+            results: DrawResult 或具有相同字段的对象
+
+        Returns:
+            [(人员名字, 题目列表)]
+        """
+        groups: Dict[str, Tuple[str, List[HandoutItem]]] = {}
+        for r in results:
+            if not r.person_name:
+                continue
+            key = getattr(r, "person_id", "") or r.person_name
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = (r.person_name, [])
+            group[1].append(HandoutItem(
+                r.question_title, r.question_content or "", r.bank_name,
+                r.person_name))
+        return list(groups.values())
+
+    @staticmethod
+    def export(results: Iterable, output_dir: str, fmt: str = "html",
+               workers: Optional[int] = None,
+               generated_at: Optional[str] = None,
+               progress: Optional[ProgressCallback] = None) -> Dict:
+        """为每个人员导出一份讲义
+
+        Args:
+            results: 抽题结果列表 (DrawResult)
+            output_dir: 输出目录（不存在时创建）
+            fmt: 格式，txt / xlsx / html
+            workers: 进程数，为 None 时使用 CPU 核数，小于等于 1 时在当前进程写出
+            generated_at: 讲义中的生成时间，默认为当前时间；固定后输出可完全复现
+            progress: 进度回调 (已完成人数, 总人数)
+
+        Returns:
+            清单内容（同时写入 output_dir/manifest.json）
+        """
+        if fmt not in HANDOUT_FORMATS:
+            raise ValueError(f"不支持的讲义格式: {fmt}")
+        if generated_at is None:
+            generated_at = datetime.now().strftime(TIME_FORMAT)
+
+        groups = HandoutExporter.group_by_person(results)
+        width = max(4, len(str(len(groups))))
+        suffix = HANDOUT_FORMATS[fmt]
+        tasks = [(f"{i:0{width}d}_{safe_file_name(name)}{suffix}", name, items)
+                 for i, (name, items) in enumerate(groups, 1)]
+        chunks = [tasks[i:i + TASK_SIZE] for i in range(0, len(tasks), TASK_SIZE)]
+
+        os.makedirs(output_dir, exist_ok=True)
+        total = len(tasks)
+        sizes: Dict[str, int] = {}
+        if progress:
+            progress(0, total)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                sizes.update(_write_handouts(fmt, output_dir, generated_at, chunk))
+                if progress:
+                    progress(len(sizes), total)
+        else:
+            executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)))
+            try:
+                futures = [executor.submit(_write_handouts, fmt, output_dir,
+                                           generated_at, chunk)
+                           for chunk in chunks]
+                for future in as_completed(futures):
+                    sizes.update(future.result())
+                    if progress:
+                        progress(len(sizes), total)
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        manifest = {
+            "format": fmt,
+            "generated_at": generated_at,
+            "person_count": total,
+            "question_count": sum(len(items) for _, items in groups),
+            "files": [
+                {"file": file_name, "person_name": name,
+                 "question_count": len(items), "size": sizes[file_name]}
+                for file_name, name, items in tasks
+            ],
+        }
+        with open(os.path.join(output_dir, MANIFEST_FILE), "w",
+                  encoding="utf-8", newline="\n") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return manifest
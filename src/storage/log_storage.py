@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+追加写日志存储
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.core import metrics
+from .memory import MemoryStorage
+
+# 压缩快照中每条历史操作记录包含的行数
+SNAPSHOT_CHUNK = 10000
+
+# 打开时日志记录数超过快照记录数的 2 倍加此值时自动压缩
+COMPACT_MIN_RECORDS = 1000
+
+
+class LogStorage(MemoryStorage):
+    """追加写日志存储
+
+    数据保存在内存中（见 MemoryStorage），每次修改的操作记录以一行 JSON
+    追加到日志文件，打开时按顺序重放恢复。
+
+    写入采用组提交：修改先应用到内存并排入待写队列，调用方等待其记录落盘后返回。
+    同一时刻只有一个线程（领头者）执行写入和 fsync，它一次写出队列中的全部记录，
+    其间到达的写入在下一次提交中合并，并发写入越多每条记录分摊的 fsync 越少。
+
+    写入或 fsync 失败时内存中已有未落盘的修改，此后存储进入失败状态，
+    读写都抛出 RuntimeError，需重新打开（按日志重放）恢复到已落盘的状态。
+
+    日志末尾不完整的一行（写入中途断电）在打开时被截掉。
+    日志中已被覆盖的记录（清空、替换）可由 compact 重写为快照。
+    """
+
+    def __init__(self, log_path: str, sync: bool = True, commit_delay: float = 0.0):
+        """打开日志存储
+
+        Args:
+            log_path: 日志文件路径，不存在时创建
+            sync: 每次提交后是否 fsync（关闭后断电可能丢失最近的提交）
+            commit_delay: 领头者提交前等待的时间（秒），用于合并更多并发写入
+        """
+        super().__init__()
+        self._log_path = log_path
+        self._sync = sync
+        self._commit_delay = commit_delay
+
+        # 待写入的日志行，由 _lock 保护，入队顺序与应用到内存的顺序一致
+        self._pending: List[str] = []
+        self._queued = 0        # 已入队的记录序号
+        self._durable = 0       # 已落盘的记录序号
+        self._committing = False
+        self._commit_cond = threading.Condition()
+        self.commits = 0
+        # 提交失败时的异常，设置后拒绝读写，由 _lock 保护
+        self._failed: Optional[OSError] = None
+
+        directory = os.path.dirname(os.path.abspath(log_path))
+        os.makedirs(directory, exist_ok=True)
+        replayed = self._replay()
+        self._file = open(log_path, "a", encoding="utf-8")
+        if replayed > 2 * len(self._snapshot()) + COMPACT_MIN_RECORDS:
+            self.compact()
+
+    # ========== 日志读写 ==========
+
+    @staticmethod
+    def _encode(record: Dict) -> str:
+        if record["op"] == "save_bitmap":
+            record = dict(record, bitmap=base64.b64encode(record["bitmap"]).decode("ascii"))
+        return json.dumps(record, ensure_ascii=False)
+
+    @staticmethod
+    def _decode(line: str) -> Dict:
+        record = json.loads(line)
+        if record["op"] == "save_bitmap":
+            record["bitmap"] = base64.b64decode(record["bitmap"])
+        return record
+
+    def _replay(self) -> int:
+        """重放日志，返回记录数；截掉末尾无法解析的部分"""
+        if not os.path.exists(self._log_path):
+            return 0
+        count = 0
+        valid_size = 0
+        with open(self._log_path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    record = self._decode(raw.decode("utf-8"))
+                except (ValueError, KeyError):
+                    break
+                self._apply(record)
+                valid_size += len(raw)
+                count += 1
+        if valid_size < os.path.getsize(self._log_path):
+            with open(self._log_path, "r+b") as f:
+                f.truncate(valid_size)
+        return count
+
+    def _check(self):
+        if self._failed is not None:
+            raise RuntimeError(f"日志写入失败，需重新打开: {self._log_path}") from self._failed
+
+    def _write(self, record: Dict):
+        """应用操作记录并等待其写入日志"""
+        line = self._encode(record)
+        with self._lock:
+            self._check()
+            result = self._apply(record)
+            self._pending.append(line)
+            self._queued += 1
+            seq = self._queued
+        self._wait_durable(seq)
+        return result
+
+    def _wait_durable(self, seq: int):
+        """等待序号 seq 的记录落盘，没有其他线程在提交时由本线程提交"""
+        while True:
+            with self._commit_cond:
+                while self._committing and self._durable < seq:
+                    self._commit_cond.wait()
+                if self._durable >= seq:
+                    return
+                # 之前的提交失败，本记录已应用到内存但不会再写入
+                self._check()
+                self._committing = True
+
+            durable = self._durable
+            try:
+                if self._commit_delay:
+                    time.sleep(self._commit_delay)
+                durable = self._commit()
+            finally:
+                with self._commit_cond:
+                    self._durable = durable
+                    self._committing = False
+                    self._commit_cond.notify_all()
+
+    def _commit(self) -> int:
+        """写出待写队列中的全部记录，返回已落盘的记录序号"""
+        with self._lock:
+            lines, self._pending = self._pending, []
+            target = self._queued
+        try:
+            with metrics.timer("log.commit"):
+                self._file.write("".join(line + "\n" for line in lines))
+                self._file.flush()
+                if self._sync:
+                    os.fsync(self._file.fileno())
+        except OSError as e:
+            # 内存中的修改无法撤销，标记失败，此后拒绝读写和压缩
+            with self._lock:
+                self._failed = e
+                self._pending = []
+            raise
+        self.commits += 1
+        metrics.count("log.commits")
+        metrics.count("log.records", len(lines))
+        return target
+
+    # ========== 压缩 ==========
+
+    def _snapshot(self) -> List[Dict]:
+        """当前状态对应的最少操作记录"""
+        with self._lock:
+            self._check()
+            first_id = self._history[0][0] if self._history else self._next_id
+            records: List[Dict] = [{"op": "next_id", "value": first_id}]
+            for start in range(0, len(self._history), SNAPSHOT_CHUNK):
+                chunk = self._history[start:start + SNAPSHOT_CHUNK]
+                records.append({"op": "history", "rows": [
+                    [*row[1:5], row[6], row[5]] for row in chunk]})
+            for info in self._banks.values():
+                records.append({"op": "register_bank", "name": info["name"],
+                                "file_path": info["file_path"],
+                                "question_count": info["question_count"],
+                                "import_time": info["import_time"]})
+            for bank_name, (count, bitmap, fingerprint) in self._bitmaps.items():
+                records.append({"op": "save_bitmap", "bank_name": bank_name,
+                                "question_count": count, "bitmap": bitmap,
+                                "fingerprint": fingerprint})
+            if self._roster:
+                records.append({"op": "register_roster", "name": self._roster["name"],
+                                "file_path": self._roster["file_path"],
+                                "person_count": self._roster["person_count"],
+                                "import_time": self._roster["import_time"]})
+            if self._drawn_persons:
+                records.append({"op": "add_persons", "names": sorted(self._drawn_persons)})
+            return records
+
+    def compact(self):
+        """把日志重写为当前状态的快照（先写临时文件再替换）"""
+        with self._commit_cond:
+            while self._committing:
+                self._commit_cond.wait()
+            self._committing = True
+        durable = None
+        try:
+            with self._lock:
+                tmp_path = f"{self._log_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for record in self._snapshot():
+                        f.write(self._encode(record) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._file.close()
+                os.replace(tmp_path, self._log_path)
+                self._file = open(self._log_path, "a", encoding="utf-8")
+                # 快照已包含待写队列中的修改
+                self._pending = []
+                durable = self._queued
+        finally:
+            with self._commit_cond:
+                if durable is not None:
+                    self._durable = durable
+                self._committing = False
+                self._commit_cond.notify_all()
+
+    def close(self):
+        """关闭日志文件"""
+        with self._commit_cond:
+            while self._committing:
+                self._commit_cond.wait()
+            self._file.close()
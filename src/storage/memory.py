@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+内存存储
+"""
+
+import bisect
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .backend import HISTORY_SORT_COLUMNS, HistoryRow, Storage, now_ms
+
+
+def _import_time() -> str:
+    """导入时间（与 SQLite CURRENT_TIMESTAMP 格式一致的 UTC 时间）"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class MemoryStorage(Storage):
+    """内存存储
+
+    全部数据保存在进程内存中，不读写磁盘，适合测试和基准测试。
+    不支持归档，抽取总次数即历史记录数。
+
+    每次修改先构造一条操作记录（字典），再由 _apply_<op> 方法应用到内存，
+    LogStorage 在此基础上把同样的操作记录追加写入日志文件，启动时重放。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # 历史记录行（按写入顺序，id 递增），列顺序见 Storage
+        self._history: List[Tuple] = []
+        self._next_id = 1
+        # 排序缓存: {排序列: (排序键列表, 行列表)}，按 (列值, id) 升序，写入后清空
+        self._sorted: Dict[str, Tuple[List[Tuple], List[Tuple]]] = {}
+        # 题库信息: {题库名称: 信息字典}，按导入顺序
+        self._banks: Dict[str, Dict] = {}
+        self._bitmaps: Dict[str, Tuple[int, bytes, str]] = {}
+        self._roster: Optional[Dict] = None
+        self._drawn_persons: Set[str] = set()
+        self._next_info_id = 1
+
+    # ========== 操作记录 ==========
+
+    def _check(self):
+        """读写前的检查（LogStorage 在日志写入失败后拒绝访问）"""
+
+    def _write(self, record: Dict):
+        """应用一条操作记录，返回应用结果"""
+        with self._lock:
+            self._check()
+            return self._apply(record)
+
+    def _apply(self, record: Dict):
+        return getattr(self, f"_apply_{record['op']}")(record)
+
+    def _apply_history(self, record: Dict) -> int:
+        # HistoryRow 中人员在时间之前，历史记录行中相反
+        first_id = self._next_id
+        self._history.extend((first_id + i, q_id, title, content, bank, ts, person)
+                             for i, (q_id, title, content, bank, person, ts)
+                             in enumerate(record["rows"]))
+        self._next_id = first_id + len(record["rows"])
+        self._sorted.clear()
+        return self._next_id - 1
+
+    def _apply_next_id(self, record: Dict):
+        self._next_id = max(self._next_id, record["value"])
+
+    def _apply_clear_history(self, record: Dict):
+        self._history = []
+        self._sorted.clear()
+
+    def _apply_register_bank(self, record: Dict):
+        name = record["name"]
+        self._banks.pop(name, None)
+        self._banks[name] = {"id": self._next_info_id, "name": name,
+                             "file_path": record["file_path"],
+                             "question_count": record["question_count"],
+                             "import_time": record["import_time"]}
+        self._next_info_id += 1
+        self._bitmaps.pop(name, None)
+
+    def _apply_forget_bank(self, record: Dict):
+        self._banks.pop(record["name"], None)
+        self._bitmaps.pop(record["name"], None)
+
+    def _apply_register_roster(self, record: Dict):
+        self._roster = {"id": self._next_info_id, "name": record["name"],
+                        "file_path": record["file_path"],
+                        "person_count": record["person_count"],
+                        "import_time": record["import_time"]}
+        self._next_info_id += 1
+        self._drawn_persons = set()
+
+    def _apply_forget_roster(self, record: Dict):
+        self._roster = None
+        self._drawn_persons = set()
+
+    def _apply_save_bitmap(self, record: Dict):
+        # 旧日志中的记录没有指纹，恢复时丢弃
+        self._bitmaps[record["bank_name"]] = (record["question_count"],
+                                              bytes(record["bitmap"]),
+                                              record.get("fingerprint", ""))
+
+    def _apply_clear_bitmap(self, record: Dict):
+        if record["bank_name"]:
+            self._bitmaps.pop(record["bank_name"], None)
+        else:
+            self._bitmaps.clear()
+
+    def _apply_add_persons(self, record: Dict):
+        self._drawn_persons.update(record["names"])
+
+    def _apply_clear_persons(self, record: Dict):
+        self._drawn_persons = set()
+
+    # ========== 抽题历史 ==========
+
+    def add_history(self, question_id: str, question_title: str,
+                    question_content: str, bank_name: str,
+                    person_name: str = "", draw_ts: Optional[int] = None) -> int:
+        """添加抽题记录，返回记录ID"""
+        if draw_ts is None:
+            draw_ts = now_ms()
+        return self._write({"op": "history", "rows": [
+            [question_id, question_title, question_content, bank_name,
+             person_name, draw_ts]]})
+
+    def add_history_batch(self, rows: Iterable[HistoryRow]) -> int:
+        ts = now_ms()
+        rows = [[*row[:5], row[5] if row[5] is not None else ts] for row in rows]
+        if rows:
+            self._write({"op": "history", "rows": rows})
+        return len(rows)
+
+    def _sorted_rows(self, sort_by: str) -> Tuple[List[Tuple], List[Tuple]]:
+        """按 (列值, id) 升序排列的历史记录及其排序键（缓存到下一次写入）"""
+        with self._lock:
+            self._check()
+            cached = self._sorted.get(sort_by)
+            if cached is None:
+                column = HISTORY_SORT_COLUMNS[sort_by]
+                # 按写入顺序已基本有序，排序接近线性
+                rows = sorted(self._history, key=lambda row: (row[column], row[0]))
+                cached = ([(row[column], row[0]) for row in rows], rows)
+                self._sorted[sort_by] = cached
+            return cached
+
+    def get_history_rows(self, limit: int = 100, offset: int = 0) -> List[Tuple]:
+        rows = self._sorted_rows("draw_time")[1]
+        end = max(0, len(rows) - offset)
+        start = 0 if limit < 0 else max(0, end - limit)
+        return rows[start:end][::-1]
+
+    def iter_history_rows(self, chunk_size: int = 10000) -> Iterator[List[Tuple]]:
+        # 缓存的列表写入后不再修改，遍历期间的写入不影响本次遍历
+        rows = self._sorted_rows("draw_time")[1]
+        for end in range(len(rows), 0, -chunk_size):
+            yield rows[max(0, end - chunk_size):end][::-1]
+
+    def get_history_count(self, include_archive: bool = True) -> int:
+        self._check()
+        return len(self._history)
+
+    def get_history_page(self, after: Optional[Tuple] = None, limit: int = 200,
+                         sort_by: str = "draw_time", descending: bool = True,
+                         keyword: str = "") -> Tuple[List[Tuple], Optional[Tuple]]:
+        if sort_by not in HISTORY_SORT_COLUMNS:
+            raise ValueError(f"不支持的排序列: {sort_by}")
+
+        keys, rows = self._sorted_rows(sort_by)
+        if descending:
+            start = len(rows) - 1 if after is None else bisect.bisect_left(
+                keys, (after[1], after[2])) - 1
+            indexes = range(start, -1, -1)
+        else:
+            start = 0 if after is None else bisect.bisect_right(keys, (after[1], after[2]))
+            indexes = range(start, len(rows))
+
+        keyword = keyword.lower()
+        page = []
+        for i in indexes:
+            row = rows[i]
+            if (not keyword or keyword in row[2].lower()
+                    or keyword in row[6].lower() or keyword in row[4].lower()):
+                page.append(row)
+                if len(page) == limit:
+                    last = page[-1]
+                    return page, ("main", last[HISTORY_SORT_COLUMNS[sort_by]], last[0])
+        return page, None
+
+    def get_total_draw_count(self) -> int:
+        self._check()
+        return len(self._history)
+
+    def clear_history(self):
+        self._write({"op": "clear_history"})
+
+    # ========== 会话状态 ==========
+
+    def get_session_state(self) -> Dict:
+        with self._lock:
+            self._check()
+            banks = [dict(info) for info in reversed(self._banks.values())]
+            return {"banks": banks, "bitmaps": dict(self._bitmaps),
+                    "roster": dict(self._roster) if self._roster else None,
+                    "drawn_persons": set(self._drawn_persons)}
+
+    def register_bank(self, name: str, file_path: str, question_count: int):
+        self._write({"op": "register_bank", "name": name, "file_path": file_path,
+                     "question_count": question_count, "import_time": _import_time()})
+
+    def forget_bank(self, name: str):
+        self._write({"op": "forget_bank", "name": name})
+
+    def register_roster(self, name: str, file_path: str, person_count: int):
+        self._write({"op": "register_roster", "name": name, "file_path": file_path,
+                     "person_count": person_count, "import_time": _import_time()})
+
+    def forget_roster(self):
+        self._write({"op": "forget_roster"})
+
+    def save_drawn_bitmap(self, bank_name: str, question_count: int, bitmap: bytes,
+                          fingerprint: str = ""):
+        self._write({"op": "save_bitmap", "bank_name": bank_name,
+                     "question_count": question_count, "bitmap": bytes(bitmap),
+                     "fingerprint": fingerprint})
+
+    def get_drawn_bitmaps(self) -> Dict[str, Tuple[int, bytes, str]]:
+        with self._lock:
+            self._check()
+            return dict(self._bitmaps)
+
+    def clear_drawn_bitmap(self, bank_name: Optional[str] = None):
+        self._write({"op": "clear_bitmap", "bank_name": bank_name})
+
+    def add_drawn_persons(self, person_names: Iterable[str]):
+        names = list(person_names)
+        if names:
+            self._write({"op": "add_persons", "names": names})
+
+    def get_drawn_person_names(self) -> Set[str]:
+        with self._lock:
+            self._check()
+            return set(self._drawn_persons)
+
+    def clear_drawn_persons(self):
+        self._write({"op": "clear_persons"})
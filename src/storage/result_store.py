@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+有上限的抽题结果存储
+"""
+
+import dataclasses
+import json
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict, deque
+from typing import Callable, Iterator, List, Optional
+
+# 内存中最多保留的结果数
+DEFAULT_MEMORY_CAP = 2000
+
+# 从溢出文件读回的结果缓存条数
+SPILL_CACHE_SIZE = 256
+
+
+class ResultStore:
+    """有上限的抽题结果存储
+
+    最近的 memory_cap 条结果保存在内存中，更早的结果按批写入
+    临时溢出文件（每条一行 JSON），内存中只保留每条的文件偏移量
+    （8 字节）。访问溢出的结果时按偏移量读回，并缓存最近读取的若干条。
+    结果按追加顺序编号，编号在溢出前后保持不变。
+
+    读写由锁保护，后台导出线程可以在界面继续追加结果时读取快照。
+    """
+
+    def __init__(self, factory: Callable, memory_cap: int = DEFAULT_MEMORY_CAP,
+                 spill_dir: Optional[str] = None):
+        """初始化结果存储
+
+        Args:
+            factory: 结果类型（dataclass），用于从溢出文件恢复对象
+            memory_cap: 内存中最多保留的结果数
+            spill_dir: 溢出文件目录，默认为系统临时目录
+        """
+        self._factory = factory
+        self._memory_cap = max(1, memory_cap)
+        # 每次溢出的条数，分批写入减少文件操作
+        self._spill_batch = max(1, self._memory_cap // 4)
+        self._spill_dir = spill_dir
+        self._lock = threading.RLock()
+
+        self._memory: deque = deque()
+        self._offsets = array("q")
+        self._spill_file = None
+        self._spill_size = 0
+        self._cache: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._offsets) + len(self._memory)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, index: int):
+        with self._lock:
+            total = len(self)
+            if index < 0:
+                index += total
+            if not 0 <= index < total:
+                raise IndexError("结果编号超出范围")
+
+            spilled = len(self._offsets)
+            if index >= spilled:
+                return self._memory[index - spilled]
+            return self._read_spilled(index)
+
+    def __iter__(self) -> Iterator:
+        return self.iter_range(0, len(self))
+
+    @property
+    def memory_cap(self) -> int:
+        return self._memory_cap
+
+    @property
+    def spilled_count(self) -> int:
+        """已溢出到文件的结果数"""
+        with self._lock:
+            return len(self._offsets)
+
+    def append(self, results: List):
+        """追加结果
+
+        Args:
+            results: 结果列表
+        """
+        with self._lock:
+            self._memory.extend(results)
+            if len(self._memory) > self._memory_cap:
+                excess = len(self._memory) - self._memory_cap
+                # 按批溢出，至少腾出 spill_batch 条空间
+                self._spill(min(len(self._memory),
+                                max(excess, self._spill_batch)))
+
+    def iter_range(self, start: int, stop: int) -> Iterator:
+        """按编号顺序迭代 [start, stop) 的结果
+
+        溢出部分顺序读取文件，不经过缓存。
+        """
+        index = start
+        while index < stop:
+            with self._lock:
+                spilled = len(self._offsets)
+                if index >= spilled:
+                    chunk = [self._memory[i - spilled]
+                             for i in range(index, min(stop, len(self)))]
+                else:
+                    chunk = self._read_spilled_range(index, min(stop, spilled))
+            if not chunk:
+                return
+            yield from chunk
+            index += len(chunk)
+
+    def snapshot(self) -> "ResultSnapshot":
+        """当前结果的只读快照（之后追加的结果不包含在内）"""
+        return ResultSnapshot(self, len(self))
+
+    def search(self, keyword: str, start: int = 0,
+               stop: Optional[int] = None) -> array:
+        """查找标题、内容、题库或人员中包含关键字的结果
+
+        Args:
+            keyword: 关键字（不区分大小写）
+            start: 起始编号
+            stop: 结束编号（不含），默认到末尾
+
+        Returns:
+            匹配结果的编号数组（升序）
+        """
+        keyword = keyword.casefold()
+        if stop is None:
+            stop = len(self)
+        matched = array("q")
+        for i, result in enumerate(self.iter_range(start, stop), start):
+            if (keyword in result.question_title.casefold()
+                    or keyword in (result.question_content or "").casefold()
+                    or keyword in result.bank_name.casefold()
+                    or keyword in (result.person_name or "").casefold()):
+                matched.append(i)
+        return matched
+
+    def clear(self):
+        """清空所有结果并删除溢出文件"""
+        with self._lock:
+            self._memory.clear()
+            self._offsets = array("q")
+            self._cache.clear()
+            self._close_spill_file()
+
+    # ========== 溢出文件 ==========
+
+    def _spill(self, count: int):
+        """把内存中最早的 count 条结果写入溢出文件"""
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(
+                prefix="results-", suffix=".jsonl", dir=self._spill_dir)
+            self._spill_size = 0
+
+        lines = []
+        for _ in range(count):
+            result = self._memory.popleft()
+            line = json.dumps(dataclasses.astuple(result), ensure_ascii=False)
+            lines.append(line.encode("utf-8") + b"\n")
+            self._offsets.append(self._spill_size)
+            self._spill_size += len(lines[-1])
+
+        self._spill_file.seek(0, 2)
+        self._spill_file.write(b"".join(lines))
+
+    def _read_spilled(self, index: int):
+        """读取一条溢出的结果（带缓存）"""
+        result = self._cache.get(index)
+        if result is not None:
+            self._cache.move_to_end(index)
+            return result
+
+        result = self._read_spilled_range(index, index + 1)[0]
+        self._cache[index] = result
+        if len(self._cache) > SPILL_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    def _read_spilled_range(self, start: int, stop: int, limit: int = 1000) -> List:
+        """顺序读取 [start, stop) 范围内最多 limit 条溢出的结果"""
+        stop = min(stop, start + limit)
+        begin = self._offsets[start]
+        end = self._offsets[stop] if stop < len(self._offsets) else self._spill_size
+
+        self._spill_file.seek(begin)
+        data = self._spill_file.read(end - begin)
+        return [self._factory(*json.loads(line))
+                for line in data.splitlines()]
+
+    def _close_spill_file(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+            self._spill_size = 0
+
+
+class ResultSnapshot:
+    """结果存储的只读快照，可在后台线程中迭代"""
+
+    def __init__(self, store: ResultStore, length: int):
+        self._store = store
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator:
+        return self._store.iter_range(0, self._length)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("结果编号超出范围")
+        return self._store[index]
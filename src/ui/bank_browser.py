@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+题库浏览对话框
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+    QTextEdit, QSplitter, QPushButton
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QTextDocument
+
+from src.core.bank import QuestionBank
+from .bank_model import QuestionListModel
+from .list_view import UniformListView
+from .markdown_cache import MarkdownCache
+
+
+class BankBrowserDialog(QDialog):
+    """题库浏览对话框
+
+    左侧列出题库中的全部题目（已抽取的题目显示为灰色），
+    选中题目后在右侧显示渲染后的题目内容。非模态，可与主窗口同时使用。
+    """
+
+    def __init__(self, bank: QuestionBank, bank_name: str, parent=None):
+        super().__init__(parent)
+        self._bank = bank
+        self._model = QuestionListModel(bank, bank_name, self)
+        self._init_ui()
+        self._update_info()
+
+    def _init_ui(self):
+        """初始化界面"""
+        self.setWindowTitle(f"浏览题库 - {self._model.bank_name()}")
+        self.setMinimumSize(800, 500)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+
+        layout = QVBoxLayout(self)
+
+        self._info_label = QLabel("")
+        layout.addWidget(self._info_label)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        # 题目列表（固定行高，视图只处理可见行）
+        self._list_view = UniformListView()
+        self._list_view.setModel(self._model)
+        self._list_view.selectionModel().currentChanged.connect(self._on_current_changed)
+        splitter.addWidget(self._list_view)
+
+        # 题目内容
+        self._content_text = QTextEdit()
+        self._content_text.setReadOnly(True)
+        content_font = self._content_text.font()
+        content_font.setPixelSize(14)
+        self._markdown_cache = MarkdownCache(content_font)
+        self._plain_document = QTextDocument(self)
+        self._plain_document.setDefaultFont(content_font)
+        self._content_text.setDocument(self._plain_document)
+        splitter.addWidget(self._content_text)
+
+        splitter.setStretchFactor(1, 1)
+        splitter.setSizes([320, 480])
+        layout.addWidget(splitter, 1)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        self._close_btn = QPushButton("关闭")
+        self._close_btn.clicked.connect(self.close)
+        btn_layout.addWidget(self._close_btn)
+        layout.addLayout(btn_layout)
+
+        self._model.modelReset.connect(self._update_info)
+        self._model.dataChanged.connect(self._update_info)
+
+    def _update_info(self):
+        """更新题目数量提示"""
+        bank_name = self._model.bank_name()
+        total = self._bank.get_question_count(bank_name)
+        available = self._bank.get_available_count(bank_name, True)
+        self._info_label.setText(f"题目数量: {total} | 剩余可抽: {available}")
+
+    def _on_current_changed(self, current, previous):
+        """选中题目变化时读取并显示题目内容"""
+        question = self._model.question(current.row())
+        if question is None:
+            self._content_text.setDocument(self._plain_document)
+            self._plain_document.clear()
+            return
+
+        state = "已抽取" if self._model.is_drawn(current.row()) else "可抽取"
+        header = f"## {question.title}\n\n*{state}*\n\n"
+        self._content_text.setDocument(self._markdown_cache.get(
+            question.id, header + (question.content or "（无详细要求）")))
+
+    def closeEvent(self, event):
+        self._model.detach()
+        super().closeEvent(event)
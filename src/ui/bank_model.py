@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+题目列表模型
+"""
+
+from typing import Optional
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QBrush, QColor
+
+from src.core.bank import QuestionBank
+from src.core.question import Question
+from src.core.events import BANK_ADDED, BANK_REMOVED, DRAWN_CHANGED
+
+
+class QuestionListModel(QAbstractListModel):
+    """题目列表模型
+
+    直接引用 QuestionBank 中的题目列表，不复制数据；
+    视图只为可见行请求标题和已抽状态，题目内容由调用方按需读取。
+    订阅题库变化：已抽状态变化时通知视图重绘，题库被替换或移除时重置。
+    """
+
+    DRAWN_BRUSH = QBrush(QColor("#9E9E9E"))
+
+    def __init__(self, bank: QuestionBank, bank_name: str = "", parent=None):
+        super().__init__(parent)
+        self._bank = bank
+        self._bank_name = bank_name
+        self._questions = bank.get_questions(bank_name) if bank_name else []
+        self._unsubscribe = bank.subscribe(self._on_bank_event)
+
+    # ========== Qt 模型接口 ==========
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._questions)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        question = self._questions[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{index.row() + 1}. {question.title}"
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if self._bank.is_drawn(question.id, self._bank_name):
+                return self.DRAWN_BRUSH
+            return None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return "已抽取" if self._bank.is_drawn(question.id, self._bank_name) else "可抽取"
+        return None
+
+    # ========== 公共接口 ==========
+
+    def bank_name(self) -> str:
+        return self._bank_name
+
+    def set_bank(self, bank_name: str):
+        """切换显示的题库"""
+        self.beginResetModel()
+        self._bank_name = bank_name
+        self._questions = self._bank.get_questions(bank_name) if bank_name else []
+        self.endResetModel()
+
+    def question(self, row: int) -> Optional[Question]:
+        """获取指定行的题目"""
+        if 0 <= row < len(self._questions):
+            return self._questions[row]
+        return None
+
+    def is_drawn(self, row: int) -> bool:
+        question = self.question(row)
+        return question is not None and self._bank.is_drawn(question.id, self._bank_name)
+
+    def detach(self):
+        """取消题库订阅（视图关闭时调用）"""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def _on_bank_event(self, event: str, bank_name: Optional[str]):
+        if event in (BANK_ADDED, BANK_REMOVED):
+            if bank_name == self._bank_name:
+                # 重新导入会替换题目列表，移除后列表为空
+                self.set_bank(bank_name)
+        elif event == DRAWN_CHANGED and self._questions:
+            if bank_name is None or bank_name == self._bank_name:
+                self.dataChanged.emit(self.index(0), self.index(len(self._questions) - 1),
+                                      [Qt.ItemDataRole.ForegroundRole,
+                                       Qt.ItemDataRole.ToolTipRole])
@@ -56,6 +56,11 @@ class BankPanel(QWidget):
         self._remove_btn.setEnabled(False)
         btn_layout.addWidget(self._remove_btn)
 
+        self._browse_btn = QPushButton("浏览题目")
+        self._browse_btn.clicked.connect(self._on_browse_clicked)
+        self._browse_btn.setEnabled(False)
+        btn_layout.addWidget(self._browse_btn)
+
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
 
@@ -66,11 +71,12 @@ class BankPanel(QWidget):
 
     def _on_import_clicked(self):
         """导入题库按钮点击"""
-        file_path, _ = QFileDialog.getOpenFileName(
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self, "选择题库文件", "",
             "Markdown 文件 (*.md);;所有文件 (*.*)"
         )
-        if file_path:
+        # 每个文件单独导入，多个文件在后台同时解析
+        for file_path in file_paths:
             self.import_requested.emit(file_path)
 
     def _on_remove_clicked(self):
@@ -84,17 +90,26 @@ class BankPanel(QWidget):
             if reply == QMessageBox.StandardButton.Yes:
                 self.remove_requested.emit(current)
 
+    def _on_browse_clicked(self):
+        """浏览题目按钮点击"""
+        current = self.get_current_bank()
+        if current:
+            self.browse_requested.emit(current)
+
     def _on_bank_changed(self, bank_name: str):
         """题库选择变化"""
         if bank_name and bank_name != "-- 请导入题库 --":
             self._remove_btn.setEnabled(True)
+            self._browse_btn.setEnabled(True)
             self.bank_changed.emit(bank_name)
         else:
             self._remove_btn.setEnabled(False)
+            self._browse_btn.setEnabled(False)
 
     # 信号
     import_requested = pyqtSignal(str)
     remove_requested = pyqtSignal(str)
+    browse_requested = pyqtSignal(str)
 
     def add_bank(self, name: str, count: int):
         """添加题库到下拉列表"""
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+后台导出运行器
+"""
+
+from PyQt6.QtWidgets import QWidget, QProgressDialog, QMessageBox
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+
+from src.storage.export_job import ExportJob, ExportResult
+
+
+class ExportSignals(QObject):
+    """导出工作线程信号"""
+    progress = pyqtSignal(int, int)     # (已导出行数, 总行数)
+    finished = pyqtSignal(object)       # ExportResult
+
+
+class ExportWorker(QRunnable):
+    """在线程池中执行导出任务"""
+
+    def __init__(self, job: ExportJob):
+        super().__init__()
+        self._job = job
+        self.signals = ExportSignals()
+
+    def run(self):
+        result = self._job.run(progress=self.signals.progress.emit)
+        self.signals.finished.emit(result)
+
+
+class ExportRunner(QObject):
+    """导出运行器
+
+    在后台线程执行导出任务，显示可取消的进度对话框，
+    完成后弹出结果提示。导出期间界面保持响应。
+    """
+
+    # 导出完成信号
+    finished = pyqtSignal(object)       # ExportResult
+
+    # 正在运行的导出，防止运行器在完成前被回收
+    _running = set()
+
+    def __init__(self, job: ExportJob, title: str, parent: QWidget):
+        super().__init__(parent)
+        self._job = job
+        self._parent = parent
+
+        self._dialog = QProgressDialog(f"正在导出...\n{job.file_path}", "取消",
+                                       0, 0, parent)
+        self._dialog.setWindowTitle(title)
+        self._dialog.setWindowModality(Qt.WindowModality.NonModal)
+        self._dialog.setMinimumDuration(300)
+        self._dialog.setAutoClose(False)
+        self._dialog.setAutoReset(False)
+        self._dialog.canceled.connect(self._job.cancel)
+
+        self._worker = ExportWorker(job)
+        self._worker.signals.progress.connect(self._on_progress)
+        self._worker.signals.finished.connect(self._on_finished)
+
+    def start(self):
+        """开始导出"""
+        ExportRunner._running.add(self)
+        QThreadPool.globalInstance().start(self._worker)
+
+    def _on_progress(self, done: int, total: int):
+        if total > 0:
+            self._dialog.setMaximum(total)
+            self._dialog.setValue(min(done, total))
+        self._dialog.setLabelText(f"正在导出... {done} 条\n{self._job.file_path}")
+
+    def _on_finished(self, result: ExportResult):
+        self._dialog.close()
+        ExportRunner._running.discard(self)
+
+        if result.success:
+            QMessageBox.information(self._parent, "成功", result.message)
+        elif not result.cancelled:
+            box = QMessageBox(QMessageBox.Icon.Warning, "失败", result.message,
+                              parent=self._parent)
+            box.setDetailedText(result.detail)
+            box.exec()
+        self.finished.emit(result)
+
+
+def run_export(job: ExportJob, title: str, parent: QWidget) -> ExportRunner:
+    """在后台执行导出任务
+
+    Args:
+        job: 导出任务
+        title: 进度对话框标题
+        parent: 父窗口
+
+    Returns:
+        导出运行器
+    """
+    runner = ExportRunner(job, title, parent)
+    runner.start()
+    return runner
@@ -5,25 +5,28 @@
 """
 
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QTableWidget, QTableWidgetItem,
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+    QPushButton, QTableView, QAbstractItemView,
     QHeaderView, QMessageBox, QFileDialog
 )
-from PyQt6.QtCore import Qt
-from typing import List
-from src.storage.database import Database, DrawRecord
+from PyQt6.QtCore import Qt, QTimer
+from src.storage.backend import Storage
 from src.storage.exporter import Exporter
+from src.storage.export_job import ExportJob
+from .export_runner import run_export
+from .history_model import HistoryTableModel
 
 
 class HistoryDialog(QDialog):
     """历史记录对话框"""
 
-    def __init__(self, db: Database, parent=None):
+    def __init__(self, db: Storage, parent=None):
         super().__init__(parent)
         self._db = db
-        self._records: List[DrawRecord] = []
+        self._model = HistoryTableModel(db, self)
+        self._total = db.get_total_draw_count()
+        # 第一页在表格开启排序时加载（见 _init_ui）
         self._init_ui()
-        self._load_history()
 
     def _init_ui(self):
         """初始化界面"""
@@ -32,18 +35,39 @@ class HistoryDialog(QDialog):
 
         layout = QVBoxLayout(self)
 
-        # 信息标签
+        # 信息标签和筛选框
+        top_layout = QHBoxLayout()
         self._info_label = QLabel("共 0 条记录")
-        layout.addWidget(self._info_label)
-
-        # 历史表格
-        self._table = QTableWidget()
-        self._table.setColumnCount(5)
-        self._table.setHorizontalHeaderLabels(["序号", "人员", "题目标题", "题库", "抽取时间"])
+        top_layout.addWidget(self._info_label)
+        top_layout.addStretch()
+
+        self._filter_edit = QLineEdit()
+        self._filter_edit.setPlaceholderText("按人员、题目或题库筛选")
+        self._filter_edit.setClearButtonEnabled(True)
+        self._filter_edit.setMaximumWidth(240)
+        top_layout.addWidget(self._filter_edit)
+        layout.addLayout(top_layout)
+
+        # 输入停顿后再查询，避免每个按键都访问数据库
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self._filter_edit.textChanged.connect(self._filter_timer.start)
+
+        # 历史表格（按需分页加载，点击表头排序）
+        self._table = QTableView()
+        self._table.setModel(self._model)
         self._table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        self._table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self._table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self._table.verticalHeader().setVisible(False)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self._table.doubleClicked.connect(self._on_item_double_clicked)
+        self._model.rowsInserted.connect(self._update_info)
+        self._model.modelReset.connect(self._update_info)
+        # 先设置排序指示再开启排序，开启时按该列排序一次（即加载第一页）
+        self._table.horizontalHeader().setSortIndicator(4, Qt.SortOrder.DescendingOrder)
+        self._table.setSortingEnabled(True)
 
         # 设置列宽
         self._table.setColumnWidth(0, 50)
@@ -64,6 +88,11 @@ class HistoryDialog(QDialog):
         self._export_excel_btn.clicked.connect(self._export_excel)
         btn_layout.addWidget(self._export_excel_btn)
 
+        self._export_data_btn = QPushButton("导出数据")
+        self._export_data_btn.setToolTip("导出全部历史为 CSV / JSONL / Arrow")
+        self._export_data_btn.clicked.connect(self._export_data)
+        btn_layout.addWidget(self._export_data_btn)
+
         btn_layout.addStretch()
 
         self._clear_btn = QPushButton("清空历史")
@@ -77,24 +106,27 @@ class HistoryDialog(QDialog):
         layout.addLayout(btn_layout)
 
     def _load_history(self):
-        """加载历史记录"""
-        self._records = self._db.get_history(limit=500)
-        self._info_label.setText(f"共 {len(self._records)} 条记录")
-
-        self._table.setRowCount(len(self._records))
-        for row, record in enumerate(self._records):
-            self._table.setItem(row, 0, QTableWidgetItem(str(row + 1)))
-            self._table.setItem(row, 1, QTableWidgetItem(record.person_name or "-"))
-            self._table.setItem(row, 2, QTableWidgetItem(record.question_title))
-            self._table.setItem(row, 3, QTableWidgetItem(record.bank_name))
-            self._table.setItem(row, 4, QTableWidgetItem(
-                record.draw_time.strftime("%Y-%m-%d %H:%M:%S")))
+        """加载历史记录（只读取第一页）"""
+        self._total = self._db.get_total_draw_count()
+        self._model.refresh()
+
+    def _apply_filter(self):
+        """应用筛选关键字"""
+        self._model.set_keyword(self._filter_edit.text())
+
+    def _update_info(self):
+        """更新记录数量提示"""
+        loaded = self._model.loaded_count()
+        if self._model.is_filtered():
+            more = "+" if self._model.canFetchMore() else ""
+            self._info_label.setText(f"共 {self._total} 条记录，筛选出 {loaded}{more} 条")
+        else:
+            self._info_label.setText(f"共 {self._total} 条记录，已加载 {loaded} 条")
 
     def _on_item_double_clicked(self, index):
         """双击查看详情"""
-        row = index.row()
-        if 0 <= row < len(self._records):
-            record = self._records[row]
+        record = self._model.record(index.row())
+        if record is not None:
             person_info = f"抽中人员: {record.person_name}\n" if record.person_name else ""
             QMessageBox.information(
                 self, "题目详情",
@@ -106,8 +138,8 @@ class HistoryDialog(QDialog):
             )
 
     def _export_txt(self):
-        """导出为 TXT"""
-        if not self._records:
+        """导出已加载的记录为 TXT"""
+        if not self._model.loaded_count():
             QMessageBox.warning(self, "提示", "没有记录可导出")
             return
 
@@ -116,14 +148,12 @@ class HistoryDialog(QDialog):
             "文本文件 (*.txt)"
         )
         if file_path:
-            if Exporter.export_to_txt(self._records, file_path):
-                QMessageBox.information(self, "成功", f"已导出到: {file_path}")
-            else:
-                QMessageBox.warning(self, "失败", "导出失败")
+            run_export(ExportJob(Exporter.export_to_txt, self._model.records(), file_path),
+                       "导出 TXT", self)
 
     def _export_excel(self):
-        """导出为 Excel"""
-        if not self._records:
+        """导出全部历史为 Excel"""
+        if not self._total:
             QMessageBox.warning(self, "提示", "没有记录可导出")
             return
 
@@ -132,10 +162,35 @@ class HistoryDialog(QDialog):
             "Excel 文件 (*.xlsx)"
         )
         if file_path:
-            if Exporter.export_to_excel(self._records, file_path):
-                QMessageBox.information(self, "成功", f"已导出到: {file_path}")
-            else:
-                QMessageBox.warning(self, "失败", "导出失败，请确保已安装 openpyxl")
+            run_export(ExportJob(Exporter.export_history_to_excel, self._db, file_path),
+                       "导出 Excel", self)
+
+    def _export_data(self):
+        """导出全部历史为数据文件"""
+        if not self._total:
+            QMessageBox.warning(self, "提示", "没有记录可导出")
+            return
+
+        # 文件类型: (扩展名, 导出函数)
+        formats = {
+            "CSV 文件 (*.csv)": (".csv", Exporter.export_history_to_csv),
+            "CSV 压缩文件 (*.csv.gz)": (".csv.gz", Exporter.export_history_to_csv),
+            "JSONL 文件 (*.jsonl)": (".jsonl", Exporter.export_history_to_jsonl),
+            "JSONL 压缩文件 (*.jsonl.gz)": (".jsonl.gz", Exporter.export_history_to_jsonl),
+        }
+        if Exporter.arrow_available():
+            formats["Arrow 文件 (*.arrow)"] = (".arrow", Exporter.export_history_to_arrow)
+
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "导出数据", "抽题记录", ";;".join(formats)
+        )
+        if not file_path:
+            return
+
+        suffix, export = formats.get(selected_filter, formats["CSV 文件 (*.csv)"])
+        if not file_path.endswith(suffix):
+            file_path += suffix
+        run_export(ExportJob(export, self._db, file_path), "导出数据", self)
 
     def _clear_history(self):
         """清空历史"""
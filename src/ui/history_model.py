@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+历史记录表格模型
+"""
+
+from typing import List, Optional, Tuple
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from src.storage.backend import DrawRecord, Storage, ms_to_datetime
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """历史记录表格模型
+
+    按需分页加载：视图滚动到底部时通过 canFetchMore/fetchMore
+    读取下一页，只保存已加载的行元组，不为每个单元格创建控件。
+    排序和筛选交给存储完成，打开耗时与历史总量无关。
+    """
+
+    # 列定义: (表头, 排序列)
+    COLUMNS = [
+        ("序号", "draw_time"),
+        ("人员", "person_name"),
+        ("题目标题", "question_title"),
+        ("题库", "bank_name"),
+        ("抽取时间", "draw_time"),
+    ]
+
+    PAGE_SIZE = 200
+
+    def __init__(self, db: Storage, parent=None):
+        super().__init__(parent)
+        self._db = db
+        self._rows: List[Tuple] = []
+        self._next_key: Optional[Tuple] = None
+        self._exhausted = False
+        self._sort_by = "draw_time"
+        self._descending = True
+        self._keyword = ""
+
+    # ========== Qt 模型接口 ==========
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (role == Qt.ItemDataRole.DisplayRole
+                and orientation == Qt.Orientation.Horizontal):
+            return self.COLUMNS[section][0]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        row = self._rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return str(index.row() + 1)
+        if column == 1:
+            return row[6] or "-"
+        if column == 2:
+            return row[2]
+        if column == 3:
+            return row[4]
+        return ms_to_datetime(row[5]).strftime("%Y-%m-%d %H:%M:%S")
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+
+        rows, self._next_key = self._db.get_history_page(
+            self._next_key, self.PAGE_SIZE, self._sort_by,
+            self._descending, self._keyword)
+        self._exhausted = self._next_key is None
+
+        if rows:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        self._sort_by = self.COLUMNS[column][1]
+        self._descending = order == Qt.SortOrder.DescendingOrder
+        self.refresh()
+
+    # ========== 公共接口 ==========
+
+    def set_keyword(self, keyword: str):
+        """设置筛选关键字"""
+        keyword = keyword.strip()
+        if keyword != self._keyword:
+            self._keyword = keyword
+            self.refresh()
+
+    def refresh(self):
+        """清空已加载的行，从第一页重新加载"""
+        self.beginResetModel()
+        self._rows = []
+        self._next_key = None
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def record(self, row: int) -> Optional[DrawRecord]:
+        """获取指定行的记录"""
+        if 0 <= row < len(self._rows):
+            return DrawRecord(*self._rows[row])
+        return None
+
+    def records(self) -> List[DrawRecord]:
+        """获取已加载的全部记录"""
+        return [DrawRecord(*row) for row in self._rows]
+
+    def loaded_count(self) -> int:
+        """已加载的行数"""
+        return len(self._rows)
+
+    def is_filtered(self) -> bool:
+        """是否正在筛选"""
+        return bool(self._keyword)
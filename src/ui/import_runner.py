@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+后台导入运行器
+"""
+
+from typing import Callable
+
+from PyQt6.QtWidgets import QWidget, QProgressDialog
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+
+from src.core.import_job import ImportJob, ImportResult
+
+# 同时运行的导入数上限
+MAX_IMPORT_THREADS = 4
+
+
+class ImportSignals(QObject):
+    """导入工作线程信号"""
+    progress = pyqtSignal(int, int)     # (已解析块数, 总块数)
+    finished = pyqtSignal(object)       # ImportResult
+
+
+class ImportWorker(QRunnable):
+    """在线程池中执行导入任务"""
+
+    def __init__(self, job: ImportJob):
+        super().__init__()
+        self._job = job
+        self.signals = ImportSignals()
+
+    def run(self):
+        result = self._job.run(progress=self.signals.progress.emit)
+        self.signals.finished.emit(result)
+
+
+class ImportRunner(QObject):
+    """导入运行器
+
+    在独立线程池中解析文件，显示可取消的进度对话框（短时间完成的导入不显示），
+    完成后发出 finished 信号，由主线程登记解析结果。
+    多个导入可以同时运行，导入期间界面和抽题保持可用。
+    """
+
+    # 导入完成信号
+    finished = pyqtSignal(object)       # ImportResult
+
+    # 正在运行的导入，防止运行器在完成前被回收
+    _running = set()
+    _pool = None
+
+    def __init__(self, job: ImportJob, parent: QWidget):
+        super().__init__(parent)
+        self._job = job
+
+        title = "导入题库" if job.kind == ImportJob.BANK else "导入名单"
+        self._dialog = QProgressDialog(f"正在解析...\n{job.file_path}", "取消",
+                                       0, 0, parent)
+        self._dialog.setWindowTitle(title)
+        self._dialog.setWindowModality(Qt.WindowModality.NonModal)
+        self._dialog.setMinimumDuration(500)
+        self._dialog.setAutoClose(False)
+        self._dialog.setAutoReset(False)
+        self._dialog.canceled.connect(self._job.cancel)
+
+        self._worker = ImportWorker(job)
+        self._worker.signals.progress.connect(self._on_progress)
+        self._worker.signals.finished.connect(self._on_finished)
+
+    @classmethod
+    def thread_pool(cls) -> QThreadPool:
+        """导入专用线程池（与导出共用的全局线程池分开，互不排队）"""
+        if cls._pool is None:
+            cls._pool = QThreadPool()
+            cls._pool.setMaxThreadCount(MAX_IMPORT_THREADS)
+        return cls._pool
+
+    def start(self):
+        """开始导入"""
+        ImportRunner._running.add(self)
+        self.thread_pool().start(self._worker)
+
+    def _on_progress(self, done: int, total: int):
+        if total > 0:
+            self._dialog.setMaximum(total)
+            self._dialog.setValue(min(done, total))
+        self._dialog.setLabelText(f"正在解析... {done}/{total}\n{self._job.file_path}")
+
+    def _on_finished(self, result: ImportResult):
+        self._dialog.close()
+        ImportRunner._running.discard(self)
+        self.finished.emit(result)
+
+
+def run_import(job: ImportJob, parent: QWidget,
+               on_finished: Callable[[ImportResult], None]) -> ImportRunner:
+    """在后台执行导入任务
+
+    Args:
+        job: 导入任务
+        parent: 父窗口
+        on_finished: 完成回调（在主线程中调用）
+
+    Returns:
+        导入运行器
+    """
+    runner = ImportRunner(job, parent)
+    runner.finished.connect(on_finished)
+    runner.start()
+    return runner
@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+大列表视图
+"""
+
+from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+
+
+class UniformListView(QTableView):
+    """固定行高的单列列表视图
+
+    QListView 每次布局都会逐行遍历模型（百万行时每次需要数秒），
+    表格视图的行位置由表头按固定行高直接计算，布局和滚动与行数无关。
+    隐藏表头和网格线后外观与列表一致。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.horizontalHeader().setVisible(False)
+        self.horizontalHeader().setStretchLastSection(True)
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 6)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
@@ -4,47 +4,132 @@
 随机抽题机 - 主窗口
 """
 
+import os
+import threading
+from typing import Dict, List, Optional, Set
+
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QMessageBox, QCheckBox, QFileDialog, QLabel
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont, QKeySequence, QShortcut
 
+from src.core import metrics
 from src.core.bank import QuestionBank
 from src.core.drawer import DrawEngine
+from src.core.import_job import ImportJob, ImportResult
 from src.core.roster import RosterManager
-from src.storage.database import Database
-from src.storage.exporter import Exporter
+from src.storage.backend import Storage, now_ms, open_storage
 
 from .bank_panel import BankPanel
 from .draw_panel import DrawPanel
 from .result_panel import ResultPanel, DrawResult
 from .roster_panel import RosterPanel
-from .history_dialog import HistoryDialog
+from .import_runner import run_import
+
+# 导出、历史记录和题库浏览只在用户操作时才用到，相关模块在首次使用时导入，
+# 不计入启动时间（讲义导出会加载 multiprocessing，Excel 导出会加载 openpyxl）
+
+# 启动时主库保留的历史月份数（含当前月），更早的记录移入归档
+ARCHIVE_KEEP_MONTHS = 3
 
 
 class MainWindow(QMainWindow):
     """主窗口"""
 
-    def __init__(self):
+    # 后台归档完成信号: 归档的记录数或异常（从归档线程发出，在主线程处理）
+    _archive_finished = pyqtSignal(object)
+
+    def __init__(self, db_path: Optional[str] = None, storage: Optional[str] = None,
+                 archive_months: int = ARCHIVE_KEEP_MONTHS):
+        """初始化主窗口
+
+        Args:
+            db_path: SQLite 数据库文件路径，默认为程序目录下的 data/history.db
+            storage: 存储位置（见 src.storage.backend.open_storage），
+                指定时忽略 db_path；都未指定时读取环境变量 RQG_STORAGE
+            archive_months: 启动时主库保留的历史月份数，更早的记录移入归档；
+                为 0 时不归档
+        """
         super().__init__()
         self.setWindowTitle("随机抽题机")
         self.setMinimumSize(900, 650)
 
-        # 初始化核心组件
+        # 初始化核心组件（存储在首次使用时打开）
         self._bank = QuestionBank()
         self._drawer = DrawEngine(self._bank)
         self._roster = RosterManager()
-        self._db = Database()
+        self._storage_spec = storage if storage is not None else db_path
+        self._database: Optional[Storage] = None
+        self._session_started = False
+        self._archive_months = archive_months
+        self._metrics_dialog = None
+
+        # 状态刷新合并到下一次事件循环，批量变化只刷新一次
+        self._bank_dirty = False
+        self._roster_dirty = False
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self._refresh_status)
 
         self._init_ui()
         self._connect_signals()
-        # 每次启动时清除之前导入的题库和名单
-        self._db.clear_all_bank_info()
-        self._db.clear_roster_info()
-        self._db.clear_drawn_questions()
-        self._db.clear_drawn_persons()
+
+    @property
+    def _db(self) -> Storage:
+        """存储（首次访问时打开）"""
+        if self._database is None:
+            self._database = open_storage(self._storage_spec)
+        return self._database
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # 窗口第一次绘制后再打开存储、恢复会话，不阻塞首次显示
+        if not self._session_started:
+            QTimer.singleShot(0, self.start_session)
+
+    def start_session(self):
+        """打开存储并恢复上次会话的题库、名单及已抽状态
+
+        窗口首次绘制后自动调用；不显示窗口时（如测试）可直接调用。
+        题库和名单在后台线程解析，解析完成后再登记。重复调用无效。
+        """
+        if self._session_started:
+            return
+        self._session_started = True
+        state = self._db.get_session_state()
+        self._restore_banks(state["banks"], state["bitmaps"])
+        self._restore_roster(state["roster"], state["drawn_persons"])
+        self._start_archive()
+
+    def _start_archive(self):
+        """在后台线程中将较早月份的历史移入归档，主库只保留近期记录
+
+        没有需要归档的记录时不启动线程。归档逐月提交，与界面写入历史
+        交替进行（写冲突由存储重试处理）；线程为守护线程，关闭窗口时
+        不等待归档完成，未完成的月份下次启动时继续。
+        """
+        if self._archive_months <= 0 or not self._db.needs_archive(self._archive_months):
+            return
+
+        def archive():
+            try:
+                result = self._db.archive_history(self._archive_months)
+            except Exception as e:
+                result = e
+            self._archive_finished.emit(result)
+
+        threading.Thread(target=archive, name="archive-history", daemon=True).start()
+
+    def _on_archive_finished(self, result):
+        """后台归档完成"""
+        if isinstance(result, Exception):
+            self.statusBar().showMessage(
+                f"历史记录归档失败 ({type(result).__name__}): {result}", 10000)
+        elif result:
+            self.statusBar().showMessage(f"已归档 {result} 条较早的历史记录", 5000)
 
     def _init_ui(self):
         """初始化界面"""
@@ -132,6 +217,7 @@ class MainWindow(QMainWindow):
         self._bank_panel.import_requested.connect(self._import_bank)
         self._bank_panel.remove_requested.connect(self._remove_bank)
         self._bank_panel.bank_changed.connect(self._on_bank_changed)
+        self._bank_panel.browse_requested.connect(self._browse_bank)
 
         # 名单面板信号
         self._roster_panel.import_requested.connect(self._import_roster)
@@ -144,81 +230,143 @@ class MainWindow(QMainWindow):
         # 结果面板信号
         self._result_panel.export_requested.connect(self._export_results)
 
-    def _load_saved_data(self):
-        """加载保存的数据"""
-        # 加载题库
-        banks_info = self._db.get_bank_info()
-        for info in banks_info:
-            try:
-                bank_name = self._bank.load_bank(info["file_path"])
-                count = self._bank.get_question_count(bank_name)
-                self._bank_panel.add_bank(bank_name, count)
-            except Exception:
-                self._db.remove_bank_info(info["name"])
-
-        # 加载名单
-        roster_info = self._db.get_roster_info()
-        if roster_info:
-            try:
-                count = self._roster.load_roster(roster_info["file_path"])
-                self._update_roster_status()
-            except Exception:
-                self._db.clear_roster_info()
+        # 题库和名单的状态变化
+        self._bank.subscribe(lambda event, name: self._schedule_refresh(bank=True))
+        self._roster.subscribe(lambda event, name: self._schedule_refresh(roster=True))
+
+        # 后台归档结果
+        self._archive_finished.connect(self._on_archive_finished)
+
+        # 性能统计面板（调试用，不显示在界面上）
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self._show_metrics)
+
+    def _restore_banks(self, banks_info: List[Dict],
+                       bitmaps: Dict[str, tuple]):
+        """在后台解析上次会话的题库，全部完成后按导入顺序登记
+
+        按导入顺序登记，最近导入的题库成为当前题库。
+        """
+        infos = list(reversed(banks_info))
+        results: Dict[str, ImportResult] = {}
+
+        def on_loaded(info: Dict, result: ImportResult):
+            results[info["name"]] = result
+            if len(results) < len(infos):
+                return
+            for saved_info in infos:
+                name = saved_info["name"]
+                self._apply_saved_bank(saved_info, results[name], bitmaps.get(name))
+
+        for info in infos:
+            run_import(ImportJob(ImportJob.BANK, info["file_path"]), self,
+                       lambda result, info=info: on_loaded(info, result))
+
+    def _apply_saved_bank(self, info: Dict, result: ImportResult,
+                          saved: Optional[tuple]):
+        """登记恢复的题库并恢复已抽状态"""
+        if result.cancelled:
+            return
+        if not result.success:
+            # 题库文件已不存在或无法读取
+            self._db.forget_bank(info["name"])
+            return
+
+        bank_name = self._bank.add_bank(result.file_path, result.data)
+        count = self._bank.get_question_count(bank_name)
+        if saved and not (saved[0] == count
+                          and self._bank.set_drawn_bitmap(bank_name, saved[1], saved[2])):
+            # 题库文件已变化（题目数或内容不同），旧的已抽状态失效
+            self._db.clear_drawn_bitmap(bank_name)
+        self._bank_panel.add_bank(bank_name, count)
+        self._draw_panel.set_enabled(True)
+
+    def _restore_roster(self, roster_info: Optional[Dict], drawn_names: Set[str]):
+        """在后台解析上次会话的名单并恢复已抽人员"""
+        if not roster_info:
+            return
+
+        def on_loaded(result: ImportResult):
+            if result.cancelled:
+                return
+            if not result.success:
+                self._db.forget_roster()
+                return
+            self._roster.set_roster(result.file_path, result.data)
+            names = {p.name for p in result.data}
+            self._roster.set_drawn_names(drawn_names & names)
+
+        run_import(ImportJob(ImportJob.ROSTER, roster_info["file_path"]), self, on_loaded)
 
     def _import_bank(self, file_path: str):
-        """导入题库"""
-        try:
-            bank_name = self._bank.load_bank(file_path)
-            count = self._bank.get_question_count(bank_name)
+        """导入题库（在后台线程解析）"""
+        run_import(ImportJob(ImportJob.BANK, file_path), self, self._on_bank_imported)
 
-            self._db.save_bank_info(bank_name, file_path, count)
-            self._bank_panel.add_bank(bank_name, count)
-            self._update_status()
-            self._draw_panel.set_enabled(True)
+    def _on_bank_imported(self, result: ImportResult):
+        """题库解析完成"""
+        if result.cancelled:
+            return
+        if not result.success:
+            QMessageBox.warning(self, "导入失败", f"{result.file_name}\n{result.error}")
+            return
 
-            QMessageBox.information(
-                self, "成功", f"已导入题库: {bank_name}\n共 {count} 道题目"
-            )
-        except Exception as e:
-            QMessageBox.warning(self, "导入失败", str(e))
+        bank_name = self._bank.add_bank(result.file_path, result.data)
+        count = self._bank.get_question_count(bank_name)
+
+        self._db.register_bank(bank_name, result.file_path, count)
+        self._bank_panel.add_bank(bank_name, count)
+        self._draw_panel.set_enabled(True)
+
+        self.statusBar().showMessage(
+            f"已导入题库: {bank_name}，共 {count} 道题目", 5000
+        )
 
     def _remove_bank(self, bank_name: str):
         """移除题库"""
         self._bank.remove_bank(bank_name)
-        self._db.remove_bank_info(bank_name)
+        self._db.forget_bank(bank_name)
         self._bank_panel.remove_bank(bank_name)
-        self._update_status()
 
         if not self._bank.get_bank_names():
             self._draw_panel.set_enabled(False)
             self._result_panel.clear()
 
+    def _browse_bank(self, bank_name: str):
+        """浏览题库中的题目"""
+        from .bank_browser import BankBrowserDialog
+        dialog = BankBrowserDialog(self._bank, bank_name, self)
+        dialog.show()
+
     def _on_bank_changed(self, bank_name: str):
         """题库切换"""
-        self._update_status()
+        self._schedule_refresh(bank=True)
 
     def _import_roster(self, file_path: str):
-        """导入名单"""
-        try:
-            count = self._roster.load_roster(file_path)
-            self._db.save_roster_info(
-                self._roster.get_roster_name(),
-                file_path,
-                count
-            )
-            self._update_roster_status()
+        """导入名单（在后台线程解析）"""
+        run_import(ImportJob(ImportJob.ROSTER, file_path), self, self._on_roster_imported)
 
-            QMessageBox.information(
-                self, "成功", f"已导入名单: {self._roster.get_roster_name()}\n共 {count} 人"
-            )
-        except Exception as e:
-            QMessageBox.warning(self, "导入失败", str(e))
+    def _on_roster_imported(self, result: ImportResult):
+        """名单解析完成"""
+        if result.cancelled:
+            return
+        if not result.success:
+            QMessageBox.warning(self, "导入失败", f"{result.file_name}\n{result.error}")
+            return
+
+        count = self._roster.set_roster(result.file_path, result.data)
+        self._db.register_roster(
+            self._roster.get_roster_name(),
+            result.file_path,
+            count
+        )
+
+        self.statusBar().showMessage(
+            f"已导入名单: {self._roster.get_roster_name()}，共 {count} 人", 5000
+        )
 
     def _clear_roster(self):
         """清空名单"""
         self._roster.clear()
-        self._db.clear_roster_info()
-        self._db.clear_drawn_persons()
+        self._db.forget_roster()
         self._roster_panel.clear_display()
         self._draw_person_check.setEnabled(False)
         self._draw_person_check.setChecked(False)
@@ -227,6 +375,22 @@ class MainWindow(QMainWindow):
         # 清空结果面板
         self._result_panel.clear()
 
+    def _schedule_refresh(self, bank: bool = False, roster: bool = False):
+        """安排在下一次事件循环刷新状态显示"""
+        self._bank_dirty |= bank
+        self._roster_dirty |= roster
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def _refresh_status(self):
+        """刷新有变化的状态显示"""
+        if self._bank_dirty:
+            self._bank_dirty = False
+            self._update_status()
+        if self._roster_dirty:
+            self._roster_dirty = False
+            self._update_roster_status()
+
     def _update_roster_status(self):
         """更新名单状态"""
         if self._roster.is_loaded():
@@ -278,35 +442,49 @@ class MainWindow(QMainWindow):
             return
 
         results = []
+        history_rows = []
+        drawn_persons = []
+        draw_ts = now_ms()
         for q in questions:
-            person_name = ""
+            person_name = person_id = ""
             if draw_person:
                 person = self._roster.draw_one(person_no_repeat)
                 if person:
-                    person_name = person.name
+                    person_name, person_id = person.name, person.id
                     if person_no_repeat:
-                        self._db.add_drawn_person(person_name)
+                        drawn_persons.append(person_name)
 
             results.append(DrawResult(
                 question_title=q.title,
                 question_content=q.content,
                 question_id=q.id,
                 bank_name=q.bank_name,
-                person_name=person_name
+                person_name=person_name,
+                person_id=person_id
             ))
 
-            # 保存历史
-            self._db.add_history(q.id, q.title, q.content, q.bank_name, person_name)
+            history_rows.append(
+                (q.id, q.title, q.content, q.bank_name, person_name, draw_ts))
+
+        with metrics.timer("ui.save_draw"):
+            # 保存历史（一次抽取在同一个事务中写入）
+            self._db.add_history_batch(history_rows)
+            self._db.add_drawn_persons(drawn_persons)
+
+            # 保存已抽状态
             if no_repeat:
-                self._db.add_drawn_question(q.id, q.bank_name)
+                self._db.save_drawn_bitmap(
+                    bank_name,
+                    self._bank.get_question_count(bank_name),
+                    self._bank.get_drawn_bitmap(bank_name),
+                    self._bank.get_fingerprint(bank_name)
+                )
 
         # 显示结果（累积模式）
         self._result_panel.append_results(results)
 
-        # 更新状态
-        self._update_status()
+        # 状态显示由题库和名单的变化通知刷新
         if draw_person:
-            self._update_roster_status()
             # 检查名单是否已抽完
             remaining = self._roster.get_available_count(True)
             if remaining == 0:
@@ -324,8 +502,7 @@ class MainWindow(QMainWindow):
         )
         if reply == QMessageBox.StandardButton.Yes:
             self._drawer.reset(bank_name)
-            self._db.clear_drawn_questions(bank_name)
-            self._update_status()
+            self._db.clear_drawn_bitmap(bank_name)
             QMessageBox.information(self, "成功", "题池已重置")
 
     def _reset_persons(self):
@@ -338,45 +515,77 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             self._roster.reset()
             self._db.clear_drawn_persons()
-            self._update_roster_status()
             # 清空结果面板
             self._result_panel.clear()
             QMessageBox.information(self, "成功", "人员名单已重置")
 
     def _show_history(self):
         """显示历史记录"""
+        from .history_dialog import HistoryDialog
         dialog = HistoryDialog(self._db, self)
         dialog.exec()
 
+    def _show_metrics(self):
+        """显示性能统计面板（非模态，已打开时切换到前台）"""
+        from .metrics_dialog import MetricsDialog
+        if self._metrics_dialog is None:
+            self._metrics_dialog = MetricsDialog(self)
+            self._metrics_dialog.destroyed.connect(self._on_metrics_closed)
+        self._metrics_dialog.show()
+        self._metrics_dialog.raise_()
+        self._metrics_dialog.activateWindow()
+
+    def _on_metrics_closed(self):
+        self._metrics_dialog = None
+
     def _export_results(self):
         """导出当前抽题结果"""
+        from src.storage.exporter import Exporter
+        from src.storage.export_job import ExportJob
+        from src.storage.handouts import HandoutExporter
+        from .export_runner import run_export
+
         results = self._result_panel.get_results()
         if not results:
             QMessageBox.information(self, "提示", "没有可导出的结果")
             return
 
+        # 按人员导出讲义: 文件类型 -> 讲义格式（输出到与文件同名的文件夹）
+        handout_filters = {
+            "每人一份讲义 - HTML (*.html)": "html",
+            "每人一份讲义 - 文本 (*.txt)": "txt",
+            "每人一份讲义 - Excel (*.xlsx)": "xlsx",
+        }
+
         # 选择文件类型和路径
         file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "导出抽题结果",
             "",
-            "Excel 文件 (*.xlsx);;文本文件 (*.txt)"
+            ";;".join(["Excel 文件 (*.xlsx)", "文本文件 (*.txt)", *handout_filters])
         )
 
         if not file_path:
             return
 
-        # 根据选择的类型导出
+        # 根据选择的类型导出（后台执行，导出结果的快照）
+        if selected_filter in handout_filters:
+            if not any(r.person_name for r in results):
+                QMessageBox.information(self, "提示", "结果中没有抽中人员，无法按人员导出")
+                return
+            output_dir = os.path.splitext(file_path)[0]
+            run_export(ExportJob(HandoutExporter.export, results, output_dir,
+                                 fmt=handout_filters[selected_filter]),
+                       "按人员导出讲义", self)
+            return
+
         if selected_filter == "Excel 文件 (*.xlsx)":
             if not file_path.endswith(".xlsx"):
                 file_path += ".xlsx"
-            success = Exporter.export_results_to_excel(results, file_path)
+            export = Exporter.export_results_to_excel
         else:
             if not file_path.endswith(".txt"):
                 file_path += ".txt"
-            success = Exporter.export_results_to_txt(results, file_path)
+            export = Exporter.export_results_to_txt
 
-        if success:
-            QMessageBox.information(self, "成功", f"已导出到:\n{file_path}")
-        else:
-            QMessageBox.warning(self, "失败", "导出失败，请重试")
+        run_export(ExportJob(export, results, file_path), "导出抽题结果", self)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+题目内容渲染缓存
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
+from PyQt6.QtGui import QFont, QTextDocument
+
+# 缓存的渲染结果数
+DEFAULT_CAPACITY = 64
+
+
+class MarkdownCache:
+    """Markdown 渲染缓存
+
+    把题目内容按 Markdown（GitHub 方言，支持代码块、列表和表格）
+    渲染为 QTextDocument，按 (题目ID, 内容哈希) 缓存最近使用的文档。
+    显示时直接把缓存的文档交给 QTextEdit.setDocument，不再重新解析。
+
+    缓存的文档由 QTextEdit 共享显示，调用方不应修改文档内容；
+    容量至少为 3，保证当前显示的文档和预渲染的前后两条不会被淘汰。
+    """
+
+    def __init__(self, font: QFont, capacity: int = DEFAULT_CAPACITY):
+        """初始化渲染缓存
+
+        Args:
+            font: 文档默认字体
+            capacity: 缓存的文档数
+        """
+        self._font = QFont(font)
+        self._capacity = max(3, capacity)
+        self._documents: "OrderedDict[Tuple[Hashable, int], QTextDocument]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    @staticmethod
+    def key(question_id: str, content: str) -> Tuple[str, int]:
+        """缓存键：题目ID每次加载都会变化，内容哈希保证文本修改后重新渲染"""
+        return question_id, hash(content)
+
+    def contains(self, question_id: str, content: str) -> bool:
+        return self.key(question_id, content) in self._documents
+
+    def get(self, question_id: str, content: str) -> QTextDocument:
+        """获取渲染后的文档，不在缓存中时渲染并缓存
+
+        Args:
+            question_id: 题目ID
+            content: Markdown 文本
+
+        Returns:
+            渲染后的文档
+        """
+        key = self.key(question_id, content)
+        document = self._documents.get(key)
+        if document is not None:
+            self._documents.move_to_end(key)
+            self.hits += 1
+            return document
+
+        self.misses += 1
+        document = self._render(content)
+        self._documents[key] = document
+        while len(self._documents) > self._capacity:
+            self._documents.popitem(last=False)
+        return document
+
+    def _render(self, content: str) -> QTextDocument:
+        document = QTextDocument()
+        document.setDefaultFont(self._font)
+        document.setMarkdown(content,
+                             QTextDocument.MarkdownFeature.MarkdownDialectGitHub)
+        return document
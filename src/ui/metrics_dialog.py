@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+性能统计面板
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox,
+    QPushButton, QTableWidget, QTableWidgetItem, QAbstractItemView,
+    QHeaderView, QMessageBox, QFileDialog, QSplitter
+)
+from PyQt6.QtCore import Qt, QTimer
+
+from src.core import metrics
+
+TIMER_COLUMNS = ["计时点", "次数", "总耗时 (ms)", "平均 (ms)", "最长 (ms)"]
+COUNTER_COLUMNS = ["计数器", "值"]
+
+# 面板打开时的刷新间隔（毫秒）
+REFRESH_INTERVAL = 1000
+
+
+class MetricsDialog(QDialog):
+    """性能统计面板
+
+    显示各热点路径的计时和计数（见 src.core.metrics），每秒刷新。
+    统计默认关闭，可在面板中开启、清空或导出为 Prometheus 文本。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._init_ui()
+        self._refresh()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_INTERVAL)
+        self._timer.timeout.connect(self._refresh)
+        self._timer.start()
+
+    def _init_ui(self):
+        """初始化界面"""
+        self.setWindowTitle("性能统计")
+        self.setMinimumSize(720, 480)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        self._enabled_check = QCheckBox("启用统计")
+        self._enabled_check.setChecked(metrics.is_enabled())
+        self._enabled_check.toggled.connect(self._on_enabled_toggled)
+        top_layout.addWidget(self._enabled_check)
+        top_layout.addStretch()
+        self._info_label = QLabel("")
+        top_layout.addWidget(self._info_label)
+        layout.addLayout(top_layout)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self._timer_table = self._create_table(TIMER_COLUMNS)
+        splitter.addWidget(self._timer_table)
+        self._counter_table = self._create_table(COUNTER_COLUMNS)
+        splitter.addWidget(self._counter_table)
+        splitter.setSizes([300, 150])
+        layout.addWidget(splitter, 1)
+
+        btn_layout = QHBoxLayout()
+        self._reset_btn = QPushButton("清空")
+        self._reset_btn.clicked.connect(self._reset)
+        btn_layout.addWidget(self._reset_btn)
+
+        self._export_btn = QPushButton("导出 Prometheus 文本")
+        self._export_btn.clicked.connect(self._export)
+        btn_layout.addWidget(self._export_btn)
+
+        btn_layout.addStretch()
+
+        self._close_btn = QPushButton("关闭")
+        self._close_btn.clicked.connect(self.close)
+        btn_layout.addWidget(self._close_btn)
+        layout.addLayout(btn_layout)
+
+    @staticmethod
+    def _create_table(columns) -> QTableWidget:
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        return table
+
+    @staticmethod
+    def _fill(table: QTableWidget, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight
+                                          | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(row, column, item)
+
+    def _refresh(self):
+        """刷新表格"""
+        data = metrics.snapshot()
+        self._fill(self._timer_table, [
+            (name, str(t["count"]), f"{t['total_s'] * 1000:.2f}",
+             f"{t['mean_s'] * 1000:.3f}", f"{t['max_s'] * 1000:.3f}")
+            for name, t in data["timers"].items()])
+        self._fill(self._counter_table, [
+            (name, f"{value:g}") for name, value in data["counters"].items()])
+        state = "记录中" if data["enabled"] else "未启用"
+        self._info_label.setText(f"{state} | 计时点 {len(data['timers'])} 个")
+
+    def _on_enabled_toggled(self, checked: bool):
+        metrics.enable(checked)
+        self._refresh()
+
+    def _reset(self):
+        metrics.reset()
+        self._refresh()
+
+    def _export(self):
+        """导出为 Prometheus 文本格式"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出性能统计", "metrics.prom", "Prometheus 文本 (*.prom *.txt)")
+        if not file_path:
+            return
+        try:
+            metrics.dump_prometheus(file_path)
+        except OSError as e:
+            QMessageBox.warning(self, "失败", f"导出失败: {e}")
+            return
+        QMessageBox.information(self, "成功", f"已导出到:\n{file_path}")
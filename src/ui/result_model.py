@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+抽题结果列表模型
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Optional
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+from src.storage.result_store import ResultStore
+
+
+class ResultListModel(QAbstractListModel):
+    """抽题结果列表模型
+
+    直接读取 ResultStore，视图只请求可见行的数据，
+    溢出到文件的结果在滚动到时才读回。
+    设置筛选关键字后只显示匹配的结果，行号与结果编号通过
+    有序的编号数组互相转换。
+    """
+
+    def __init__(self, store: ResultStore, parent=None):
+        super().__init__(parent)
+        self._store = store
+        self._keyword = ""
+        # 筛选后的结果编号（升序），为 None 时显示全部
+        self._matched: Optional[array] = None
+
+    # ========== Qt 模型接口 ==========
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        if self._matched is not None:
+            return len(self._matched)
+        return len(self._store)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            number = self.result_index(index.row())
+            result = self._store[number]
+            if result.person_name:
+                return f"{number + 1}. {result.person_name} - {result.question_title}"
+            return f"{number + 1}. {result.question_title}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._store[self.result_index(index.row())].bank_name
+        return None
+
+    # ========== 公共接口 ==========
+
+    def set_store(self, store: ResultStore):
+        """切换结果存储（清空或替换结果时）"""
+        self.beginResetModel()
+        self._store = store
+        if self._matched is not None:
+            self._matched = self._store.search(self._keyword)
+        self.endResetModel()
+
+    def set_keyword(self, keyword: str):
+        """设置筛选关键字，为空时显示全部"""
+        keyword = keyword.strip()
+        if keyword == self._keyword:
+            return
+        self.beginResetModel()
+        self._keyword = keyword
+        self._matched = self._store.search(keyword) if keyword else None
+        self.endResetModel()
+
+    def results_appended(self, start: int):
+        """通知模型存储中追加了编号从 start 开始的结果"""
+        stop = len(self._store)
+        if start >= stop:
+            return
+
+        if self._matched is None:
+            self.beginInsertRows(QModelIndex(), start, stop - 1)
+            self.endInsertRows()
+            return
+
+        new_rows = self._store.search(self._keyword, start, stop)
+        if new_rows:
+            first = len(self._matched)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            self._matched.extend(new_rows)
+            self.endInsertRows()
+
+    def result_index(self, row: int) -> int:
+        """行号转换为结果编号"""
+        return self._matched[row] if self._matched is not None else row
+
+    def row_of(self, number: int) -> int:
+        """结果编号转换为行号，被筛选掉时返回 -1"""
+        if self._matched is None:
+            return number if 0 <= number < len(self._store) else -1
+        row = bisect_left(self._matched, number)
+        if row < len(self._matched) and self._matched[row] == number:
+            return row
+        return -1
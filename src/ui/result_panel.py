@@ -5,40 +5,88 @@
 """
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QTextEdit, QGroupBox, QFrame
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+    QPushButton, QTextEdit, QGroupBox, QFrame, QSpinBox, QSplitter
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from typing import List, Optional
-from dataclasses import dataclass
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QTextDocument
+from typing import List
 
-
-@dataclass
-class DrawResult:
-    """抽取结果"""
-    question_title: str
-    question_content: str
-    question_id: str
-    bank_name: str
-    person_name: str = ""
+from src.core.result import DrawResult
+from src.storage.result_store import ResultStore, ResultSnapshot, DEFAULT_MEMORY_CAP
+from .result_model import ResultListModel
+from .list_view import UniformListView
+from .markdown_cache import MarkdownCache
 
 
 class ResultPanel(QWidget):
-    """结果展示面板"""
+    """结果展示面板
+
+    结果保存在有上限的 ResultStore 中，左侧列表按需读取可见行，
+    支持筛选和按编号跳转。
+    """
 
     # 导出信号
     export_requested = pyqtSignal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, memory_cap: int = DEFAULT_MEMORY_CAP):
         super().__init__(parent)
-        self._results: List[DrawResult] = []
+        self._memory_cap = memory_cap
+        self._results = ResultStore(DrawResult, memory_cap)
+        self._model = ResultListModel(self._results, self)
         self._current_index = 0
         self._init_ui()
 
     def _init_ui(self):
         """初始化界面"""
         group = QGroupBox("抽取结果")
-        layout = QVBoxLayout(group)
+        group_layout = QVBoxLayout(group)
+        self._splitter = QSplitter(Qt.Orientation.Horizontal)
+        group_layout.addWidget(self._splitter, 1)
+
+        # 结果列表（多个结果时显示）
+        self._list_widget = QWidget()
+        list_layout = QVBoxLayout(self._list_widget)
+        list_layout.setContentsMargins(0, 0, 0, 0)
+
+        self._filter_edit = QLineEdit()
+        self._filter_edit.setPlaceholderText("筛选结果")
+        self._filter_edit.setClearButtonEnabled(True)
+        list_layout.addWidget(self._filter_edit)
+
+        # 输入停顿后再筛选，溢出的结果需要读文件
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self._filter_edit.textChanged.connect(self._filter_timer.start)
+
+        self._list_view = UniformListView()
+        self._list_view.setModel(self._model)
+        self._list_view.selectionModel().currentChanged.connect(self._on_list_current_changed)
+        list_layout.addWidget(self._list_view, 1)
+
+        jump_layout = QHBoxLayout()
+        self._jump_spin = QSpinBox()
+        self._jump_spin.setMinimum(1)
+        self._jump_spin.setPrefix("第 ")
+        self._jump_spin.setSuffix(" 个")
+        jump_layout.addWidget(self._jump_spin, 1)
+        self._jump_btn = QPushButton("跳转")
+        self._jump_btn.clicked.connect(self._on_jump_clicked)
+        self._jump_spin.editingFinished.connect(self._on_jump_clicked)
+        jump_layout.addWidget(self._jump_btn)
+        list_layout.addLayout(jump_layout)
+
+        self._list_widget.setVisible(False)
+        self._splitter.addWidget(self._list_widget)
+
+        # 结果详情
+        detail_widget = QWidget()
+        layout = QVBoxLayout(detail_widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._splitter.addWidget(detail_widget)
+        self._splitter.setStretchFactor(1, 1)
 
         # 人员显示（可选）
         self._person_label = QLabel("")
@@ -93,6 +141,16 @@ class ResultPanel(QWidget):
             }
         """)
         layout.addWidget(self._content_text, 1)
+        self._splitter.setSizes([220, 600])
+
+        # 题目内容按 Markdown 渲染并缓存；空内容等纯文本使用单独的文档，
+        # 避免 clear/setPlainText 修改缓存中的文档
+        content_font = self._content_text.font()
+        content_font.setPixelSize(14)
+        self._markdown_cache = MarkdownCache(content_font)
+        self._plain_document = QTextDocument(self)
+        self._plain_document.setDefaultFont(content_font)
+        self._content_text.setDocument(self._plain_document)
 
         # 导航按钮（多题时显示）
         nav_layout = QHBoxLayout()
@@ -117,7 +175,7 @@ class ResultPanel(QWidget):
         self._export_btn.setEnabled(False)
         nav_layout.addWidget(self._export_btn)
 
-        layout.addLayout(nav_layout)
+        group_layout.addLayout(nav_layout)
 
         # 主布局
         main_layout = QVBoxLayout(self)
@@ -126,18 +184,21 @@ class ResultPanel(QWidget):
 
     def show_results(self, results: List[DrawResult]):
         """显示抽取结果（替换模式）"""
-        self._results = results
+        self._reset_store()
         self._current_index = 0
 
         if not results:
             self._title_label.setText("没有可抽取的题目")
-            self._content_text.clear()
+            self._set_plain_content("")
             self._person_label.setVisible(False)
             self._hide_nav()
             return
 
+        self._results.append(results)
+        self._model.results_appended(0)
+
         # 显示导航（多个结果时）
-        if len(results) > 1:
+        if len(self._results) > 1:
             self._show_nav()
         else:
             self._hide_nav()
@@ -149,9 +210,11 @@ class ResultPanel(QWidget):
         if not results:
             return
 
-        self._results.extend(results)
+        start = len(self._results)
+        self._results.append(results)
+        self._model.results_appended(start)
         # 跳转到最新追加的第一个结果
-        self._current_index = len(self._results) - len(results)
+        self._current_index = start
 
         # 显示导航（多个结果时）
         if len(self._results) > 1:
@@ -161,6 +224,12 @@ class ResultPanel(QWidget):
 
         self._show_current()
 
+    def jump_to(self, index: int):
+        """跳转到指定编号的结果（从 0 开始）"""
+        if 0 <= index < len(self._results) and index != self._current_index:
+            self._current_index = index
+            self._show_current()
+
     def set_export_enabled(self, enabled: bool):
         """设置导出按钮启用状态"""
         self._export_btn.setEnabled(enabled)
@@ -181,12 +250,49 @@ class ResultPanel(QWidget):
 
         # 显示题目
         self._title_label.setText(result.question_title)
-        self._content_text.setText(result.question_content or "（无详细要求）")
+        self._show_content(result)
 
         # 更新导航
-        self._nav_label.setText(f"{self._current_index + 1} / {len(self._results)}")
+        total = len(self._results)
+        self._nav_label.setText(f"{self._current_index + 1} / {total}")
         self._prev_btn.setEnabled(self._current_index > 0)
-        self._next_btn.setEnabled(self._current_index < len(self._results) - 1)
+        self._next_btn.setEnabled(self._current_index < total - 1)
+        self._jump_spin.setMaximum(total)
+
+        # 同步列表选中行（当前结果被筛选掉时不选中）
+        row = self._model.row_of(self._current_index)
+        selection = self._list_view.selectionModel()
+        selection.blockSignals(True)
+        if row >= 0:
+            index = self._model.index(row)
+            self._list_view.setCurrentIndex(index)
+            self._list_view.scrollTo(index)
+        else:
+            self._list_view.clearSelection()
+        selection.blockSignals(False)
+        self._list_view.viewport().update()
+
+    def _show_content(self, result: DrawResult):
+        """显示题目内容（Markdown 渲染），并在空闲时预渲染前后两条"""
+        if not result.question_content:
+            self._set_plain_content("（无详细要求）")
+        else:
+            self._content_text.setDocument(self._markdown_cache.get(
+                result.question_id, result.question_content))
+        QTimer.singleShot(0, self._prerender_neighbors)
+
+    def _prerender_neighbors(self):
+        """预渲染当前结果的上一条和下一条"""
+        for index in (self._current_index + 1, self._current_index - 1):
+            if 0 <= index < len(self._results):
+                result = self._results[index]
+                if result.question_content:
+                    self._markdown_cache.get(result.question_id, result.question_content)
+
+    def _set_plain_content(self, text: str):
+        """显示纯文本内容"""
+        self._content_text.setDocument(self._plain_document)
+        self._plain_document.setPlainText(text)
 
     def _show_prev(self):
         """显示上一个"""
@@ -200,24 +306,50 @@ class ResultPanel(QWidget):
             self._current_index += 1
             self._show_current()
 
+    def _on_list_current_changed(self, current, previous):
+        """列表选中行变化"""
+        if current.isValid():
+            self.jump_to(self._model.result_index(current.row()))
+
+    def _on_jump_clicked(self):
+        """按编号跳转"""
+        self.jump_to(self._jump_spin.value() - 1)
+
+    def _apply_filter(self):
+        """应用筛选关键字"""
+        self._model.set_keyword(self._filter_edit.text())
+        if self._results:
+            self._show_current()
+
+    def _reset_store(self):
+        """换用新的结果存储
+
+        不清空旧存储：后台导出可能仍在读取旧结果的快照，
+        旧存储及其溢出文件在不再被引用时释放。
+        """
+        self._results = ResultStore(DrawResult, self._memory_cap)
+        self._model.set_store(self._results)
+
     def _show_nav(self):
         """显示导航"""
+        self._list_widget.setVisible(True)
         self._prev_btn.setVisible(True)
         self._next_btn.setVisible(True)
         self._nav_label.setVisible(True)
 
     def _hide_nav(self):
         """隐藏导航"""
+        self._list_widget.setVisible(False)
         self._prev_btn.setVisible(False)
         self._next_btn.setVisible(False)
         self._nav_label.setVisible(False)
 
     def clear(self):
         """清空显示"""
-        self._results = []
+        self._reset_store()
         self._current_index = 0
         self._title_label.setText("等待抽题...")
-        self._content_text.clear()
+        self._set_plain_content("")
         self._person_label.setVisible(False)
         self._hide_nav()
         self._export_btn.setEnabled(False)
@@ -227,6 +359,6 @@ class ResultPanel(QWidget):
         if self._results:
             self.export_requested.emit()
 
-    def get_results(self) -> List[DrawResult]:
-        """获取当前结果列表"""
-        return self._results
+    def get_results(self) -> ResultSnapshot:
+        """获取当前结果的只读快照（可迭代，支持 len 和下标访问）"""
+        return self._results.snapshot()